@@ -0,0 +1,331 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import asyncio
+import smtplib
+import ssl
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+
+from module06.league_model.emailer import MAX_ATTEMPTS, SENT, print_summary
+
+# most SMTP sessions open at the same time
+DEFAULT_SESSIONS = 4
+# most messages started per second, and most started at once after a pause
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 10
+
+
+class TokenBucket:
+    """
+    This class limits how fast messages are sent, for mail providers that
+    only allow so many messages a second. The bucket holds up to capacity
+    tokens and gets rate tokens a second; each message takes one token, and
+    waits for the next one when the bucket is empty.
+    """
+
+    __slots__ = ("_rate", "_capacity", "_tokens", "_updated")
+
+    def __init__(self, rate, capacity):
+        """
+        Constructor for the bucket. It starts full.
+
+        :param rate: tokens added per second
+        :param capacity: most tokens the bucket holds
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("The rate must be positive and the capacity at least 1")
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        """
+        Takes a token, waiting until there is one.
+
+        :return: none
+        """
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+class AsyncEmailer:
+    """
+    Class for an emailer that does not block its caller. It has the same
+    send_plain_email() method as Emailer, so it can be given to the
+    send_email() methods of teams, members and competitions.
+
+    Each recipient gets its own message, sent by an asyncio task. The tasks
+    share a pool of SMTP sessions, so at most that many connections are
+    open at the same time and each one is reused for many messages, and a
+    TokenBucket spaces the messages out to stay under the provider's quota.
+    smtplib does the SMTP work, in a thread for each session, while the
+    event loop waits on the results.
+
+    When send_plain_email() is called from code running in an event loop,
+    the messages are sent on that loop. When it is called from code that
+    has no event loop, such as the Qt UI, the emailer starts its own loop in
+    a background thread and the call returns right away.
+
+    Steps for use
+
+    1.) create the emailer with the sender address and the server to use
+    2.) call send_plain_email() with the recipients, subject and message,
+    or await send_all() to get every status at once
+    3.) call close() once the emails are sent
+    """
+
+    def __init__(self, sender_address, host="smtp.gmail.com", port=465, password=None, use_ssl=True,
+                 starttls=False, sessions=DEFAULT_SESSIONS, rate=DEFAULT_RATE, burst=DEFAULT_BURST, timeout=30):
+        """
+        Constructor for the emailer. Nothing is connected until the first
+        message is sent.
+
+        :param sender_address: sender address
+        :param host: the SMTP server
+        :param port: port of the SMTP server
+        :param password: password (such as the app password saved with keyring) to log in with,
+            or None to send without logging in
+        :param use_ssl: True to connect with SSL
+        :param starttls: True to switch to TLS after connecting, when use_ssl is False
+        :param sessions: most SMTP sessions open at the same time
+        :param rate: most messages started per second
+        :param burst: most messages started at once after a pause
+        :param timeout: seconds to wait for the server
+        """
+        if sessions < 1:
+            raise ValueError("At least one session is needed")
+        self._sender_address = sender_address
+        self._host = host
+        self._port = port
+        self._password = password
+        self._use_ssl = use_ssl
+        self._starttls = starttls
+        self._timeout = timeout
+        self._bucket = TokenBucket(rate, burst)
+        self._sessions = [_SmtpSession(self) for _ in range(sessions)]
+        self._executor = ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="AsyncEmailer")
+        # the loop the emailer is used on, and the queue of idle sessions made for it
+        self._loop = None
+        self._idle = None
+        # the background loop started when the emailer is used without one
+        self._thread = None
+        self._thread_loop = None
+        self._lock = threading.Lock()
+
+    def send_plain_email(self, recipients, subject, message):
+        """
+        Starts sending an email to each recipient and returns without
+        waiting for them to be sent.
+
+        :param recipients: list of email addresses to send to
+        :param subject: subject of the email
+        :param message: message of the email
+        :return: dictionary of a future for each recipient, holding its delivery status
+            (SENT or the reason it failed); an asyncio task when called from an event loop,
+            otherwise a concurrent.futures.Future
+        """
+        recipients = list(dict.fromkeys(recipients))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            loop = self._background_loop()
+            return {recipient: asyncio.run_coroutine_threadsafe(self.send_message(recipient, subject, message), loop)
+                    for recipient in recipients}
+        return {recipient: asyncio.ensure_future(self.send_message(recipient, subject, message))
+                for recipient in recipients}
+
+    async def send_all(self, recipients, subject, message):
+        """
+        Sends an email to each recipient and waits for every one.
+
+        :param recipients: list of email addresses to send to
+        :param subject: subject of the email
+        :param message: message of the email
+        :return: dictionary of the delivery status of each recipient, SENT or the reason it failed
+        """
+        futures = self.send_plain_email(recipients, subject, message)
+        results = await asyncio.gather(*futures.values())
+        status = dict(zip(futures, results))
+        print_summary(status)
+        return status
+
+    async def send_message(self, recipient, subject, message):
+        """
+        Sends an email to one recipient, once the rate limit allows it and a
+        session is free.
+
+        :param recipient: email address to send to
+        :param subject: subject of the email
+        :param message: message of the email
+        :return: the delivery status, SENT or the reason it failed
+        """
+        loop = self._bind_loop()
+        email = EmailMessage()
+        email["From"] = self._sender_address
+        email["To"] = recipient
+        email["Subject"] = subject
+        email.set_content(message)
+        await self._bucket.acquire()
+        session = await self._idle.get()
+        future = loop.run_in_executor(self._executor, session.send, recipient, email)
+        # the session goes back to the pool when its thread is done with it, even if this task is cancelled
+        future.add_done_callback(lambda done: self._release(session, done))
+        return await asyncio.shield(future)
+
+    def close(self):
+        """
+        Stops the background loop, if one was started, and closes the
+        sessions. Call this once every email is sent.
+
+        :return: none
+        """
+        with self._lock:
+            if self._thread is not None:
+                self._thread_loop.call_soon_threadsafe(self._thread_loop.stop)
+                self._thread.join()
+                self._thread_loop.close()
+                self._thread = None
+                self._thread_loop = None
+        self._executor.shutdown(wait=True)
+        for session in self._sessions:
+            session.close()
+
+    def _bind_loop(self):
+        """
+        Returns the running event loop, making the pool of idle sessions the
+        first time. The sessions are only shared on one loop.
+
+        :return: the event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            self._idle = asyncio.Queue()
+            for session in self._sessions:
+                self._idle.put_nowait(session)
+        elif self._loop is not loop:
+            raise RuntimeError("The emailer is already used on another event loop")
+        return loop
+
+    def _background_loop(self):
+        """
+        Returns the emailer's own event loop, starting it in a background
+        thread the first time.
+
+        :return: the event loop
+        """
+        with self._lock:
+            if self._thread is None:
+                self._thread_loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._thread_loop.run_forever, name="AsyncEmailer loop",
+                                                daemon=True)
+                self._thread.start()
+            return self._thread_loop
+
+    def _release(self, session, future):
+        """
+        Puts a session back in the pool once its thread is done sending.
+
+        :param session: the session
+        :param future: the finished future of the send
+        :return: none
+        """
+        if not future.cancelled():
+            # looked at so an error is not reported as never retrieved when the task was cancelled
+            future.exception()
+        self._idle.put_nowait(session)
+
+    def _connect(self):
+        """
+        Opens a connection to the server and logs in. Runs in a session thread.
+
+        :return: the smtplib connection
+        """
+        if self._use_ssl:
+            smtp = smtplib.SMTP_SSL(self._host, self._port, timeout=self._timeout,
+                                    context=ssl.create_default_context())
+        else:
+            smtp = smtplib.SMTP(self._host, self._port, timeout=self._timeout)
+            if self._starttls:
+                smtp.starttls(context=ssl.create_default_context())
+        if self._password is not None:
+            smtp.login(self._sender_address, self._password)
+        return smtp
+
+
+class _SmtpSession:
+    """
+    One connection to the mail server, opened when it is first needed and
+    kept open for the next messages. A session is only used by one thread
+    at a time.
+    """
+
+    __slots__ = ("_emailer", "_smtp")
+
+    def __init__(self, emailer):
+        """
+        Constructor for the session.
+
+        :param emailer: the AsyncEmailer that opens the connection
+        """
+        self._emailer = emailer
+        self._smtp = None
+
+    def send(self, recipient, email):
+        """
+        Sends a message, connecting first if there is no connection, and
+        connecting again and retrying if the server drops it.
+
+        :param recipient: the recipient
+        :param email: the EmailMessage
+        :return: the delivery status, SENT or the reason it failed
+        """
+        error = None
+        for _ in range(MAX_ATTEMPTS):
+            try:
+                if self._smtp is None:
+                    self._smtp = self._emailer._connect()
+                refused = self._smtp.send_message(email, self._emailer._sender_address, [recipient])
+                break
+            except smtplib.SMTPRecipientsRefused as e:
+                refused = e.recipients
+                break
+            except smtplib.SMTPServerDisconnected as e:
+                error = e
+                self._smtp = None
+            except smtplib.SMTPException as e:
+                # the server would not take the message, so sending it again will not help
+                return f"failed: {e}"
+            except OSError as e:
+                error = e
+                self.close()
+        else:
+            return f"failed: {error}"
+        return f"refused: {refused[recipient]}" if recipient in refused else SENT
+
+    def close(self):
+        """
+        Closes the connection, if there is one.
+
+        :return: none
+        """
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
@@ -0,0 +1,171 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import hashlib
+import json
+import os
+import zlib
+from datetime import datetime
+
+from module06.league_model import codec
+from module06.league_model.file_utils import replace_file
+
+
+class BackupStore:
+    """
+    This class keeps the last few saved versions (generations) of a database
+    file so any of them can be restored.
+
+    Every league is stored as a chunk: its encoded bytes (see
+    codec.encode_league()), compressed and named after their SHA-256 hash.
+    A generation is a small JSON file listing the chunk of each league, the
+    last oid and the time of the save. A league that did not change between
+    saves encodes to the same bytes, so its chunk is already stored and is
+    shared by both generations. Only the chunks of changed leagues are written.
+
+    The files live in a folder next to the database file:
+
+    league.db.backups/chunks/<hash>          one chunk per distinct league version
+    league.db.backups/generation_<n>.json    one file per saved generation
+
+    Once there are more than max_generations generations, the oldest are
+    deleted along with the chunks no remaining generation uses.
+    """
+
+    def __init__(self, folder, max_generations=5):
+        """
+        Constructor for the backup store.
+
+        :param folder: folder holding the chunks and generation files
+        :param max_generations: number of generations to keep
+        """
+        self._folder = folder
+        self._chunk_folder = os.path.join(folder, "chunks")
+        self._max_generations = max_generations
+
+    @property
+    def folder(self):
+        """
+        Getter method for the backup folder.
+
+        :return: the folder name
+        """
+        return self._folder
+
+    def generations(self):
+        """
+        Returns the generations currently kept, oldest first.
+
+        :return: list of (generation number, time saved) tuples
+        """
+        result = []
+        for number in self._generation_numbers():
+            manifest = self._read_manifest(number)
+            result.append((number, datetime.fromisoformat(manifest["saved"])))
+        return result
+
+    def add_generation(self, last_oid, journal_seq, blocks):
+        """
+        Stores a new generation from the encoded leagues of a database.
+
+        :param last_oid: last oid handed out by the database
+        :param journal_seq: number of the last journal record in the database
+        :param blocks: one encoded league (from codec.encode_league()) per league, in order
+        :return: the new generation number
+        """
+        os.makedirs(self._chunk_folder, exist_ok=True)
+        chunks = []
+        for block in blocks:
+            digest = hashlib.sha256(block).hexdigest()
+            chunk_file = os.path.join(self._chunk_folder, digest)
+            if not os.path.exists(chunk_file):
+                replace_file(chunk_file, zlib.compress(block))
+            chunks.append(digest)
+
+        numbers = self._generation_numbers()
+        number = numbers[-1] + 1 if numbers else 1
+        manifest = {
+            "generation": number,
+            "saved": datetime.now().isoformat(),
+            "last_oid": last_oid,
+            "journal_seq": journal_seq,
+            "chunks": chunks,
+        }
+        replace_file(self._manifest_file(number), json.dumps(manifest, indent=2).encode("utf-8"))
+        self._prune(numbers + [number])
+        return number
+
+    def restore(self, generation, database):
+        """
+        Replaces the leagues and last oid of a database with a stored generation.
+
+        :param generation: number of the generation to restore
+        :param database: the LeagueDatabase to fill
+        :return: the database
+        """
+        if generation not in self._generation_numbers():
+            raise ValueError(f"Backup generation {generation} not found")
+        manifest = self._read_manifest(generation)
+        leagues = []
+        for digest in manifest["chunks"]:
+            with open(os.path.join(self._chunk_folder, digest), mode="rb") as file:
+                leagues.append(codec.decode_league(zlib.decompress(file.read())))
+        database._restore_leagues(leagues)
+        database.last_oid = max(database.last_oid, manifest["last_oid"])
+        return database
+
+    def _prune(self, numbers):
+        """
+        Deletes the oldest generations past max_generations and every chunk
+        that the remaining generations do not use.
+
+        :param numbers: generation numbers currently stored, oldest first
+        :return: none
+        """
+        if len(numbers) <= self._max_generations:
+            return
+        for number in numbers[:-self._max_generations]:
+            os.remove(self._manifest_file(number))
+        used = set()
+        for number in numbers[-self._max_generations:]:
+            used.update(self._read_manifest(number)["chunks"])
+        for digest in os.listdir(self._chunk_folder):
+            if digest not in used:
+                os.remove(os.path.join(self._chunk_folder, digest))
+
+    def _generation_numbers(self):
+        """
+        Finds the generation files in the backup folder.
+
+        :return: sorted list of generation numbers
+        """
+        if not os.path.isdir(self._folder):
+            return []
+        numbers = []
+        for name in os.listdir(self._folder):
+            if name.startswith("generation_") and name.endswith(".json"):
+                numbers.append(int(name[len("generation_"):-len(".json")]))
+        return sorted(numbers)
+
+    def _manifest_file(self, number):
+        """
+        Returns the name of the file describing a generation.
+
+        :param number: the generation number
+        :return: the file name
+        """
+        return os.path.join(self._folder, f"generation_{number}.json")
+
+    def _read_manifest(self, number):
+        """
+        Reads the file describing a generation.
+
+        :param number: the generation number
+        :return: dictionary with the generation details
+        """
+        with open(self._manifest_file(number), mode="r", encoding="utf-8") as file:
+            return json.load(file)
@@ -0,0 +1,206 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from bisect import bisect_left, insort
+from datetime import datetime, time, timedelta
+
+
+class CompetitionCalendar:
+    """
+    This class keeps the competitions of a league sorted by date and time,
+    so the schedule views can ask for a range of dates without filtering
+    every competition.
+
+    The competitions are kept in a sorted list of (date_time, oid) keys,
+    found with binary search, plus one sorted list per team for
+    next_competitions(). A range query costs O(log n) to find the start
+    plus the number of competitions returned. Competitions without a date
+    are kept apart and only returned by unscheduled().
+
+    League builds the calendar the first time it is used (see
+    League.calendar) and keeps it up to date when competitions are added or
+    removed and when their date_time changes.
+    """
+
+    __slots__ = ("_keys", "_by_oid", "_team_keys", "_unscheduled")
+
+    def __init__(self, competitions=()):
+        """
+        Constructor for the calendar.
+
+        :param competitions: the competitions to start with
+        """
+        # sorted (date_time, oid) keys, and oid -> competition for the keys
+        self._keys = []
+        self._by_oid = {}
+        # team oid -> sorted (date_time, oid) keys of the team's competitions
+        self._team_keys = {}
+        # oid -> competition, for the competitions without a date
+        self._unscheduled = {}
+        for competition in competitions:
+            self._file(competition, competition.date_time, append=True)
+        self._keys.sort()
+        for keys in self._team_keys.values():
+            keys.sort()
+
+    def __len__(self):
+        """
+        Returns the number of competitions with a date.
+
+        :return: the number of scheduled competitions
+        """
+        return len(self._keys)
+
+    def add(self, competition):
+        """
+        Adds a competition.
+
+        :param competition: the competition
+        :return: none
+        """
+        self._file(competition, competition.date_time)
+
+    def remove(self, competition):
+        """
+        Removes a competition.
+
+        :param competition: the competition
+        :return: none
+        """
+        self._unfile(competition, competition.date_time)
+
+    def move(self, competition, old_date_time, new_date_time):
+        """
+        Moves a competition after its date and time changed.
+
+        :param competition: the competition
+        :param old_date_time: the date and time before the change
+        :param new_date_time: the date and time after the change
+        :return: none
+        """
+        self._unfile(competition, old_date_time)
+        self._file(competition, new_date_time)
+
+    def competitions_between(self, start, end):
+        """
+        Returns the competitions from start (included) to end (not included),
+        in date order.
+
+        :param start: the first date and time, or None for no limit
+        :param end: the date and time to stop at, or None for no limit
+        :return: list of competitions
+        """
+        keys = self._keys
+        first = bisect_left(keys, (start,)) if start is not None else 0
+        last = bisect_left(keys, (end,)) if end is not None else len(keys)
+        by_oid = self._by_oid
+        return [by_oid[oid] for _, oid in keys[first:last]]
+
+    def competitions_on(self, day):
+        """
+        Returns the competitions on a day, in time order.
+
+        :param day: the date
+        :return: list of competitions
+        """
+        start = datetime.combine(day, time.min)
+        return self.competitions_between(start, start + timedelta(days=1))
+
+    def by_day(self, start, end):
+        """
+        Returns the competitions from start to end grouped by day, for the
+        schedule views. Days without competitions are left out.
+
+        :param start: the first date and time, or None for no limit
+        :param end: the date and time to stop at, or None for no limit
+        :return: list of (date, list of competitions) pairs, in date order
+        """
+        days = []
+        for competition in self.competitions_between(start, end):
+            day = competition.date_time.date()
+            if days and days[-1][0] == day:
+                days[-1][1].append(competition)
+            else:
+                days.append((day, [competition]))
+        return days
+
+    def next_competitions(self, team, n, after=None):
+        """
+        Returns the next competitions of a team.
+
+        :param team: the team
+        :param n: the most competitions to return
+        :param after: the date and time to start from (included), the current time if None
+        :return: list of up to n competitions, in date order
+        """
+        if after is None:
+            after = datetime.now()
+        keys = self._team_keys.get(team.oid, ())
+        first = bisect_left(keys, (after,))
+        by_oid = self._by_oid
+        return [by_oid[oid] for _, oid in keys[first:first + n]]
+
+    def unscheduled(self):
+        """
+        Returns the competitions that have no date and time.
+
+        :return: list of competitions
+        """
+        return list(self._unscheduled.values())
+
+    def _file(self, competition, date_time, append=False):
+        """
+        Puts a competition under a date and time.
+
+        :param competition: the competition
+        :param date_time: its date and time, or None
+        :param append: True to append without sorting, when the lists are sorted afterwards
+        :return: none
+        """
+        if date_time is None:
+            self._unscheduled[competition.oid] = competition
+            return
+        key = (date_time, competition.oid)
+        self._by_oid[competition.oid] = competition
+        add = list.append if append else insort
+        add(self._keys, key)
+        for team in competition.teams_competing:
+            add(self._team_keys.setdefault(team.oid, []), key)
+
+    def _unfile(self, competition, date_time):
+        """
+        Takes a competition out from under a date and time.
+
+        :param competition: the competition
+        :param date_time: the date and time it was filed under, or None
+        :return: none
+        """
+        if date_time is None:
+            self._unscheduled.pop(competition.oid, None)
+            return
+        key = (date_time, competition.oid)
+        _discard_key(self._keys, key)
+        self._by_oid.pop(competition.oid, None)
+        for team in competition.teams_competing:
+            keys = self._team_keys.get(team.oid)
+            if keys is not None:
+                _discard_key(keys, key)
+                if not keys:
+                    del self._team_keys[team.oid]
+
+
+def _discard_key(keys, key):
+    """
+    Removes a key from a sorted list, if it is there.
+
+    :param keys: the sorted list
+    :param key: the key
+    :return: none
+    """
+    index = bisect_left(keys, key)
+    if index < len(keys) and keys[index] == key:
+        del keys[index]
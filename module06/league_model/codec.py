@@ -0,0 +1,417 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import lzma
+import pickle
+import struct
+import sys
+import time
+import zlib
+from array import array
+from datetime import datetime
+
+from module06.league_model.competition import Competition
+from module06.league_model.league import League
+from module06.league_model.member_table import ColumnarTeam, MemberTable
+from module06.league_model.team import Team
+from module06.league_model.team_member import TeamMember
+
+# every file written by this codec starts with MAGIC, the format version and the compression used
+MAGIC = b"LGDB"
+VERSION = 2
+HEADER = struct.Struct("<4sBB")
+COMPRESSIONS = {None: 0, "zlib": 1, "lzma": 2}
+
+# Leagues are encoded as blocks of integer columns, written in this order.
+# Strings (names, emails, locations and dates) are stored as indexes into a
+# string pool at the end of the block, with -1 for None. Each league owns the
+# next team_count teams, member_count members and competition_count
+# competitions, each team the next team_member_count entries of team_members
+# (indexes into its league's members), and each competition the next
+# competition_team_count entries of competition_teams (indexes into its
+# league's teams).
+#
+# A block may end with two more columns after the string pool, holding the
+# results of the competitions: competition_result_count (0 for no result, or
+# one score per team) and competition_scores. They are only written when a
+# competition has a result, so blocks of leagues without results, and blocks
+# written before results were kept, end with the string pool.
+#
+# A version 2 payload holds the database column (last oid and journal
+# sequence) followed by one block per league, each preceded by its length,
+# so a league can be encoded, stored or hashed on its own. A version 1 payload
+# is a single block holding every league, with the database column filled in.
+COLUMNS = (
+    "database",
+    "league_oid", "league_name", "league_team_count", "league_member_count", "league_competition_count",
+    "team_oid", "team_name", "team_member_count",
+    "member_oid", "member_name", "member_email",
+    "team_members",
+    "competition_oid", "competition_location", "competition_date_time", "competition_team_count",
+    "competition_teams",
+)
+RESULT_COLUMNS = ("competition_result_count", "competition_scores")
+
+# each column is written as its array typecode and length followed by the values
+ARRAY = struct.Struct("<cQ")
+COUNT = struct.Struct("<Q")
+
+
+def is_codec_data(data):
+    """
+    Checks if bytes were written by this codec.
+
+    :param data: the start of a database file
+    :return: True if the data starts with the codec header
+    """
+    return data[:len(MAGIC)] == MAGIC
+
+
+def dumps(database, compression=None):
+    """
+    Encodes a LeagueDatabase into bytes.
+
+    Only the real data is written: oids, strings and which members are on
+    which teams. The sets kept by League and Team to find duplicates are
+    rebuilt by loads(), and each distinct string is stored only once per league.
+
+    :param database: the LeagueDatabase to encode
+    :param compression: None, "zlib" or "lzma"
+    :return: the encoded database
+    """
+    return join(database, [encode_league(league) for league in database.leagues], compression)
+
+
+def encode_league(league):
+    """
+    Encodes one league as a block. The same league always gives the same bytes.
+
+    :param league: the league to encode
+    :return: the encoded league
+    """
+    return _encode_block([league], ())
+
+
+def decode_league(block):
+    """
+    Decodes a block written by encode_league().
+
+    :param block: the encoded league
+    :return: the league
+    """
+    return _decode_block(memoryview(block))[1][0]
+
+
+def join(database, blocks, compression=None):
+    """
+    Builds the encoded database from league blocks already made with encode_league().
+
+    :param database: the LeagueDatabase the blocks belong to
+    :param blocks: one encoded league per league in the database, in order
+    :param compression: None, "zlib" or "lzma"
+    :return: the encoded database
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression}")
+    parts = [_array_bytes(array("q", (database.last_oid, database._journal_seq)))]
+    for block in blocks:
+        parts.append(COUNT.pack(len(block)))
+        parts.append(block)
+    payload = b"".join(parts)
+    if compression == "zlib":
+        payload = zlib.compress(payload)
+    elif compression == "lzma":
+        payload = lzma.compress(payload)
+    return HEADER.pack(MAGIC, VERSION, COMPRESSIONS[compression]) + payload
+
+
+def loads(data, database, columnar=False):
+    """
+    Decodes bytes written by dumps() into an empty LeagueDatabase.
+
+    With columnar=True the members of each league are kept in a MemberTable
+    made straight from the decoded columns, and the teams are ColumnarTeams,
+    so no TeamMember objects are created. This is meant for very large
+    leagues; see member_table.py.
+
+    :param data: the encoded database
+    :param database: an empty LeagueDatabase object to fill
+    :param columnar: True to keep the members in MemberTables
+    :return: the database
+    """
+    magic, version, compression = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a league database file")
+    if version not in (1, VERSION):
+        raise ValueError(f"Unsupported league database version {version}")
+    payload = memoryview(data)[HEADER.size:]
+    if compression == COMPRESSIONS["zlib"]:
+        payload = memoryview(zlib.decompress(payload))
+    elif compression == COMPRESSIONS["lzma"]:
+        payload = memoryview(lzma.decompress(payload))
+
+    if version == 1:
+        values, leagues = _decode_block(payload, columnar)
+    else:
+        values, offset = _read_array(payload, 0)
+        leagues = []
+        while offset < len(payload):
+            (length,) = COUNT.unpack_from(payload, offset)
+            offset += COUNT.size
+            leagues.extend(_decode_block(payload[offset:offset + length], columnar)[1])
+            offset += length
+
+    database.last_oid, database._journal_seq = values
+    database._restore_leagues(leagues)
+    return database
+
+
+def _encode_block(leagues, values):
+    """
+    Encodes leagues as one block of columns followed by their string pool.
+
+    :param leagues: the leagues to encode
+    :param values: integers for the database column
+    :return: the encoded block
+    """
+    strings = {}
+    columns = {name: array("q") for name in COLUMNS + RESULT_COLUMNS}
+
+    def intern(value):
+        if value is None:
+            return -1
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    columns["database"].extend(values)
+    for league in leagues:
+        teams = league.teams
+        competitions = league.competitions
+        member_indexes = {}
+        for team in teams:
+            columns["team_oid"].append(team.oid)
+            columns["team_name"].append(intern(team.name))
+            member_count = 0
+            for member_oid, member_name, member_email in team.member_values():
+                index = member_indexes.get(member_oid)
+                if index is None:
+                    index = member_indexes[member_oid] = len(member_indexes)
+                    columns["member_oid"].append(member_oid)
+                    columns["member_name"].append(intern(member_name))
+                    columns["member_email"].append(intern(member_email))
+                columns["team_members"].append(index)
+                member_count += 1
+            columns["team_member_count"].append(member_count)
+
+        team_indexes = {team.oid: i for i, team in enumerate(teams)}
+        for competition in competitions:
+            date_time = competition.date_time.isoformat() if competition.date_time else None
+            columns["competition_oid"].append(competition.oid)
+            columns["competition_location"].append(intern(competition.location))
+            columns["competition_date_time"].append(intern(date_time))
+            columns["competition_team_count"].append(len(competition.teams_competing))
+            columns["competition_teams"].extend(team_indexes[team.oid] for team in competition.teams_competing)
+            result = competition.result or ()
+            columns["competition_result_count"].append(len(result))
+            columns["competition_scores"].extend(result)
+
+        columns["league_oid"].append(league.oid)
+        columns["league_name"].append(intern(league.name))
+        columns["league_team_count"].append(len(teams))
+        columns["league_member_count"].append(len(member_indexes))
+        columns["league_competition_count"].append(len(competitions))
+
+    parts = [_array_bytes(columns[name]) for name in COLUMNS]
+    lengths = array("q", (len(value) for value in strings))
+    text = "".join(strings).encode("utf-8", "surrogatepass")
+    parts.extend((_array_bytes(lengths), COUNT.pack(len(text)), text))
+    if columns["competition_scores"]:
+        parts.extend(_array_bytes(columns[name]) for name in RESULT_COLUMNS)
+    return b"".join(parts)
+
+
+def _decode_block(payload, columnar=False):
+    """
+    Decodes a block written by _encode_block().
+
+    :param payload: the block
+    :param columnar: True to keep the members of each league in a MemberTable
+    :return: tuple of the database column and the list of leagues
+    """
+    offset = 0
+    columns = {}
+    for name in COLUMNS + ("string_lengths",):
+        columns[name], offset = _read_array(payload, offset)
+    (text_length,) = COUNT.unpack_from(payload, offset)
+    offset += COUNT.size
+    text = bytes(payload[offset:offset + text_length]).decode("utf-8", "surrogatepass")
+    offset += text_length
+    if offset < len(payload):
+        for name in RESULT_COLUMNS:
+            columns[name], offset = _read_array(payload, offset)
+    else:
+        columns["competition_result_count"] = ()
+    strings = []
+    start = 0
+    for length in columns["string_lengths"]:
+        strings.append(text[start:start + length])
+        start += length
+    strings.append(None)  # index -1
+
+    team_oids = iter(columns["team_oid"])
+    team_names = iter(columns["team_name"])
+    team_member_counts = iter(columns["team_member_count"])
+    member_oids = iter(columns["member_oid"])
+    member_names = iter(columns["member_name"])
+    member_emails = iter(columns["member_email"])
+    team_members = iter(columns["team_members"])
+    competition_oids = iter(columns["competition_oid"])
+    competition_locations = iter(columns["competition_location"])
+    competition_date_times = iter(columns["competition_date_time"])
+    competition_team_counts = iter(columns["competition_team_count"])
+    competition_teams = iter(columns["competition_teams"])
+    competition_result_counts = iter(columns["competition_result_count"])
+    competition_scores = iter(columns.get("competition_scores", ()))
+    dates = {}
+    # where the members and team members of the next league start, for columnar
+    member_start = 0
+    team_member_start = 0
+
+    leagues = []
+    for i, league_oid in enumerate(columns["league_oid"]):
+        league = League(league_oid, strings[columns["league_name"][i]])
+        teams = []
+        if columnar:
+            member_end = member_start + columns["league_member_count"][i]
+            table = MemberTable(columns["member_oid"][member_start:member_end],
+                                columns["member_name"][member_start:member_end],
+                                columns["member_email"][member_start:member_end],
+                                strings[:-1])
+            member_start = member_end
+            for _ in range(columns["league_team_count"][i]):
+                team_member_end = team_member_start + next(team_member_counts)
+                teams.append(ColumnarTeam(next(team_oids), strings[next(team_names)], table,
+                                          columns["team_members"][team_member_start:team_member_end]))
+                team_member_start = team_member_end
+        else:
+            members = [TeamMember(next(member_oids), strings[next(member_names)], strings[next(member_emails)])
+                       for _ in range(columns["league_member_count"][i])]
+            for _ in range(columns["league_team_count"][i]):
+                team = Team(next(team_oids), strings[next(team_names)])
+                team._restore([members[next(team_members)] for _ in range(next(team_member_counts))])
+                teams.append(team)
+        competitions = []
+        for _ in range(columns["league_competition_count"][i]):
+            oid = next(competition_oids)
+            location = strings[next(competition_locations)]
+            date_index = next(competition_date_times)
+            if date_index not in dates:
+                value = strings[date_index]
+                dates[date_index] = datetime.fromisoformat(value) if value is not None else None
+            competing = [teams[next(competition_teams)] for _ in range(next(competition_team_counts))]
+            result_count = next(competition_result_counts, 0)
+            result = [next(competition_scores) for _ in range(result_count)] if result_count else None
+            competitions.append(Competition(oid, competing, location, dates[date_index], result))
+        league._restore(teams, competitions)
+        leagues.append(league)
+    return columns["database"], leagues
+
+
+def load_file(file_name, database, columnar=False):
+    """
+    Reads a database file written with this codec or, for files saved by
+    earlier versions of the program, with pickle.
+
+    :param file_name: name of the database file
+    :param database: an empty LeagueDatabase object, filled for codec files
+    :param columnar: True to keep the members in MemberTables, see loads()
+    :return: the loaded database
+    """
+    with open(file_name, mode="rb") as file:
+        data = file.read()
+    if is_codec_data(data):
+        return loads(data, database, columnar)
+    return pickle.loads(data)
+
+
+def _array_bytes(values):
+    """
+    Returns an integer array as its typecode, count and values, using the
+    smallest integer size that holds every value, in little-endian order.
+
+    :param values: array of integers
+    :return: the bytes of the array
+    """
+    low = min(values, default=0)
+    high = max(values, default=0)
+    for typecode in "bhiq":
+        size = array(typecode).itemsize
+        if -(1 << (8 * size - 1)) <= low and high < (1 << (8 * size - 1)):
+            break
+    values = array(typecode, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return ARRAY.pack(typecode.encode(), len(values)) + values.tobytes()
+
+
+def _read_array(payload, offset):
+    """
+    Reads one integer array written by _array_bytes().
+
+    :param payload: the decoded bytes
+    :param offset: where the array starts
+    :return: tuple of the array and the offset after it
+    """
+    typecode, count = ARRAY.unpack_from(payload, offset)
+    offset += ARRAY.size
+    values = array(typecode.decode())
+    end = offset + count * values.itemsize
+    values.frombytes(payload[offset:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, end
+
+
+def main():
+    """
+    Compares the file size and the save and load times of this codec with
+    the pickle files written by earlier versions of LeagueDatabase.save().
+    A test database is built with the number of members given on the command
+    line (200,000 by default), for example
+
+    python -m module06.league_model.codec 1000000
+
+    :return: none
+    """
+    from module06.league_model.league_database import LeagueDatabase
+    from module06.league_model.memory_usage import build_test_database
+
+    member_total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    database = build_test_database(LeagueDatabase(), member_total)
+
+    def measure(name, save, load):
+        start = time.perf_counter()
+        data = save()
+        save_time = time.perf_counter() - start
+        start = time.perf_counter()
+        load(data)
+        load_time = time.perf_counter() - start
+        print(f"{name:<14}{len(data) / 1_000_000:>10.2f} MB{save_time:>10.2f} s{load_time:>10.2f} s")
+
+    print(f"{sum(len(team.members) for league in database.leagues for team in league.teams)} members "
+          f"in {len(database.leagues)} leagues")
+    print(f"{'format':<14}{'size':>13}{'save':>12}{'load':>12}")
+    measure("pickle", lambda: pickle.dumps(database), pickle.loads)
+    for compression in COMPRESSIONS:
+        measure(f"codec {compression or 'none'}", lambda: dumps(database, compression),
+                lambda data: loads(data, LeagueDatabase()))
+
+
+if __name__ == "__main__":
+    main()
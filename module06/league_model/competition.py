@@ -12,18 +12,23 @@ class Competition(IdentifiedObject):
     """
     This class is for the Competition object.
     """
-    def __init__(self, oid, teams, location, datetime):
+
+    __slots__ = ("_teams_competing", "_location", "_date_time", "_result")
+
+    def __init__(self, oid, teams, location, datetime, result=None):
         """
         This is the contractor
         :param oid: this is the unique ID for each competition
         :param teams: this is a list of teams in the competition
         :param location: this is the location of the competition
         :param datetime: a datetime object representing when the competition will occur
+        :param result: the scores of the teams, in the order of teams, or None if not played yet
         """
         super().__init__(oid)
         self._teams_competing = teams
         self._location = location
         self._date_time = datetime
+        self._result = tuple(result) if result is not None else None
 
     @property
     def teams_competing(self):
@@ -49,7 +54,10 @@ class Competition(IdentifiedObject):
         :param value: the datetime value to set for the competition
         :return: none
         """
+        old_date_time = self._date_time
         self._date_time = value
+        self._reindex("date_time", old_date_time, value)
+        self._notify("set_date_time", value, old_date_time)
 
     @property
     def location(self):
@@ -68,7 +76,63 @@ class Competition(IdentifiedObject):
         :param value: the location to set
         :return: none
         """
+        old_location = self._location
         self._location = value
+        self._notify("set_location", value, old_location)
+
+    @property
+    def result(self):
+        """
+        Getter method for the result of the competition: the score of each
+        team, in the order of teams_competing.
+
+        :return: tuple of scores, or None if no result was recorded
+        """
+        return self._result
+
+    @result.setter
+    def result(self, value):
+        """
+        Setter method for the result of the competition. Setting it again
+        corrects the result, and None clears it. The league the competition
+        is in updates its standings from the change.
+
+        :param value: the score of each team, in the order of teams_competing, or None
+        :return: none
+        """
+        if value is not None:
+            value = tuple(value)
+            if len(value) != len(self._teams_competing):
+                raise ValueError("A result needs one score for each team in the competition")
+            if not all(isinstance(score, int) for score in value):
+                raise ValueError("Scores must be whole numbers")
+        old_result = self._result
+        self._result = value
+        self._reindex("result", old_result, value)
+        self._notify("set_result", value, old_result)
+
+    def record_result(self, *scores):
+        """
+        Records the result of the competition, such as competition.record_result(3, 1).
+
+        :param scores: the score of each team, in the order of teams_competing
+        :return: none
+        """
+        self.result = scores
+
+    @property
+    def winner(self):
+        """
+        Getter method for the team with the highest score.
+
+        :return: the winning team, or None if there is no result or the top score is shared
+        """
+        if self._result is None:
+            return None
+        best = max(self._result)
+        if self._result.count(best) > 1:
+            return None
+        return self._teams_competing[self._result.index(best)]
 
     def send_email(self, emailer, subject, message):
         """
@@ -77,14 +141,24 @@ class Competition(IdentifiedObject):
         :param emailer: The object used to email
         :param subject: Subject of the email
         :param message: Message to send in the email
-        :return: none
+        :return: the delivery status of each recipient, from the emailer
         """
         email_recipients = {
-            member.email for team in self.teams_competing
-            for member in team.members if member.email is not None
+            email for team in self.teams_competing
+            for _, _, email in team.member_values() if email is not None
         }
-        emailer.send_plain_email(email_recipients, subject, message)
+        return emailer.send_plain_email(email_recipients, subject, message)
+
+    def __setstate__(self, state):
+        """
+        Restores the state used by pickle and copy. Competitions pickled
+        before results were kept have no result.
 
+        :param state: dictionary of the competition fields
+        :return: none
+        """
+        self._result = None
+        super().__setstate__(state)
 
     def __str__(self):
         """
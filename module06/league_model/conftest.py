@@ -0,0 +1,77 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import pytest
+
+from module06.league_model.league import League
+from module06.league_model.league_database import LeagueDatabase
+from module06.league_model.team import Team
+from module06.league_model.team_member import TeamMember
+
+
+def make_league(database, name="Curling", teams=3, members=3):
+    """
+    Adds a league to a database with some teams, each with its own members.
+
+    :param database: the LeagueDatabase
+    :param name: name of the league
+    :param teams: number of teams
+    :param members: number of members on each team
+    :return: the league
+    """
+    league = League(database.next_oid(), name)
+    database.add_league(league)
+    for i in range(teams):
+        team = Team(database.next_oid(), f"{name} team {i}")
+        for j in range(members):
+            oid = database.next_oid()
+            team.add_member(TeamMember(oid, f"Member {oid}", f"member{oid}@example.com"))
+        league.add_team(team)
+    return league
+
+
+def league_contents(database):
+    """
+    Returns the contents of every league of a database as plain values, to
+    compare a database with the one read back from a file.
+
+    :param database: the LeagueDatabase
+    :return: list with a tuple for each league
+    """
+    return [(league.oid, league.name,
+             [(team.oid, team.name, [(m.oid, m.name, m.email) for m in team.members]) for team in league.teams],
+             [(c.oid, [t.oid for t in c.teams_competing], c.location, c.date_time, c.result)
+              for c in league.competitions])
+            for league in database.leagues]
+
+
+@pytest.fixture
+def database():
+    """
+    A database with one league of three teams of three members. It is
+    closed after the test, which stops any journal it started.
+
+    :return: the LeagueDatabase
+    """
+    database = LeagueDatabase()
+    make_league(database)
+    yield database
+    database.close()
+
+
+@pytest.fixture(autouse=True)
+def close_sole_instance():
+    """
+    Closes the database loaded by LeagueDatabase.load() in a test, so its
+    files are let go before the next test.
+
+    :return: none
+    """
+    yield
+    if LeagueDatabase._sole_instance is not None:
+        LeagueDatabase._sole_instance.close()
+        LeagueDatabase._sole_instance = None
@@ -0,0 +1,633 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from module06.league_model.exceptions import BatchError, DuplicateOid, DuplicateEmail
+from module06.league_model.name_index import NameIndex
+from module06.league_model.team import _check_new_members, _email_key
+from module06.league_model.team_member import TeamMember
+
+
+class TeamEditSession:
+    """
+    This class lets a team be edited without changing it until the edits
+    are committed, as the edit dialogs need, without copying the team first.
+
+    The session has the same methods as Team for reading and changing the
+    members. Until the first change it reads straight from the team. The
+    first change makes a dictionary of the members, which is then changed
+    instead of the team, and a member is only copied when it is edited
+    with edit_member(). commit() makes the same changes to the team with
+    its own methods, so the team keeps its identity and the indexes, the
+    journal and the change events see each change. cancel() drops them.
+
+    The team can also be another TeamEditSession, so a dialog can edit a
+    team that is already being edited by the dialog that opened it.
+    """
+
+    def __init__(self, team, owner=None):
+        """
+        Constructor for the edit session.
+
+        :param team: the team to edit, or another TeamEditSession
+        :param owner: the LeagueEditSession that indexes this session by name, or None
+        """
+        self._team = team
+        self._owner = owner
+        self.cancel()
+
+    @property
+    def oid(self):
+        """
+        Getter method for the team oid.
+
+        :return: the oid
+        """
+        return self._team.oid
+
+    @property
+    def team(self):
+        """
+        Getter method for the team being edited.
+
+        :return: the team
+        """
+        return self._team
+
+    @property
+    def name(self):
+        """
+        Getter method for the team name, with the edits made in the session.
+
+        :return: the team name
+        """
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        """
+        Setter method for the team name. The team is renamed on commit().
+
+        :param value: the new name
+        :return: none
+        """
+        self._rename(value)
+
+    @property
+    def members(self):
+        """
+        Getter method for the team members, with the edits made in the session.
+
+        :return: tuple of the members
+        """
+        if self._members is None:
+            return tuple(self._team.members)
+        edited = self._edited
+        return tuple(edited.get(oid, member) for oid, member in self._members.items())
+
+    def member_values(self):
+        """
+        Returns the oid, name and email of each member, with the edits made in the session.
+
+        :return: iterator of (oid, name, email) tuples
+        """
+        if self._members is None:
+            return self._team.member_values()
+        return ((member.oid, member.name, member.email) for member in self.members)
+
+    def member_named(self, s):
+        """
+        Returns the first member with the provided name.
+
+        :param s: name of the member to return if it exists
+        :return: the member object, or None
+        """
+        if self._members is None:
+            return self._team.member_named(s)
+        return self._members_by_name.find(s)
+
+    def member_with_oid(self, oid):
+        """
+        Returns the member with the provided oid.
+
+        :param oid: oid of the member to return if it exists
+        :return: the member object, or None
+        """
+        if self._members is None:
+            return self._team.member_with_oid(oid)
+        return self._edited.get(oid, self._members.get(oid))
+
+    def member_with_email(self, email):
+        """
+        Returns the member with the provided email. Case is ignored.
+
+        :param email: email of the member to return if it exists
+        :return: the member object, or None
+        """
+        if self._members is None:
+            return self._team.member_with_email(email)
+        if email is None:
+            return None
+        oid = self._members_by_email.get(_email_key(email))
+        return self.member_with_oid(oid) if oid is not None else None
+
+    def add_member(self, member):
+        """
+        Adds a member, as Team.add_member() does. The member is added to the
+        team on commit().
+
+        :param member: member to add to the team
+        :return: none
+        """
+        self._start_changes()
+        if member.oid in self._members:
+            raise DuplicateOid(member.oid)
+        if member.email is not None and _email_key(member.email) in self._members_by_email:
+            raise DuplicateEmail(member.email)
+        self._members[member.oid] = member
+        self._members_by_name.add(member.name, member)
+        if member.email is not None:
+            self._members_by_email[_email_key(member.email)] = member.oid
+        # the session keeps its email index up to date if the new member is edited
+        member._add_owner(self)
+
+    def add_members(self, members):
+        """
+        Adds several members, as Team.add_members() does. The members are
+        added to the team on commit().
+
+        :param members: the members to add, in order
+        :return: none
+        """
+        self._start_changes()
+        members = list(members)
+        errors = _check_new_members(members, self._members, self._members_by_email)
+        if errors:
+            raise BatchError(errors)
+        for member in members:
+            self.add_member(member)
+
+    def remove_member(self, member):
+        """
+        Removes a member. The member is removed from the team on commit().
+
+        :param member: member to remove from the team
+        :return: none
+        """
+        self._start_changes()
+        current = self.member_with_oid(member.oid)
+        if current is None:
+            return
+        del self._members[member.oid]
+        self._edited.pop(member.oid, None)
+        self._members_by_name.remove(current.name, current)
+        if current.email is not None and self._members_by_email.get(_email_key(current.email)) == member.oid:
+            del self._members_by_email[_email_key(current.email)]
+        current._remove_owner(self)
+
+    def edit_member(self, member):
+        """
+        Returns a member that can be changed with its name and email setters.
+        A member of the team is copied the first time it is edited, and the
+        copy is returned after that; a member added in the session is
+        returned as it is.
+
+        :param member: a member of the team
+        :return: the member to change
+        """
+        self._start_changes()
+        current = self.member_with_oid(member.oid)
+        if current is None or member.oid in self._edited or self._team.member_with_oid(member.oid) is None:
+            return current
+        clone = TeamMember(current.oid, current.name, current.email)
+        clone._add_owner(self)
+        self._edited[clone.oid] = clone
+        self._members_by_name.remove(current.name, current)
+        self._members_by_name.add(clone.name, clone)
+        return clone
+
+    def is_modified(self):
+        """
+        Checks if anything was changed in the session.
+
+        :return: True if there are edits to commit
+        """
+        if self._name != self._team.name:
+            return True
+        if self._members is None:
+            return False
+        original = list(self._team.member_values())
+        if [oid for oid, _, _ in original] != list(self._members):
+            return True
+        return any(self._edited[oid].name != name or self._edited[oid].email != email
+                   for oid, name, email in original if oid in self._edited)
+
+    def commit(self):
+        """
+        Makes the edits of the session to the team, then starts a new session
+        on the changed team.
+
+        :return: none
+        """
+        self._apply()
+        self.cancel()
+
+    def _apply(self):
+        """
+        Makes the edits of the session to the team, keeping them in the
+        session. Members removed in the session are removed first, then the
+        edited members are changed and the new members are added, so an
+        email can move from one member to another.
+
+        LeagueEditSession.commit() calls this for each team inside a
+        transaction, and only drops the edits once every team is done, so
+        the edits are still there if the transaction is rolled back.
+
+        :return: none
+        """
+        team = self._team
+        if self._name != team.name:
+            team.name = self._name
+        if self._members is not None:
+            original = [oid for oid, _, _ in team.member_values()]
+            original_oids = set(original)
+            for oid in original:
+                if oid not in self._members:
+                    team.remove_member(team.member_with_oid(oid))
+
+            # emails that another edited member still has are set once that member has changed
+            waiting = []
+            for oid, clone in self._edited.items():
+                target = team.member_with_oid(oid)
+                if isinstance(team, TeamEditSession):
+                    target = team.edit_member(target)
+                if target.name != clone.name:
+                    target.name = clone.name
+                if target.email != clone.email:
+                    try:
+                        target.email = clone.email
+                    except DuplicateEmail:
+                        target.email = None
+                        waiting.append((target, clone.email))
+            for target, email in waiting:
+                target.email = email
+
+            # the new members keep the session as an owner until cancel()
+            for oid, member in self._members.items():
+                if oid not in original_oids:
+                    team.add_member(member)
+
+    def cancel(self):
+        """
+        Drops the edits of the session.
+
+        :return: none
+        """
+        if getattr(self, "_members", None) is not None:
+            # only the copies and the members added in the session have the session as an owner
+            for member in self._members.values():
+                member._remove_owner(self)
+            for member in self._edited.values():
+                member._remove_owner(self)
+        if hasattr(self, "_name"):
+            self._rename(self._team.name)
+        else:
+            self._name = self._team.name
+        # oid -> member, made from the team by the first change
+        self._members = None
+        # name -> member, and lowercase email -> oid, of the members in _members
+        self._members_by_name = None
+        self._members_by_email = None
+        # oid -> copy of a member of the team changed with edit_member()
+        self._edited = {}
+
+    def _rename(self, value):
+        """
+        Sets the name kept in the session and tells the league session, which
+        indexes its teams by name.
+
+        :param value: the new name
+        :return: none
+        """
+        old_name = self._name
+        self._name = value
+        if self._owner is not None and old_name != value:
+            self._owner._index_changed(self, "name", old_name, value)
+
+    def _start_changes(self):
+        """
+        Makes the member dictionary and email index from the team, the first
+        time the members are changed.
+
+        :return: none
+        """
+        if self._members is None:
+            self._members = {member.oid: member for member in self._team.members}
+            self._members_by_name = NameIndex((member.name, member) for member in self._members.values())
+            self._members_by_email = {_email_key(email): oid for oid, _, email in self._team.member_values()
+                                      if email is not None}
+
+    def _index_changed(self, member, attribute, old_value, new_value):
+        """
+        Called by a member edited in the session when its name or email
+        changes, so the indexes of the session can be updated.
+
+        :param member: the member that changed
+        :param attribute: "name" or "email"
+        :param old_value: the value before the change
+        :param new_value: the value after the change
+        :return: none
+        """
+        if attribute == "name":
+            self._members_by_name.remove(old_value, member)
+            self._members_by_name.add(new_value, member)
+        elif attribute == "email":
+            if old_value is not None and self._members_by_email.get(_email_key(old_value)) == member.oid:
+                del self._members_by_email[_email_key(old_value)]
+            if new_value is not None:
+                self._members_by_email[_email_key(new_value)] = member.oid
+
+    def __str__(self):
+        """
+        Returns a string value of the object.
+
+        :return: string value of the object
+        """
+        return f"{self._name}: {len(self.members)} members"
+
+
+class LeagueEditSession:
+    """
+    This class lets a league be edited without changing it until the edits
+    are committed, in place of a deep copy of the league.
+
+    Opening a session only makes a TeamEditSession for each team, which does
+    not copy anything until its team is changed, so a league with many
+    members opens as fast as a small one. The session has the methods of
+    League used by the edit dialogs, the importers and export: teams gives
+    the team sessions plus the teams added in the session, and add_team()
+    and remove_team() change only the session. commit() makes the changes
+    to the league with its own methods; cancel() drops them.
+
+    The teams are kept in a dictionary by oid and indexed by name, as League
+    does, so an import that looks up and adds a team for every row does not
+    search the teams. The session is an owner of the teams added in it, so
+    renaming one of them updates the name index.
+
+    Competitions are not edited in the session and are read from the league.
+    """
+
+    # teams added in the session have it as an owner, and teams check their
+    # owners for an open transaction; a session never records one
+    _recorder = None
+
+    def __init__(self, league):
+        """
+        Constructor for the edit session.
+
+        :param league: the league to edit
+        """
+        self._league = league
+        self.cancel()
+
+    @property
+    def oid(self):
+        """
+        Getter method for the league oid.
+
+        :return: the oid
+        """
+        return self._league.oid
+
+    @property
+    def league(self):
+        """
+        Getter method for the league being edited.
+
+        :return: the league
+        """
+        return self._league
+
+    @property
+    def name(self):
+        """
+        Getter method for the league name, with the edits made in the session.
+
+        :return: the league name
+        """
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        """
+        Setter method for the league name. The league is renamed on commit().
+
+        :param value: the new name
+        :return: none
+        """
+        self._name = value
+
+    @property
+    def teams(self):
+        """
+        Getter method for the teams: a TeamEditSession for each team of the
+        league still in the session, followed by the teams added in the session.
+
+        :return: tuple of teams
+        """
+        return tuple(self._teams.values())
+
+    @property
+    def competitions(self):
+        """
+        Getter method for the competitions of the league.
+
+        :return: list of competitions
+        """
+        return self._league.competitions
+
+    def add_team(self, team):
+        """
+        Adds a new team. It is added to the league on commit().
+
+        :param team: the team to add
+        :return: none
+        """
+        if team.oid in self._teams:
+            raise DuplicateOid(team.oid)
+        self._insert_team(team)
+
+    def add_teams(self, teams):
+        """
+        Adds several new teams, as League.add_teams() does. They are added
+        to the league on commit().
+
+        :param teams: the teams to add, in order
+        :return: none
+        """
+        teams = list(teams)
+        errors = []
+        batch_oids = set()
+        for team in teams:
+            if team.oid in self._teams or team.oid in batch_oids:
+                errors.append((team, DuplicateOid(team.oid)))
+            else:
+                batch_oids.add(team.oid)
+        if errors:
+            raise BatchError(errors)
+        for team in teams:
+            self._insert_team(team)
+
+    def remove_team(self, team):
+        """
+        Removes a team. It is removed from the league on commit(). Teams
+        that are in a competition cannot be removed.
+
+        :param team: the team, or its TeamEditSession
+        :return: none
+        """
+        if self._league.competitions_for_team(team):
+            raise ValueError("Team cannot be deleted as it is involved in a competition")
+        team = self._teams.pop(team.oid, None)
+        if team is not None:
+            self._teams_by_name.remove(team.name, team)
+            if not isinstance(team, TeamEditSession):
+                team._remove_owner(self)
+
+    def team_named(self, team_name):
+        """
+        Returns the first team with the provided name.
+
+        :param team_name: name of the team
+        :return: the team, or None
+        """
+        return self._teams_by_name.find(team_name)
+
+    def competitions_for_team(self, team):
+        """
+        Returns the competitions of the league the team is in.
+
+        :param team: the team
+        :return: list of competitions
+        """
+        return self._league.competitions_for_team(team)
+
+    def is_modified(self):
+        """
+        Checks if anything was changed in the session.
+
+        :return: True if there are edits to commit
+        """
+        if self._name != self._league.name:
+            return True
+        if list(self._teams) != [team.oid for team in self._league.teams]:
+            return True
+        return any(team.is_modified() for team in self._teams.values() if isinstance(team, TeamEditSession))
+
+    def commit(self):
+        """
+        Makes the edits of the session to the league, then starts a new
+        session on the changed league. The edits are made in one transaction
+        on the league, so they are all undone if one of them fails, and
+        league.undo() undoes the whole save.
+
+        :return: none
+        """
+        league = self._league
+        # the team sessions keep their edits until the transaction is done, in case it is rolled back
+        with league.transaction():
+            if self._name != league.name:
+                league.name = self._name
+            league.remove_teams([team for team in league.teams
+                                 if not isinstance(self._teams.get(team.oid), TeamEditSession)])
+            # teams added in the session always come after the teams of the league
+            for team in self._teams.values():
+                if isinstance(team, TeamEditSession):
+                    team._apply()
+            league.add_teams([team for team in self._teams.values() if not isinstance(team, TeamEditSession)])
+        self.cancel()
+
+    def cancel(self):
+        """
+        Drops the edits of the session.
+
+        :return: none
+        """
+        for team in getattr(self, "_teams", {}).values():
+            if isinstance(team, TeamEditSession):
+                team.cancel()
+            else:
+                team._remove_owner(self)
+        self._name = self._league.name
+        # oid -> TeamEditSession for the teams of the league, followed by the teams added in the session
+        self._teams = {team.oid: TeamEditSession(team, self) for team in self._league.teams}
+        self._teams_by_name = NameIndex((team.name, team) for team in self._teams.values())
+
+    def _insert_team(self, team):
+        """
+        Adds a team to the session and its name index.
+
+        :param team: the team
+        :return: none
+        """
+        self._teams[team.oid] = team
+        self._teams_by_name.add(team.name, team)
+        if not isinstance(team, TeamEditSession):
+            team._add_owner(self)
+
+    def _index_changed(self, team, attribute, old_value, new_value):
+        """
+        Called by a team of the session when it is renamed, so the name index
+        can be updated.
+
+        :param team: the team, or its TeamEditSession
+        :param attribute: name of the attribute that changed
+        :param old_value: the value before the change
+        :param new_value: the value after the change
+        :return: none
+        """
+        if attribute == "name":
+            self._teams_by_name.remove(old_value, team)
+            self._teams_by_name.add(new_value, team)
+
+    def _member_added(self, team, member):
+        """
+        Called by a team added in the session when a member is added. The
+        session does not index members.
+
+        :param team: the team
+        :param member: the member
+        :return: none
+        """
+
+    def _member_removed(self, team, member):
+        """
+        Called by a team added in the session when a member is removed.
+
+        :param team: the team
+        :param member: the member
+        :return: none
+        """
+
+    def _member_changed(self, team, member, attribute, old_value, new_value):
+        """
+        Called by a team added in the session when a member's name or email changes.
+
+        :param team: the team
+        :param member: the member
+        :param attribute: "name" or "email"
+        :param old_value: the value before the change
+        :param new_value: the value after the change
+        :return: none
+        """
+
+    def __str__(self):
+        """
+        Returns a string value of the object.
+
+        :return: string value of the object
+        """
+        return f"{self._name}: {len(self._teams)} teams, {len(self.competitions)} competitions"
@@ -5,8 +5,18 @@
 # Author: Alan Cruce
 # Date: April 28, 2025
 
+import smtplib
+
 import yagmail
 
+# most recipients put in the Bcc of one message by send_batched_email()
+DEFAULT_BATCH_SIZE = 100
+# times a message is tried when the connection to the server is lost
+MAX_ATTEMPTS = 3
+
+# delivery status of a recipient the server accepted
+SENT = "sent"
+
 class Emailer:
     """
     Class for emailer object. This makes use of the yagmail module.
@@ -23,10 +33,18 @@ class Emailer:
     I was able to successfully test this using another personal email address.
     My sender email address had the email in the sent messages folder, and my
     recipient email address received the message as expected.
+
+    yagmail.SMTP.send() connects and logs in again for every message, so the
+    emailer logs in once and sends the messages built by yagmail over that
+    connection, logging in again only if the server drops it. Emails to many
+    recipients can also be sent in batches, with the recipients in the Bcc
+    of each message (see send_batched_email()), so 5,000 members take 50
+    messages instead of 5,000.
     """
 
     # class variables
     _sender_address = None # set in the configure() method
+    _batch_size = None # set in the configure() method, None for one message per recipient
     _sole_instance = None
 
     def __init__(self):
@@ -39,7 +57,7 @@ class Emailer:
         self._yag = yagmail.SMTP(Emailer._sender_address)
 
     @classmethod
-    def configure(cls, sender_address):
+    def configure(cls, sender_address, batch_size=None):
         """
         Class method for setting the sender address.
 
@@ -48,9 +66,12 @@ class Emailer:
 
 
         :param sender_address: sender address to set
+        :param batch_size: when set, send_plain_email() sends batches of this
+            many Bcc recipients instead of one message per recipient
         :return: none
         """
         cls._sender_address = sender_address
+        cls._batch_size = batch_size
 
     @classmethod
     def instance(cls):
@@ -68,14 +89,102 @@ class Emailer:
         has been run, this method will loop over the list of recipients,
         and email each recipient with the same subject and message.
 
+        If configure() was given a batch size, the email is sent with
+        send_batched_email() instead.
+
+        :param recipients: list of email addresses to send to
+        :param subject: subject of the email
+        :param message: message of the email
+        :return: dictionary of the delivery status of each recipient, SENT or the reason it failed
+        """
+        if Emailer._batch_size:
+            return self.send_batched_email(recipients, subject, message, Emailer._batch_size)
+        status = {}
+        for recipient in dict.fromkeys(recipients):
+            envelope, message_text = self._yag.prepare_send(to=recipient, subject=subject, contents=message)
+            status.update(self._deliver([recipient], envelope, message_text))
+        print_summary(status)
+        return status
+
+    def send_batched_email(self, recipients, subject, message, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        Sends an email to many recipients in batches. Each batch is one
+        message addressed to the sender, with the batch of recipients in the
+        Bcc so they do not see each other's addresses. Every batch is sent
+        over the same connection.
+
         :param recipients: list of email addresses to send to
         :param subject: subject of the email
         :param message: message of the email
+        :param batch_size: most recipients in one message
+        :return: dictionary of the delivery status of each recipient, SENT or the reason it failed
+        """
+        recipients = list(dict.fromkeys(recipients))
+        status = {}
+        for start in range(0, len(recipients), batch_size):
+            batch = recipients[start:start + batch_size]
+            envelope, message_text = self._yag.prepare_send(to=Emailer._sender_address, subject=subject,
+                                                            contents=message, bcc=batch)
+            status.update(self._deliver(batch, envelope, message_text))
+        print_summary(status)
+        return status
+
+    def close(self):
+        """
+        Closes the connection to the mail server. The next email opens a new one.
+
         :return: none
         """
-        for recipient in recipients:
-            print(f"Sending email to {recipient}")
-            self._yag.send(recipient, subject, message)
+        if self._yag.is_closed is False:
+            self._yag.close()
+
+    def _deliver(self, recipients, envelope, message_text):
+        """
+        Sends one message over the open connection, logging in first if
+        there is no connection, and logging in again and retrying if the
+        server drops the connection.
+
+        :param recipients: the recipients to report on
+        :param envelope: every address the message is sent to
+        :param message_text: the message built by yagmail
+        :return: dictionary of the delivery status of each recipient
+        """
+        error = None
+        for _ in range(MAX_ATTEMPTS):
+            try:
+                if self._yag.is_closed is not False:
+                    self._yag.login()
+                refused = self._yag.smtp.sendmail(self._yag.user, envelope, message_text)
+                break
+            except smtplib.SMTPRecipientsRefused as e:
+                # every recipient was refused
+                refused = e.recipients
+                break
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError) as e:
+                error = e
+                self._yag.is_closed = True
+            except smtplib.SMTPException as e:
+                # the server would not take the message, so sending it again will not help
+                return {recipient: f"failed: {e}" for recipient in recipients}
+        else:
+            return {recipient: f"failed: {error}" for recipient in recipients}
+        return {recipient: f"refused: {refused[recipient]}" if recipient in refused else SENT
+                for recipient in recipients}
+
+
+def print_summary(status):
+    """
+    Prints how many recipients an email was sent to, in place of a line for every recipient.
+    Used by Emailer and AsyncEmailer once an email is sent.
+
+    :param status: dictionary of the delivery status of each recipient
+    :return: none
+    """
+    sent = sum(1 for value in status.values() if value == SENT)
+    print(f"Email sent to {sent} of {len(status)} recipients")
+    for recipient, value in status.items():
+        if value != SENT:
+            print(f"Email to {recipient} {value}")
 
 def main():
     """
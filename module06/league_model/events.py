@@ -0,0 +1,261 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+
+class ChangeEvent:
+    """
+    This is the base class of the events sent through model_events when a
+    model object or the database changes. Every event has the object that
+    changed (source), the name of the change (operation, such as "add_team"
+    or "rename") and the values involved in the change (args). The
+    subclasses give the values names.
+    """
+
+    __slots__ = ("source", "operation", "args")
+
+    def __init__(self, source, operation, args):
+        """
+        Constructor for the event.
+
+        :param source: the object that changed
+        :param operation: name of the change
+        :param args: tuple of the values involved in the change
+        """
+        self.source = source
+        self.operation = operation
+        self.args = args
+
+    def __repr__(self):
+        """
+        Returns a string value of the event.
+
+        :return: string value of the event
+        """
+        return f"{type(self).__name__}({self.operation}, {self.source}, {self.args})"
+
+
+class ObjectAdded(ChangeEvent):
+    """
+    A league, team, team member or competition was added to source.
+    """
+
+    __slots__ = ()
+
+    @property
+    def obj(self):
+        """
+        Getter method for the object added.
+
+        :return: the object
+        """
+        return self.args[0]
+
+    @property
+    def index(self):
+        """
+        Getter method for the position the object was put at, for teams,
+        members and competitions.
+
+        :return: the position, or None for the end of the list or a league
+        """
+        return self.args[1] if len(self.args) > 1 else None
+
+
+class ObjectRemoved(ChangeEvent):
+    """
+    A league, team, team member or competition was removed from source.
+    """
+
+    __slots__ = ()
+
+    @property
+    def obj(self):
+        """
+        Getter method for the object removed.
+
+        :return: the object
+        """
+        return self.args[0]
+
+    @property
+    def index(self):
+        """
+        Getter method for the position the object was at. For members it is
+        only known while a transaction is recording the team's league.
+
+        :return: the position, or None if it is not known
+        """
+        return self.args[1] if len(self.args) > 1 else None
+
+
+class ObjectReplaced(ChangeEvent):
+    """
+    A league or team of source was replaced by an edited copy.
+    """
+
+    __slots__ = ()
+
+    @property
+    def old(self):
+        """
+        Getter method for the object that was replaced.
+
+        :return: the old object
+        """
+        return self.args[0]
+
+    @property
+    def new(self):
+        """
+        Getter method for the object put in its place.
+
+        :return: the new object
+        """
+        return self.args[1]
+
+
+class FieldChanged(ChangeEvent):
+    """
+    A field of source (its name, email, location, date and time or result) was set.
+    """
+
+    __slots__ = ()
+
+    # operation -> name of the field it sets
+    FIELDS = {"rename": "name", "set_email": "email", "set_location": "location", "set_date_time": "date_time",
+              "set_result": "result"}
+
+    @property
+    def field(self):
+        """
+        Getter method for the name of the field that changed.
+
+        :return: the field name
+        """
+        return self.FIELDS[self.operation]
+
+    @property
+    def new_value(self):
+        """
+        Getter method for the value after the change.
+
+        :return: the new value
+        """
+        return self.args[0]
+
+    @property
+    def old_value(self):
+        """
+        Getter method for the value before the change.
+
+        :return: the old value
+        """
+        return self.args[1]
+
+
+class LeaguesRestored(ChangeEvent):
+    """
+    All the leagues of the database (source) were replaced, such as by
+    restoring a backup.
+    """
+
+    __slots__ = ()
+
+    @property
+    def leagues(self):
+        """
+        Getter method for the leagues now in the database.
+
+        :return: list of leagues
+        """
+        return self.args[0]
+
+
+# operation -> event class
+EVENT_TYPES = {
+    "add_league": ObjectAdded, "add_team": ObjectAdded, "add_member": ObjectAdded, "add_competition": ObjectAdded,
+    "remove_league": ObjectRemoved, "remove_team": ObjectRemoved, "remove_member": ObjectRemoved,
+    "remove_competition": ObjectRemoved,
+    "replace_league": ObjectReplaced, "replace_team": ObjectReplaced,
+    "rename": FieldChanged, "set_email": FieldChanged, "set_location": FieldChanged, "set_date_time": FieldChanged,
+    "set_result": FieldChanged,
+    "restore": LeaguesRestored,
+}
+
+
+class EventBus:
+    """
+    This class sends the change events of the model objects to the
+    callbacks subscribed to them, such as the journal, indexes kept outside
+    the model, or UI lists that update one row instead of being rebuilt.
+
+    Events are only created when there is at least one subscriber, and
+    the model objects check for subscribers before calling publish(), so a
+    change costs one attribute check when nobody is listening.
+
+    Callbacks are called on the thread that made the change, right after
+    the change, in the order they subscribed.
+    """
+
+    __slots__ = ("_subscribers",)
+
+    def __init__(self):
+        """
+        Constructor for the event bus.
+        """
+        # tuple of (callback, event class) pairs, replaced on every change so
+        # publish() can loop over it while callbacks subscribe or unsubscribe
+        self._subscribers = ()
+
+    def subscribe(self, callback, event_type=ChangeEvent):
+        """
+        Subscribes a callback to the events of a type and its subclasses.
+
+        :param callback: callable taking one ChangeEvent
+        :param event_type: the event class to receive, ChangeEvent for every event
+        :return: the callback, so this can be used as a decorator
+        """
+        self._subscribers = self._subscribers + ((callback, event_type),)
+        return callback
+
+    def unsubscribe(self, callback):
+        """
+        Stops sending events to a callback. Nothing happens if it was not subscribed.
+
+        :param callback: the callback passed to subscribe()
+        :return: none
+        """
+        self._subscribers = tuple(pair for pair in self._subscribers if pair[0] != callback)
+
+    def has_subscribers(self):
+        """
+        Checks if any callback is subscribed.
+
+        :return: True if there is a subscriber
+        """
+        return bool(self._subscribers)
+
+    def publish(self, source, operation, args):
+        """
+        Creates the event for a change and sends it to the subscribed callbacks.
+
+        :param source: the object that changed
+        :param operation: name of the change
+        :param args: tuple of the values involved in the change
+        :return: none
+        """
+        subscribers = self._subscribers
+        if not subscribers:
+            return
+        event = EVENT_TYPES.get(operation, ChangeEvent)(source, operation, args)
+        for callback, event_type in subscribers:
+            if isinstance(event, event_type):
+                callback(event)
+
+
+# the bus every model object and LeagueDatabase publishes its changes to
+model_events = EventBus()
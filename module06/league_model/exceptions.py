@@ -26,4 +26,18 @@ class DuplicateEmail(Exception):
 
     def __init__(self, email):
         super().__init__("Error: duplicate email found")
-        self.email = email
\ No newline at end of file
+        self.email = email
+
+
+class BatchError(Exception):
+    """
+    This exception class is raised when a batch of objects is added to or
+    removed from the league system at once (such as with League.add_teams())
+    and some of them cannot be. Nothing in the batch is changed. The
+    errors list has an (object, exception) pair for each object that
+    could not be added or removed.
+    """
+
+    def __init__(self, errors):
+        super().__init__(f"Error: {len(errors)} objects in the batch could not be changed")
+        self.errors = errors
@@ -0,0 +1,65 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import os
+import shutil
+
+
+def replace_file(file_name, data, backup_file=None):
+    """
+    Writes data to a file so that a crash at any point leaves either the old
+    or the new contents in place, never a partly written file.
+
+    The data is written to <file_name>.tmp and forced to disk with fsync, and
+    the temporary file is then renamed over the target, which the operating
+    system does in one step. If a backup file is provided, the old contents
+    are linked (or copied, where links are not supported) to it first, so the
+    target is never missing.
+
+    :param file_name: the file to write
+    :param data: the bytes to write
+    :param backup_file: file to keep the previous contents in, or None
+    :return: none
+    """
+    temp_file = file_name + ".tmp"
+    with open(temp_file, mode="wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+    if backup_file is not None and os.path.exists(file_name):
+        temp_backup = backup_file + ".tmp"
+        if os.path.exists(temp_backup):
+            os.remove(temp_backup)
+        try:
+            os.link(file_name, temp_backup)
+        except OSError:
+            shutil.copy2(file_name, temp_backup)
+        os.replace(temp_backup, backup_file)
+
+    os.replace(temp_file, file_name)
+    sync_folder(os.path.dirname(os.path.abspath(file_name)))
+
+
+def sync_folder(folder):
+    """
+    Forces the folder entry changes (such as a rename) onto the disk. This is
+    only possible on systems that can open folders, so elsewhere it does nothing.
+
+    :param folder: the folder to sync
+    :return: none
+    """
+    try:
+        descriptor = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
@@ -8,17 +8,34 @@
 # abstract class
 from abc import ABC, abstractmethod
 
+from module06.league_model.events import model_events
+
 class IdentifiedObject(ABC):
     """
     Abtract super class for the League objects:
     League, Team, Team Member, Competition
+
+    The classes use __slots__ instead of a __dict__ per object, which cuts
+    the memory used by each object by more than half when millions of team
+    members are loaded. __getstate__() and __setstate__() turn the slots into
+    a dictionary for pickle and copy, so files pickled before the classes
+    used __slots__ can still be read.
     """
+
+    __slots__ = ("_oid", "_owners")
+
     def __init__(self, oid):
         """
         Constructor
+
+        _owners holds the objects (teams, leagues or the database) that keep
+        this object in a name or email index. It is left out of pickles and
+        copies, and the owners add themselves back when they are restored.
+
         :param oid: id of the subclass object
         """
         self._oid = oid
+        self._owners = ()
 
     @property
     def oid(self):
@@ -29,6 +46,79 @@ class IdentifiedObject(ABC):
         """
         return self._oid
 
+    def _notify(self, operation, *args):
+        """
+        Publishes a change of this object on model_events (see events.py).
+        Nothing is created if nobody is subscribed.
+
+        :param operation: name of the change, such as "add_team" or "rename"
+        :param args: the objects or values involved in the change
+        :return: none
+        """
+        if model_events._subscribers:
+            model_events.publish(self, operation, args)
+
+    def _add_owner(self, owner):
+        """
+        Records that an object keeps this object in its indexes.
+
+        :param owner: the team, league or database holding this object
+        :return: none
+        """
+        self._owners = self._owners + (owner,)
+
+    def _remove_owner(self, owner):
+        """
+        Records that an object no longer keeps this object in its indexes.
+
+        :param owner: the team, league or database that held this object
+        :return: none
+        """
+        self._owners = tuple(other for other in self._owners if other is not owner)
+
+    def _reindex(self, attribute, old_value, new_value):
+        """
+        Tells the owners that an indexed attribute (such as the name) changed.
+
+        :param attribute: name of the attribute, "name" or "email"
+        :param old_value: the value before the change
+        :param new_value: the value after the change
+        :return: none
+        """
+        for owner in self._owners:
+            owner._index_changed(self, attribute, old_value, new_value)
+
+    def __getstate__(self):
+        """
+        Returns the state used by pickle and copy: a dictionary of every slot
+        that is set, except the owners.
+
+        :return: dictionary of the object fields
+        """
+        state = {}
+        for name in _slot_names(type(self)):
+            if name != "_owners":
+                try:
+                    state[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state saved by __getstate__(), or the __dict__ pickled
+        before the classes used __slots__. Fields that are no longer used are
+        skipped.
+
+        :param state: dictionary of the object fields
+        :return: none
+        """
+        self._owners = ()
+        names = _slot_names(type(self))
+        for name, value in state.items():
+            if name in names:
+                object.__setattr__(self, name, value)
+
     def __eq__(self, other):
         """
         Equality method where equality is based on oid
@@ -48,3 +138,24 @@ class IdentifiedObject(ABC):
         :return: hash code
         """
         return hash(self.oid)
+
+
+# class -> set of the slot names of the class and its super classes
+_slots_by_class = {}
+
+
+def _slot_names(cls):
+    """
+    Returns the names of every slot of a class, including the slots of its
+    super classes.
+
+    :param cls: the class
+    :return: set of slot names
+    """
+    names = _slots_by_class.get(cls)
+    if names is None:
+        names = set()
+        for klass in cls.__mro__:
+            names.update(klass.__dict__.get("__slots__", ()))
+        _slots_by_class[cls] = names
+    return names
@@ -0,0 +1,198 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from module06.league_model.name_index import NameIndex
+from module06.league_model.team import _email_key
+
+
+class IdentityMap:
+    """
+    This class lets LeagueDatabase find any object by oid, and every team
+    membership of an email, without going through every league.
+
+    Leagues, teams and competitions are kept in a dictionary by oid. Team
+    members are not kept themselves: the teams holding each member oid and
+    each lowercase email are kept in NameIndexes, and the member is then
+    found with the team's own index. This keeps the map small, and works
+    for teams that keep their members in a MemberTable.
+
+    The database keeps the map up to date through the hooks the leagues
+    call on their owners (see LeagueDatabase._team_added() and the methods
+    after it). The contents of leagues stored in SQLite or shard files are
+    added when the league is loaded and dropped when it is unloaded.
+    """
+
+    __slots__ = ("_objects", "_member_teams", "_email_teams")
+
+    def __init__(self, leagues=()):
+        """
+        Constructor for the identity map.
+
+        :param leagues: the leagues to start with
+        """
+        self._objects = {}
+        self._member_teams = NameIndex()
+        self._email_teams = NameIndex()
+        for league in leagues:
+            self.add_league(league)
+
+    def find_by_oid(self, oid):
+        """
+        Returns the league, team, team member or competition with an oid.
+
+        :param oid: the oid
+        :return: the object, or None if there is none
+        """
+        obj = self._objects.get(oid)
+        if obj is None:
+            team = self._member_teams.find(oid)
+            if team is not None:
+                obj = team.member_with_oid(oid)
+        return obj
+
+    def find_by_email(self, email):
+        """
+        Returns every place a member with an email is found. Case is ignored.
+
+        :param email: the email
+        :return: set of (league, team, member) tuples
+        """
+        found = set()
+        for team in self._email_teams.find_all(_email_key(email)):
+            member = team.member_with_email(email)
+            for league in team._owners:
+                found.add((league, team, member))
+        return found
+
+    def add_league(self, league):
+        """
+        Adds a league and, if it is loaded, its contents.
+
+        :param league: the league
+        :return: none
+        """
+        self._objects[league.oid] = league
+        if league._is_loaded():
+            for team in getattr(league, "_teams", ()):
+                self.add_team(team)
+            for competition in getattr(league, "_competitions", ()):
+                self.add_competition(competition)
+
+    def remove_league(self, league):
+        """
+        Removes a league and its contents.
+
+        :param league: the league
+        :return: none
+        """
+        self.clear_league(league)
+        self._discard(league)
+
+    def clear_league(self, league):
+        """
+        Removes the contents of a league but keeps the league, for when it
+        is unloaded or its contents are replaced.
+
+        :param league: the league
+        :return: none
+        """
+        if league._is_loaded():
+            for team in getattr(league, "_teams", ()):
+                self.remove_team(team)
+            for competition in getattr(league, "_competitions", ()):
+                self._discard(competition)
+
+    def add_team(self, team):
+        """
+        Adds a team and its members.
+
+        :param team: the team
+        :return: none
+        """
+        self._objects[team.oid] = team
+        for member_oid, _, email in team.member_values():
+            self.add_member(team, member_oid, email)
+
+    def remove_team(self, team):
+        """
+        Removes a team and its members.
+
+        :param team: the team
+        :return: none
+        """
+        self._discard(team)
+        for member_oid, _, email in team.member_values():
+            self.remove_member(team, member_oid, email)
+
+    def add_member(self, team, member_oid, email):
+        """
+        Records that a team holds a member.
+
+        :param team: the team
+        :param member_oid: oid of the member
+        :param email: email of the member, or None
+        :return: none
+        """
+        self._member_teams.add(member_oid, team)
+        if email is not None:
+            self._email_teams.add(_email_key(email), team)
+
+    def remove_member(self, team, member_oid, email):
+        """
+        Records that a team no longer holds a member.
+
+        :param team: the team
+        :param member_oid: oid of the member
+        :param email: email of the member, or None
+        :return: none
+        """
+        self._member_teams.remove(member_oid, team)
+        if email is not None:
+            self._email_teams.remove(_email_key(email), team)
+
+    def email_changed(self, team, old_email, new_email):
+        """
+        Moves a team to a new email after one of its members changed email.
+
+        :param team: the team
+        :param old_email: the email before the change, or None
+        :param new_email: the email after the change, or None
+        :return: none
+        """
+        if old_email is not None:
+            self._email_teams.remove(_email_key(old_email), team)
+        if new_email is not None:
+            self._email_teams.add(_email_key(new_email), team)
+
+    def add_competition(self, competition):
+        """
+        Adds a competition.
+
+        :param competition: the competition
+        :return: none
+        """
+        self._objects[competition.oid] = competition
+
+    def remove_competition(self, competition):
+        """
+        Removes a competition.
+
+        :param competition: the competition
+        :return: none
+        """
+        self._discard(competition)
+
+    def _discard(self, obj):
+        """
+        Removes an object from the oid dictionary, unless another object
+        with the same oid (such as an edited copy) has taken its place.
+
+        :param obj: the league, team or competition
+        :return: none
+        """
+        if self._objects.get(obj.oid) is obj:
+            del self._objects[obj.oid]
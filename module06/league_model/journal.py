@@ -0,0 +1,512 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import os
+import pickle
+import threading
+
+from module06.league_model.competition import Competition
+from module06.league_model.events import FieldChanged, model_events
+from module06.league_model.identified_object import IdentifiedObject
+from module06.league_model.league import League
+from module06.league_model.team import Team
+from module06.league_model.team_member import TeamMember
+
+
+class MutationJournal:
+    """
+    This class keeps an append-only journal of the changes made to a
+    LeagueDatabase between saves, so the changes survive a crash.
+
+    The database file written by LeagueDatabase.save() is the snapshot.
+    Every change to the database (adding or removing leagues, teams, members
+    and competitions, renames, email changes, competition location and time
+    changes and restoring a backup) is published on model_events and
+    appended to <snapshot>.journal as one numbered pickle record, together with
+    the last oid handed out by the database. LeagueDatabase.load() reads the
+    snapshot and then replays the records that are newer than it.
+
+    A record only holds oids and field values, never the model objects, so
+    appending one costs the same no matter how big the database is. A league
+    or team that is added with teams, members or competitions already in it
+    is written as one record per object, between a "begin" and an "end"
+    record, and replay() skips a group that was cut short by a crash. With
+    fsync_every=N the journal is forced to disk every N changes (group
+    commit); with fsync_every=None it is only flushed to the operating
+    system, which survives the program crashing but not the computer.
+
+    Once the journal grows past compact_threshold bytes it is due to be
+    folded into a new snapshot. The snapshot is encoded on the calling
+    thread, so this is not done by the change that crossed the threshold but
+    by compact_if_due(), which the program calls when it is idle (see
+    LeagueDatabase.compact_journal()). The journal is moved aside to
+    <snapshot>.journal.old, and the save thread writes the snapshot and then
+    deletes the old journal. A crash at any point leaves the snapshot plus
+    one or both journals, and the record numbers tell load() which records
+    are already in the snapshot.
+
+    Only changes to objects that belong to the database are recorded, which
+    is worked out from the owners of the object that changed, so the objects
+    of an edit session or of another database are ignored.
+    """
+
+    def __init__(self, database, snapshot_file, fsync_every=1, compact_threshold=4 * 1024 * 1024):
+        """
+        Constructor for the journal. attach() must be called to start recording.
+
+        :param database: the LeagueDatabase being journaled
+        :param snapshot_file: the pickle database file the journal belongs to
+        :param fsync_every: number of changes per fsync, or None to never fsync
+        :param compact_threshold: journal size in bytes that makes compaction due
+        """
+        self._database = database
+        self._snapshot_file = snapshot_file
+        self._journal_file = snapshot_file + ".journal"
+        self._fsync_every = fsync_every
+        self._compact_threshold = compact_threshold
+        self._sequence = database._journal_seq
+        self._unsynced = 0
+        self._file = None
+        # sequence number of the last record moved to the .old journal
+        self._old_sequence = 0
+        # the .old journal is renamed on this thread and deleted on the save thread
+        self._lock = threading.Lock()
+        # True once the journal has passed compact_threshold
+        self._compact_due = False
+
+    @property
+    def snapshot_file(self):
+        """
+        Getter method for the snapshot file the journal belongs to.
+
+        :return: the snapshot file name
+        """
+        return self._snapshot_file
+
+    @property
+    def sequence(self):
+        """
+        Getter method for the number of the last record written.
+
+        :return: the last record number
+        """
+        return self._sequence
+
+    @property
+    def compact_due(self):
+        """
+        Getter method for whether the journal has grown past compact_threshold.
+
+        :return: True if compaction is due
+        """
+        return self._compact_due
+
+    def handles(self, file_name):
+        """
+        Checks if this journal belongs to the provided snapshot file.
+
+        :param file_name: name of a database file
+        :return: True if the file is the snapshot of this journal
+        """
+        return os.path.abspath(file_name) == os.path.abspath(self._snapshot_file)
+
+    def attach(self):
+        """
+        Starts recording changes. If a journal from an earlier session is
+        still on disk (it was replayed by load()), it is folded into the
+        snapshot first so new records are never written after a torn record.
+
+        :return: none
+        """
+        if os.path.exists(self._journal_file) or os.path.exists(self._journal_file + ".old"):
+            self.compact(background=False)
+        self._file = open(self._journal_file, mode="ab")
+        model_events.subscribe(self.on_change)
+
+    def detach(self, discard=False):
+        """
+        Stops recording changes and closes the journal file.
+
+        :param discard: True to delete the journal, dropping the unsaved changes
+        :return: none
+        """
+        model_events.unsubscribe(self.on_change)
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+        if discard and os.path.exists(self._journal_file):
+            os.remove(self._journal_file)
+
+    def on_change(self, event):
+        """
+        Turns a change event published by a model object or the database
+        into journal records. Changes to objects that are not part of the
+        database (such as the objects of an edit session) are ignored.
+
+        :param event: the ChangeEvent
+        :return: none
+        """
+        obj, operation, args = event.source, event.operation, event.args
+        if obj is self._database:
+            if operation == "add_league":
+                self._write("begin")
+                self._write_league(args[0])
+                self._append("end")
+            elif operation == "remove_league":
+                self._append(operation, args[0].oid)
+            elif operation == "replace_league":
+                self._write("begin")
+                self._write(operation, args[0].oid, args[1].oid, args[1].name)
+                self._write_league_contents(args[1])
+                self._append("end")
+            elif operation == "restore":
+                # every league is removed, and the restored leagues are added one object at a time
+                self._write("begin")
+                self._write(operation)
+                for league in args[0]:
+                    self._write_league(league)
+                self._append("end")
+            return
+
+        if not isinstance(obj, IdentifiedObject) or not self._in_database(obj):
+            return
+        if operation in FieldChanged.FIELDS:
+            self._append(operation, obj.oid, args[0])
+        elif operation == "add_team":
+            # the position is recorded too, for teams put back by undoing a removal
+            self._write("begin")
+            self._write_team(obj.oid, args[0], args[1])
+            self._append("end")
+        elif operation == "replace_team":
+            self._write("begin")
+            self._write(operation, obj.oid, args[0].oid, args[1].oid, args[1].name)
+            self._write_members(args[1])
+            self._append("end")
+        elif operation == "add_member":
+            member = args[0]
+            self._append(operation, obj.oid, member.oid, member.name, member.email, args[1])
+        elif operation in ("remove_team", "remove_member", "remove_competition"):
+            self._append(operation, obj.oid, args[0].oid)
+        elif operation == "add_competition":
+            self._write("begin")
+            self._write_competition(obj.oid, args[0], args[1])
+            self._append("end")
+
+    def sync(self):
+        """
+        Forces all the records written so far onto the disk.
+
+        :return: none
+        """
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+
+    def compact(self, background=True):
+        """
+        Folds the journal into a new snapshot by saving the database to the
+        snapshot file on the save thread. The snapshot is not added to the
+        backup generations, which are kept for the user's own saves.
+
+        :param background: False to wait for the snapshot to be written
+        :return: none
+        """
+        self._compact_due = False
+        future = self._database.save_in_background(self._snapshot_file, backup=False)
+        if not background:
+            future.result()
+
+    def compact_if_due(self):
+        """
+        Compacts the journal if it has grown past compact_threshold. Nothing
+        is done while a transaction is open on one of the leagues, so a batch
+        of changes is never split by a snapshot.
+
+        :return: True if a compaction was started
+        """
+        if not self._compact_due:
+            return False
+        if any(getattr(league, "_recorder", None) is not None for league in self._database.leagues):
+            return False
+        self.compact()
+        return True
+
+    def rotate(self):
+        """
+        Called by LeagueDatabase.save_in_background() when the database is
+        encoded for the snapshot file. The records so far are moved to the
+        .old journal, which is deleted once the snapshot is written. If an
+        earlier snapshot has not been written yet, the records are added to
+        the end of the .old journal instead of replacing it.
+
+        :return: none
+        """
+        self.sync()
+        old_file = self._journal_file + ".old"
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            if os.path.exists(self._journal_file):
+                if os.path.exists(old_file):
+                    with open(self._journal_file, mode="rb") as source, open(old_file, mode="ab") as target:
+                        target.write(source.read())
+                        target.flush()
+                        os.fsync(target.fileno())
+                    os.remove(self._journal_file)
+                else:
+                    os.replace(self._journal_file, old_file)
+            self._old_sequence = self._sequence
+            self._compact_due = False
+            if self._file is not None:
+                self._file = open(self._journal_file, mode="ab")
+
+    def snapshot_written(self, sequence):
+        """
+        Called on the save thread once a snapshot has been written. The .old
+        journal is deleted if every record in it is part of the snapshot.
+
+        :param sequence: number of the last journal record in the snapshot
+        :return: none
+        """
+        old_file = self._journal_file + ".old"
+        with self._lock:
+            if sequence >= self._old_sequence and os.path.exists(old_file):
+                os.remove(old_file)
+
+    def _write(self, operation, *args):
+        """
+        Writes one record to the journal file, without flushing it.
+
+        :param operation: name of the change
+        :param args: oids and values needed to replay the change
+        :return: none
+        """
+        self._sequence += 1
+        pickle.dump((self._sequence, self._database.last_oid, operation, args), self._file)
+
+    def _append(self, operation, *args):
+        """
+        Writes the last record of a change and flushes the journal, forcing
+        it to disk every fsync_every changes.
+
+        :param operation: name of the change
+        :param args: oids and values needed to replay the change
+        :return: none
+        """
+        self._write(operation, *args)
+        self._file.flush()
+        self._unsynced += 1
+        if self._fsync_every is not None and self._unsynced >= self._fsync_every:
+            self.sync()
+        if self._file.tell() >= self._compact_threshold:
+            self._compact_due = True
+
+    def _write_league(self, league):
+        """
+        Writes the records that add a league and everything in it.
+
+        :param league: the league
+        :return: none
+        """
+        self._write("add_league", league.oid, league.name)
+        self._write_league_contents(league)
+
+    def _write_league_contents(self, league):
+        """
+        Writes the records that add the teams and competitions already in a league.
+
+        :param league: the league
+        :return: none
+        """
+        for team in league.teams:
+            self._write_team(league.oid, team, None)
+        for competition in league.competitions:
+            self._write_competition(league.oid, competition, None)
+
+    def _write_team(self, league_oid, team, index):
+        """
+        Writes the records that add a team and its members to a league.
+
+        :param league_oid: oid of the league
+        :param team: the team
+        :param index: position of the team, or None for the end
+        :return: none
+        """
+        self._write("add_team", league_oid, team.oid, team.name, index)
+        self._write_members(team)
+
+    def _write_members(self, team):
+        """
+        Writes a record for each member already on a team.
+
+        :param team: the team
+        :return: none
+        """
+        for oid, name, email in team.member_values():
+            self._write("add_member", team.oid, oid, name, email, None)
+
+    def _write_competition(self, league_oid, competition, index):
+        """
+        Writes the records that add a competition to a league. A result is
+        replayed as a change of the competition after it is added.
+
+        :param league_oid: oid of the league
+        :param competition: the competition
+        :param index: position of the competition, or None for the end
+        :return: none
+        """
+        self._write("add_competition", league_oid, competition.oid,
+                    [team.oid for team in competition.teams_competing],
+                    competition.location, competition.date_time, index)
+        if competition.result is not None:
+            self._write("set_result", competition.oid, competition.result)
+
+    def _in_database(self, obj):
+        """
+        Checks if an object belongs to the database. Leagues have the
+        database as an owner, teams and competitions their league, and
+        members their teams (including the teams of a ColumnarTeam, whose
+        member objects are made on each access).
+
+        :param obj: the object that changed
+        :return: True if the object is in the database
+        """
+        database = self._database
+        for owner in obj._owners:
+            if owner is database:
+                return True
+            for league in getattr(owner, "_owners", ()):
+                if league is database or any(other is database for other in getattr(league, "_owners", ())):
+                    return True
+        return False
+
+
+def replay(database, snapshot_file):
+    """
+    Applies the journal records newer than the snapshot to a database that
+    was just loaded from the snapshot file. Reading stops at the first record
+    that was only partly written when the program stopped, and the records
+    of a group are only applied once its "end" record has been read.
+
+    :param database: the LeagueDatabase loaded from the snapshot
+    :param snapshot_file: the snapshot file name
+    :return: number of records applied
+    """
+    journal_file = snapshot_file + ".journal"
+    objects = {}
+    for league in database.leagues:
+        _index(objects, league)
+
+    applied = 0
+    for file_name in (journal_file + ".old", journal_file):
+        if not os.path.exists(file_name):
+            continue
+        # records read since a "begin" record, applied when its "end" record is read
+        group = None
+        with open(file_name, mode="rb") as file:
+            while True:
+                try:
+                    sequence, last_oid, operation, args = pickle.load(file)
+                except Exception:
+                    # end of the file, or a record cut short by a crash
+                    break
+                if sequence <= database._journal_seq:
+                    continue
+                if operation == "begin":
+                    group = []
+                    continue
+                if group is not None and operation != "end":
+                    group.append((operation, args))
+                    continue
+                records = group if group is not None else [(operation, args)]
+                group = None
+                for record_operation, record_args in records:
+                    _apply(database, objects, record_operation, record_args)
+                database._journal_seq = sequence
+                database.last_oid = max(database.last_oid, last_oid)
+                applied += len(records)
+    return applied
+
+
+def _index(objects, obj):
+    """
+    Adds an object and everything it contains to an oid map used by replay().
+
+    :param objects: the oid map
+    :param obj: a league, team, team member or competition
+    :return: none
+    """
+    objects[obj.oid] = obj
+    for team in getattr(obj, "teams", ()):
+        _index(objects, team)
+    for competition in getattr(obj, "competitions", ()):
+        objects[competition.oid] = competition
+    for member in getattr(obj, "members", ()):
+        objects.setdefault(member.oid, member)
+
+
+def _apply(database, objects, operation, args):
+    """
+    Applies one journal record to the database. Records that refer to
+    objects that no longer exist are skipped.
+
+    :param database: the database being rebuilt
+    :param objects: oid map of the objects in the database
+    :param operation: name of the change
+    :param args: values recorded for the change
+    :return: none
+    """
+    if operation == "add_league":
+        league = objects[args[0]] = League(args[0], args[1])
+        database.add_league(league)
+    elif operation == "remove_league":
+        league = objects.pop(args[0], None)
+        if league in database.leagues:
+            database.remove_league(league)
+    elif operation == "replace_league":
+        old_league = objects.get(args[0])
+        league = objects[args[1]] = League(args[1], args[2])
+        # equality is based on oid, so this finds the league being replaced
+        if old_league in database.leagues:
+            database.replace_league(old_league, league)
+    elif operation == "restore":
+        database._restore_leagues([])
+        objects.clear()
+    elif operation in FieldChanged.FIELDS:
+        obj = objects.get(args[0])
+        if obj is not None:
+            setattr(obj, FieldChanged.FIELDS[operation], args[1])
+    else:
+        owner = objects.get(args[0])
+        if owner is None:
+            return
+        if operation == "add_team":
+            team = objects[args[1]] = Team(args[1], args[2])
+            owner._insert_team(args[3], team)
+        elif operation == "replace_team" and args[1] in objects:
+            team = objects[args[2]] = Team(args[2], args[3])
+            owner.replace_team(objects[args[1]], team)
+        elif operation == "remove_team" and args[1] in objects:
+            owner.remove_team(objects[args[1]])
+        elif operation == "add_member":
+            oid, name, email, index = args[1:]
+            member = objects.get(oid)
+            # a member on several teams is the same object on each of them
+            if not isinstance(member, TeamMember) or member.name != name or member.email != email:
+                member = objects[oid] = TeamMember(oid, name, email)
+            owner._insert_member(index, member)
+        elif operation == "remove_member" and args[1] in objects:
+            owner.remove_member(objects[args[1]])
+        elif operation == "add_competition":
+            oid, team_oids, location, date_time, index = args[1:]
+            competition = Competition(oid, [objects[team_oid] for team_oid in team_oids], location, date_time)
+            owner._insert_competition(index, competition)
+            objects[oid] = competition
+        elif operation == "remove_competition" and args[1] in objects:
+            owner._remove_competition(objects.pop(args[1]))
@@ -5,14 +5,23 @@
 # Author: Alan Cruce
 # Date: April 28, 2025
 
-from module06.league_model.exceptions import DuplicateOid
+from module06.league_model.calendar_index import CompetitionCalendar
+from module06.league_model.exceptions import BatchError, DuplicateOid
 from module06.league_model.identified_object import IdentifiedObject
+from module06.league_model.name_index import NameIndex
+from module06.league_model.standings import Standings
+from module06.league_model.transaction import History, Transaction
 
 
 class League(IdentifiedObject):
     """
     This is the class for the League object.
     """
+
+    __slots__ = ("_name", "_teams", "_competitions", "_teams_oids", "_teams_by_name", "_teams_by_member",
+                 "_competitions_oids", "_competitions_by_team", "_last_oid", "_loader", "_recorder",
+                 "_history", "_calendar", "_standings")
+
     def __init__(self, oid, name):
         """
         This is the contructor for the League object.
@@ -21,6 +30,11 @@ class League(IdentifiedObject):
         a competitions_oids set to help check to ensure teams and competitions
         with duplicate oids cannot be added.
 
+        The teams are also indexed by name for team_named(), by the oids of
+        their members for teams_for_member(), and the competitions by the oids
+        of their teams for competitions_for_team(). The indexes are kept up to
+        date when a team is renamed or its members change.
+
         :param oid: unique ID for the league
         :param name: name of the league
         """
@@ -29,8 +43,19 @@ class League(IdentifiedObject):
         self._teams = []
         self._competitions = []
         self._teams_oids = set()
+        self._teams_by_name = NameIndex()
+        self._teams_by_member = NameIndex()
         self._competitions_oids = set()
+        self._competitions_by_team = NameIndex()
         self._last_oid = 0
+        # storage backend that loads the teams and competitions when first used, see _stub()
+        self._loader = None
+        # the open Transaction, and the undo and redo History, see transaction()
+        self._recorder = None
+        self._history = None
+        # the CompetitionCalendar and the Standings, built the first time they are used
+        self._calendar = None
+        self._standings = None
 
     @property
     def name(self):
@@ -49,7 +74,10 @@ class League(IdentifiedObject):
         :param value: name to set for the league name
         :return: none
         """
+        old_name = self._name
         self._name = value
+        self._reindex("name", old_name, value)
+        self._notify("rename", value, old_name)
 
     @property
     def teams(self):
@@ -81,9 +109,32 @@ class League(IdentifiedObject):
         """
         if team.oid in self._teams_oids:
             raise DuplicateOid(team.oid)
-        if team not in self._teams:
-            self._teams.append(team)
-            self._teams_oids.add(team.oid)
+        # equality is based on oid, so the oid check above already keeps
+        # the same team from being added twice
+        self._insert_team(len(self._teams), team)
+
+    def add_teams(self, teams):
+        """
+        Method for adding several teams to the league. The oids of the whole
+        batch are checked first, against the league and against each other,
+        and either every team is added or none is and a BatchError with a
+        DuplicateOid for each problem is raised.
+
+        :param teams: the teams to add, in order
+        :return: none
+        """
+        teams = list(teams)
+        errors = []
+        batch_oids = set()
+        for team in teams:
+            if team.oid in self._teams_oids or team.oid in batch_oids:
+                errors.append((team, DuplicateOid(team.oid)))
+            else:
+                batch_oids.add(team.oid)
+        if errors:
+            raise BatchError(errors)
+        for team in teams:
+            self._insert_team(len(self._teams), team)
 
     def remove_team(self, team):
         """
@@ -98,15 +149,71 @@ class League(IdentifiedObject):
         :param team: the team object to remove
         :return: none
         """
-        # check competition list to ensure the team being removed is not involved
+        # check competition index to ensure the team being removed is not involved
         # in any competition
-        for competition in self._competitions:
-            if team in competition.teams_competing:
-                raise ValueError("Team cannot be deleted as it is involved in a competition")
+        if team.oid in self._competitions_by_team:
+            raise ValueError("Team cannot be deleted as it is involved in a competition")
 
-        if team in self._teams:
-            self._teams.remove(team)
-            self._teams_oids.remove(team.oid)
+        if team.oid in self._teams_oids:
+            index = self._teams.index(team)
+            team = self._teams.pop(index)
+            self._unindex_team(team)
+            self._notify("remove_team", team, index)
+
+    def remove_teams(self, teams):
+        """
+        Method for removing several teams from the league. Every team is
+        checked against the competition index first, and if any of them is
+        in a competition none are removed and a BatchError is raised with a
+        ValueError for each of those teams. Teams not in the league are
+        skipped, as remove_team() does.
+
+        The team list is rebuilt once, instead of finding and removing each
+        team in it, so removing many teams takes one pass over the list.
+
+        :param teams: the teams to remove
+        :return: none
+        """
+        teams = list(teams)
+        errors = [(team, ValueError("Team cannot be deleted as it is involved in a competition"))
+                  for team in teams if team.oid in self._competitions_by_team]
+        if errors:
+            raise BatchError(errors)
+
+        removing = {team.oid for team in teams if team.oid in self._teams_oids}
+        if not removing:
+            return
+        kept = []
+        removed = []
+        for index, team in enumerate(self._teams):
+            if team.oid in removing:
+                removed.append((index, team))
+            else:
+                kept.append(team)
+        self._teams[:] = kept
+        # the last team is reported first, so each position is the one the
+        # team had when the teams before it were still in the list
+        for index, team in reversed(removed):
+            self._unindex_team(team)
+            self._notify("remove_team", team, index)
+
+    def replace_team(self, old_team, new_team):
+        """
+        Method for putting an edited copy of a team in place of the original,
+        as done when the edit team dialog is saved.
+
+        :param old_team: the team object currently in the league
+        :param new_team: the team object to put in its place
+        :return: none
+        """
+        if new_team.oid != old_team.oid and new_team.oid in self._teams_oids:
+            raise DuplicateOid(new_team.oid)
+        index = self._teams.index(old_team)
+        old_team = self._teams[index]
+        self._teams[index] = new_team
+        self._unindex_team(old_team)
+        self._index_team(new_team)
+        self._notify("replace_team", old_team, new_team)
 
     def team_named(self, team_name):
         """
@@ -115,10 +222,7 @@ class League(IdentifiedObject):
         :param team_name: Team object to return if exists in the team list
         :return: team object
         """
-        for team in self._teams:
-            if team.name == team_name:
-                return team
-        return None
+        return self._teams_by_name.find(team_name)
 
     def add_competition(self, competition):
         """
@@ -137,17 +241,152 @@ class League(IdentifiedObject):
         for team in competition.teams_competing:
             if team.oid not in self._teams_oids:
                 raise ValueError("Team not in league")
-        self._competitions.append(competition)
-        self._competitions_oids.add(competition.oid)
+        self._insert_competition(len(self._competitions), competition)
+
+    def add_competitions(self, competitions):
+        """
+        Add several competitions, such as the ones made by the Scheduler. The
+        whole batch is checked first for duplicate oids and for teams not in
+        the league, and either every competition is added or none is and a
+        BatchError with every problem found is raised.
+
+        :param competitions: the competitions to add, in order
+        :return: none
+        """
+        competitions = list(competitions)
+        errors = []
+        batch_oids = set()
+        for competition in competitions:
+            if competition.oid in self._competitions_oids or competition.oid in batch_oids:
+                errors.append((competition, DuplicateOid(competition.oid)))
+            elif any(team.oid not in self._teams_oids for team in competition.teams_competing):
+                errors.append((competition, ValueError("Team not in league")))
+            else:
+                batch_oids.add(competition.oid)
+        if errors:
+            raise BatchError(errors)
+        for competition in competitions:
+            self._insert_competition(len(self._competitions), competition)
+
+    @property
+    def calendar(self):
+        """
+        Getter method for the calendar of the competitions of the league,
+        which keeps them sorted by date and time (see calendar_index.py). It
+        is built the first time it is used and kept up to date after that.
+
+        :return: the CompetitionCalendar
+        """
+        if self._calendar is None:
+            self._calendar = CompetitionCalendar(self._competitions)
+        return self._calendar
+
+    @property
+    def standings(self):
+        """
+        Getter method for the standings of the league, built from the results
+        of its competitions (see standings.py). They are built the first time
+        they are used and updated as results are recorded after that.
+
+        :return: the Standings
+        """
+        if self._standings is None:
+            self._standings = Standings(self)
+        return self._standings
+
+    def competitions_between(self, start, end):
+        """
+        Returns the competitions from start (included) to end (not included),
+        in date order.
+
+        :param start: the first date and time, or None for no limit
+        :param end: the date and time to stop at, or None for no limit
+        :return: list of competitions
+        """
+        return self.calendar.competitions_between(start, end)
+
+    def next_competitions(self, team, n, after=None):
+        """
+        Returns the next competitions of a team, in date order.
+
+        :param team: the team
+        :param n: the most competitions to return
+        :param after: the date and time to start from, the current time if None
+        :return: list of up to n competitions
+        """
+        return self.calendar.next_competitions(team, n, after)
+
+    def transaction(self):
+        """
+        Starts a transaction on the league (see transaction.py). Every change
+        to the league, its teams and their members is recorded until the
+        transaction is committed, and rollback() undoes them. Used in a with
+        statement, the transaction is committed at the end, or rolled back
+        if an exception is raised:
+
+        with league.transaction():
+            league.remove_team(team)
+            ...
+
+        A transaction started while another one is open is part of it, and
+        its rollback() only undoes its own changes. Committed transactions
+        can be undone with undo().
+
+        :return: the Transaction
+        """
+        return Transaction(self)
+
+    def undo(self):
+        """
+        Undoes the last committed transaction of the league.
+
+        :return: True if a transaction was undone, False if there was none
+        """
+        return self._undo_history().undo()
+
+    def redo(self):
+        """
+        Makes the changes of the last undone transaction again.
+
+        :return: True if a transaction was redone, False if there was none
+        """
+        return self._undo_history().redo()
+
+    def can_undo(self):
+        """
+        Checks if there is a committed transaction to undo.
+
+        :return: True if undo() would undo something
+        """
+        return self._history is not None and self._history.can_undo()
+
+    def can_redo(self):
+        """
+        Checks if there is an undone transaction to redo.
+
+        :return: True if redo() would redo something
+        """
+        return self._history is not None and self._history.can_redo()
+
+    def _undo_history(self):
+        """
+        Returns the undo and redo history of the league, creating it the first time.
+
+        :return: the History
+        """
+        if self._history is None:
+            self._history = History(self)
+        return self._history
 
     def teams_for_member(self, member):
         """
-        Returns a list of teams for the member provided.
+        Returns a list of teams for the member provided, in the order the
+        member joined them.
 
         :param member: Member whose teams will be returned on a ist
         :return: list of teams the member is on
         """
-        return [team for team in self._teams if member in team.members]
+        return self._teams_by_member.find_all(member.oid)
 
     def competitions_for_team(self, team):
         """
@@ -156,7 +395,7 @@ class League(IdentifiedObject):
         :param team: Team of which a list of competitions will be provided
         :return: list of competitions the provided team are involved in
         """
-        return [competition for competition in self._competitions if team in competition.teams_competing]
+        return self._competitions_by_team.find_all(team.oid)
 
     def competitions_for_member(self, member):
         """
@@ -167,6 +406,316 @@ class League(IdentifiedObject):
         """
         return [competition for team in self.teams_for_member(member) for competition in self.competitions_for_team(team)]
 
+    def _insert_team(self, index, team):
+        """
+        Puts a team in the team list at a position, without the checks of
+        add_team(). This is also used to undo the removal of a team.
+
+        :param index: the position in the team list, or None for the end
+        :param team: the team
+        :return: none
+        """
+        if index is None:
+            index = len(self._teams)
+        self._teams.insert(index, team)
+        self._index_team(team)
+        self._notify("add_team", team, index)
+
+    def _insert_competition(self, index, competition):
+        """
+        Puts a competition in the competition list at a position, without the
+        checks of add_competition(). This is also used to undo the removal of
+        a competition.
+
+        :param index: the position in the competition list, or None for the end
+        :param competition: the competition
+        :return: none
+        """
+        if index is None:
+            index = len(self._competitions)
+        self._competitions.insert(index, competition)
+        self._competitions_oids.add(competition.oid)
+        for team in competition.teams_competing:
+            self._competitions_by_team.add(team.oid, competition)
+        competition._add_owner(self)
+        if self._calendar is not None:
+            self._calendar.add(competition)
+        if self._standings is not None and competition.result is not None:
+            self._standings.result_changed(competition, None, competition.result)
+        for owner in self._owners:
+            owner._competition_added(self, competition)
+        self._notify("add_competition", competition, index)
+
+    def _remove_competition(self, competition):
+        """
+        Removes a competition from the league. Competitions are not removed
+        by the program; this is used to undo adding one.
+
+        :param competition: the competition
+        :return: none
+        """
+        if competition.oid not in self._competitions_oids:
+            return
+        index = self._competitions.index(competition)
+        competition = self._competitions.pop(index)
+        self._competitions_oids.discard(competition.oid)
+        for team in competition.teams_competing:
+            self._competitions_by_team.remove(team.oid, competition)
+        competition._remove_owner(self)
+        if self._calendar is not None:
+            self._calendar.remove(competition)
+        if self._standings is not None and competition.result is not None:
+            self._standings.result_changed(competition, competition.result, None)
+        for owner in self._owners:
+            owner._competition_removed(self, competition)
+        self._notify("remove_competition", competition, index)
+
+    def _restore(self, teams, competitions):
+        """
+        Replaces the teams and competitions of the league in one step. This is
+        used by the storage backends when the contents of a league are read back
+        from disk, so the teams and competitions are not re-validated one at a time.
+
+        :param teams: list of teams in the league
+        :param competitions: list of competitions in the league
+        :return: none
+        """
+        if hasattr(self, "_teams"):
+            for owner in self._owners:
+                owner._league_cleared(self)
+            for team in self._teams:
+                team._remove_owner(self)
+            for competition in self._competitions:
+                competition._remove_owner(self)
+        self._teams = list(teams)
+        self._competitions = list(competitions)
+        self._competitions_oids = {competition.oid for competition in self._competitions}
+        self._last_oid = 0
+        self._build_indexes()
+
+    def _build_indexes(self):
+        """
+        Builds the oid set and the indexes of the teams and competitions from
+        the lists, and registers the league as the owner of its teams. The
+        owners of the league are told about every team and competition.
+
+        :return: none
+        """
+        self._teams_oids = set()
+        self._teams_by_name = NameIndex()
+        self._teams_by_member = NameIndex()
+        self._competitions_by_team = NameIndex()
+        for team in self._teams:
+            self._index_team(team)
+        self._calendar = None
+        self._standings = None
+        for competition in self._competitions:
+            for team in competition.teams_competing:
+                self._competitions_by_team.add(team.oid, competition)
+            competition._add_owner(self)
+            for owner in self._owners:
+                owner._competition_added(self, competition)
+
+    def _index_team(self, team):
+        """
+        Adds a team that was just put in the team list to the indexes.
+
+        :param team: the team
+        :return: none
+        """
+        self._teams_oids.add(team.oid)
+        self._teams_by_name.add(team.name, team)
+        for member_oid, _, _ in team.member_values():
+            self._teams_by_member.add(member_oid, team)
+        team._add_owner(self)
+        if self._standings is not None:
+            self._standings.teams_changed()
+        for owner in self._owners:
+            owner._team_added(self, team)
+
+    def _unindex_team(self, team):
+        """
+        Removes a team that was just taken out of the team list from the indexes.
+
+        :param team: the team
+        :return: none
+        """
+        self._teams_oids.discard(team.oid)
+        self._teams_by_name.remove(team.name, team)
+        for member_oid, _, _ in team.member_values():
+            self._teams_by_member.remove(member_oid, team)
+        team._remove_owner(self)
+        if self._standings is not None:
+            self._standings.teams_changed()
+        for owner in self._owners:
+            owner._team_removed(self, team)
+
+    def _member_added(self, team, member):
+        """
+        Called by a team of the league when a member is added to it.
+
+        :param team: the team
+        :param member: the member added
+        :return: none
+        """
+        self._teams_by_member.add(member.oid, team)
+        for owner in self._owners:
+            owner._member_added(team, member)
+
+    def _member_removed(self, team, member):
+        """
+        Called by a team of the league when a member is removed from it.
+
+        :param team: the team
+        :param member: the member removed
+        :return: none
+        """
+        self._teams_by_member.remove(member.oid, team)
+        for owner in self._owners:
+            owner._member_removed(team, member)
+
+    def _member_changed(self, team, member, attribute, old_value, new_value):
+        """
+        Called by a team of the league when the name or email of one of its
+        members changes, and passed on to the owners of the league.
+
+        :param team: the team
+        :param member: the member that changed
+        :param attribute: "name" or "email"
+        :param old_value: the value before the change
+        :param new_value: the value after the change
+        :return: none
+        """
+        for owner in self._owners:
+            owner._member_changed(team, member, attribute, old_value, new_value)
+
+    def _index_changed(self, team, attribute, old_value, new_value):
+        """
+        Called by a team of the league when it is renamed, so the name index
+        can be updated, or by a competition of the league when its date and
+        time change, so it can be moved in the calendar, or when its result
+        changes, so the standings can be updated.
+
+        :param team: the team or competition that changed
+        :param attribute: name of the attribute that changed
+        :param old_value: the value before the change
+        :param new_value: the value after the change
+        :return: none
+        """
+        if attribute == "name":
+            self._teams_by_name.remove(old_value, team)
+            self._teams_by_name.add(new_value, team)
+            if self._standings is not None:
+                self._standings.teams_changed()
+        elif attribute == "date_time" and self._calendar is not None:
+            self._calendar.move(team, old_value, new_value)
+        elif attribute == "result" and self._standings is not None:
+            self._standings.result_changed(team, old_value, new_value)
+
+    @classmethod
+    def _stub(cls, oid, name, loader):
+        """
+        Creates a league with only its oid and name, for the storage backends
+        that load leagues on demand. The teams and competitions are loaded
+        through the loader the first time they are used.
+
+        :param oid: unique ID for the league
+        :param name: name of the league
+        :param loader: the storage backend that can load the league
+        :return: the league
+        """
+        league = cls.__new__(cls)
+        league._oid = oid
+        league._name = name
+        league._owners = ()
+        league._loader = loader
+        league._recorder = None
+        league._history = None
+        league._calendar = None
+        league._standings = None
+        return league
+
+    def _is_loaded(self):
+        """
+        Checks if the teams and competitions of the league are in memory.
+
+        :return: False if the league is still waiting to be loaded by a storage backend
+        """
+        return self._loader is None
+
+    def _unload(self, loader):
+        """
+        Drops the teams and competitions of the league from memory, keeping
+        only its oid, name and owners. They are loaded again through the loader
+        the next time they are used. The undo history is dropped, since it
+        refers to the teams being dropped.
+
+        :param loader: the storage backend that can load the league again
+        :return: none
+        """
+        for owner in self._owners:
+            owner._league_cleared(self)
+        for name in League.__slots__:
+            if name != "_name":
+                try:
+                    delattr(self, name)
+                except AttributeError:
+                    pass
+        self._loader = loader
+        self._recorder = None
+        self._history = None
+        self._calendar = None
+        self._standings = None
+
+    def __getattr__(self, name):
+        """
+        Python only calls this method when an attribute is missing. A league loaded
+        on demand by a storage backend starts out with just its oid and name plus a
+        _loader; the first access to its teams or competitions asks the loader
+        to read the rest of the league from disk.
+
+        :param name: name of the missing attribute
+        :return: the attribute value once the league is loaded
+        """
+        # object.__getattribute__ does not come back here if _loader is not set
+        loader = object.__getattribute__(self, "_loader")
+        if loader is None:
+            raise AttributeError(name)
+        self._loader = None
+        loader.load_league_contents(self)
+        return getattr(self, name)
+
+    def __getstate__(self):
+        """
+        Returns the state used by pickle and copy. A league that has not been
+        loaded yet is loaded first so the copy is complete. The owners and the
+        indexes are left out, since __setstate__() rebuilds them.
+
+        :return: dictionary of the league fields
+        """
+        # touching _teams loads the league if it has not been loaded yet
+        self._teams
+        state = super().__getstate__()
+        for name in ("_loader", "_recorder", "_history", "_calendar", "_standings", "_teams_oids", "_teams_by_name",
+                     "_teams_by_member", "_competitions_by_team"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state used by pickle and copy, and rebuilds the indexes.
+
+        :param state: dictionary of the league fields
+        :return: none
+        """
+        self._loader = None
+        self._recorder = None
+        self._history = None
+        self._calendar = None
+        self._standings = None
+        super().__setstate__(state)
+        self._build_indexes()
+
     def __str__(self):
         """
         Returns a string value of the object.
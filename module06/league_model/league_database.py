@@ -7,12 +7,33 @@
 
 import csv
 import os
-import pickle
-
+import shutil
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from module06.league_model import codec
+from module06.league_model.backup_store import BackupStore
+from module06.league_model.events import model_events
+from module06.league_model.exceptions import DuplicateEmail, DuplicateOid
+from module06.league_model.file_utils import replace_file
+from module06.league_model.identity_map import IdentityMap
+from module06.league_model.journal import MutationJournal, replay
 from module06.league_model.league import League
+from module06.league_model.name_index import NameIndex
+from module06.league_model.oid_allocator import OidAllocator
+from module06.league_model.sharded_storage import ShardedLeagueStorage, is_manifest_file
+from module06.league_model.sqlite_storage import SqliteLeagueStorage, is_sqlite_file
 from module06.league_model.team import Team
 from module06.league_model.team_member import TeamMember
 
+# .db database files are written one at a time on this thread
+_save_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="league-save")
+
+# size of the read buffer used when importing csv files
+IMPORT_BUFFER_SIZE = 1024 * 1024
+# number of oids reserved at a time by import_league_teams()
+IMPORT_OID_BLOCK = 4096
+
 
 class LeagueDatabase:
     """
@@ -38,11 +59,41 @@ class LeagueDatabase:
 
     6.) League 1, with the test data loaded, is then exported into
     league1.csv.
+
+    Databases can also be stored in SQLite files (see sqlite_storage.py) or
+    as a manifest plus one shard file per league (see sharded_storage.py).
+    load() recognizes both by their header and reads only the league names;
+    each league is read when first used. save() writes only what changed
+    when saving to the file the database came from, or to a file name ending
+    in .sqlite or .shards.
+
+    Changes made between saves can be recorded in a journal next to a pickle
+    database file (see journal.py and open_journal()). load() replays the
+    journal on top of the file, so a crash between saves loses nothing.
+
+    Each save of a .db file is also kept as a generation in the
+    <file>.backups folder (see backup_store.py), and restore() brings back
+    any of the last backup_generations saves.
+
+    find_by_oid() and find_by_email() look up objects across every league
+    through an IdentityMap (see identity_map.py), which is kept up to date
+    as the leagues change.
     """
 
     # class variable
     _sole_instance = None
 
+    # storage backend the database was loaded from, None for pickle files
+    _storage = None
+    # journal recording changes between saves, and the number of the last
+    # journal record included in the saved file
+    _journal = None
+    _journal_seq = 0
+    # the file the database was last loaded from or saved to
+    _file_name = None
+    # number of saved versions kept in the <file>.backups folder of .db files
+    backup_generations = 5
+
     @classmethod
     def instance(cls):
         """
@@ -54,24 +105,38 @@ class LeagueDatabase:
         return cls._sole_instance
 
     @classmethod
-    def load(cls, file_name):
+    def load(cls, file_name, columnar=False):
         """
         Class method for loading the database using the
         provided file name. If no file is found, then a new
         database is created using the file name provided.
-        This is done via the pickle module.
+        .db files are read with the codec in codec.py, or with the pickle
+        module for files saved before the codec was added. SQLite databases and
+        shard manifests are read by their storage backend, in which case only
+        the league names are read and each league is loaded when first used.
+        With columnar=True the members of .db files are kept in a MemberTable
+        per league instead of TeamMember objects, for very large leagues.
 
         :param file_name: name of the database file to be loaded
+        :param columnar: True to keep the members in MemberTables
         :return: none
         """
-        try:
-            with open(file_name, mode="rb") as file:
-                cls._sole_instance = pickle.load(file)
-        except FileNotFoundError as e:
-            print(f"Error, database file not found.")
-            print(f"Python error: {e}")
-            print(f"New database created")
-            cls._sole_instance = cls()
+        # the database being replaced gives back its files first
+        if cls._sole_instance is not None:
+            cls._sole_instance.close()
+        storage_class = _storage_class_for(file_name)
+        if storage_class is not None and os.path.exists(file_name):
+            cls._sole_instance = storage_class(file_name).load(cls())
+        else:
+            try:
+                cls._sole_instance = codec.load_file(file_name, cls(), columnar)
+                replay(cls._sole_instance, file_name)
+            except FileNotFoundError as e:
+                print(f"Error, database file not found.")
+                print(f"Python error: {e}")
+                print(f"New database created")
+                cls._sole_instance = cls()
+        cls._sole_instance._file_name = file_name
 
     def __init__(self):
         """
@@ -79,12 +144,43 @@ class LeagueDatabase:
         is first created along with initiating the last_oid at 0.
         """
         self._leagues = []
-        self._last_oid = 0
+        self._leagues_by_name = NameIndex()
+        self._identity = IdentityMap()
+        self._oids = OidAllocator(0)
+
+    def __getstate__(self):
+        """
+        Returns the state used by pickle. The storage backend and the journal
+        hold open files, so they are left out, and the identity map is
+        rebuilt by __setstate__().
+
+        :return: dictionary of the database fields
+        """
+        state = self.__dict__.copy()
+        state.pop("_storage", None)
+        state.pop("_journal", None)
+        state.pop("_identity", None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state used by pickle. Databases pickled before the oid
+        allocator was added stored the last oid as _last_oid. The league name
+        index and the identity map are rebuilt.
+
+        :param state: dictionary of the database fields
+        :return: none
+        """
+        if "_last_oid" in state:
+            state["_oids"] = OidAllocator(state.pop("_last_oid"))
+        self.__dict__.update(state)
+        self._restore_leagues(self._leagues)
 
     @property
     def leagues(self):
         """
-        Getter method for the leagues list.
+        Getter method for the leagues list. The list should only be changed
+        with the methods below, which keep the league name index up to date.
 
         :return: the leagues list
         """
@@ -96,7 +192,7 @@ class LeagueDatabase:
         Getter method for the last_oid field.
         :return: the last_oid
         """
-        return self._last_oid
+        return self._oids.high_water
 
     @last_oid.setter
     def last_oid(self, value):
@@ -109,7 +205,7 @@ class LeagueDatabase:
         :param value: updated value for last_oid
         :return: none
         """
-        self._last_oid = value
+        self._oids.high_water = value
 
     def add_league(self, league):
         """
@@ -119,6 +215,10 @@ class LeagueDatabase:
         :return: none
         """
         self._leagues.append(league)
+        self._leagues_by_name.add(league.name, league)
+        self._identity.add_league(league)
+        league._add_owner(self)
+        self._notify("add_league", league)
 
     def remove_league(self, league):
         """
@@ -127,7 +227,265 @@ class LeagueDatabase:
         :param league: the league object to be removed
         :return: none
         """
-        self._leagues.remove(league)
+        league = self._leagues.pop(self._leagues.index(league))
+        self._leagues_by_name.remove(league.name, league)
+        self._identity.remove_league(league)
+        league._remove_owner(self)
+        self._notify("remove_league", league)
+
+    def replace_league(self, old_league, new_league):
+        """
+        Method for putting an edited copy of a league in place of the
+        original, as done when the edit league dialog is saved.
+
+        :param old_league: the league object currently in the database
+        :param new_league: the league object to put in its place
+        :return: none
+        """
+        index = self._leagues.index(old_league)
+        old_league = self._leagues[index]
+        self._leagues[index] = new_league
+        self._leagues_by_name.remove(old_league.name, old_league)
+        self._leagues_by_name.add(new_league.name, new_league)
+        self._identity.remove_league(old_league)
+        self._identity.add_league(new_league)
+        old_league._remove_owner(self)
+        new_league._add_owner(self)
+        self._notify("replace_league", old_league, new_league)
+
+    def _restore_leagues(self, leagues):
+        """
+        Replaces all the leagues in one step. This is used when a database is
+        read from a file or a backup, and does not tell the journal.
+
+        :param leagues: list of leagues
+        :return: none
+        """
+        for league in self.__dict__.get("_leagues", ()):
+            league._remove_owner(self)
+        self._leagues = list(leagues)
+        self._leagues_by_name = NameIndex((league.name, league) for league in self._leagues)
+        self._identity = IdentityMap(self._leagues)
+        for league in self._leagues:
+            league._add_owner(self)
+
+    def _index_changed(self, league, attribute, old_value, new_value):
+        """
+        Called by a league of the database when it is renamed, so the name
+        index can be updated.
+
+        :param league: the league that changed
+        :param attribute: name of the attribute that changed
+        :param old_value: the value before the change
+        :param new_value: the value after the change
+        :return: none
+        """
+        if attribute == "name":
+            self._leagues_by_name.remove(old_value, league)
+            self._leagues_by_name.add(new_value, league)
+
+    def _team_added(self, league, team):
+        """
+        Called by a league of the database when a team is added to it.
+
+        :param league: the league
+        :param team: the team added
+        :return: none
+        """
+        self._identity.add_team(team)
+
+    def _team_removed(self, league, team):
+        """
+        Called by a league of the database when a team is removed from it.
+
+        :param league: the league
+        :param team: the team removed
+        :return: none
+        """
+        self._identity.remove_team(team)
+
+    def _member_added(self, team, member):
+        """
+        Called by a league of the database when a member is added to one of its teams.
+
+        :param team: the team
+        :param member: the member added
+        :return: none
+        """
+        self._identity.add_member(team, member.oid, member.email)
+
+    def _member_removed(self, team, member):
+        """
+        Called by a league of the database when a member is removed from one of its teams.
+
+        :param team: the team
+        :param member: the member removed
+        :return: none
+        """
+        self._identity.remove_member(team, member.oid, member.email)
+
+    def _member_changed(self, team, member, attribute, old_value, new_value):
+        """
+        Called by a league of the database when a member of one of its teams
+        changes its name or email.
+
+        :param team: the team
+        :param member: the member that changed
+        :param attribute: "name" or "email"
+        :param old_value: the value before the change
+        :param new_value: the value after the change
+        :return: none
+        """
+        if attribute == "email":
+            self._identity.email_changed(team, old_value, new_value)
+
+    def _competition_added(self, league, competition):
+        """
+        Called by a league of the database when a competition is added to it.
+
+        :param league: the league
+        :param competition: the competition added
+        :return: none
+        """
+        self._identity.add_competition(competition)
+
+    def _competition_removed(self, league, competition):
+        """
+        Called by a league of the database when a competition is removed from it.
+
+        :param league: the league
+        :param competition: the competition removed
+        :return: none
+        """
+        self._identity.remove_competition(competition)
+
+    def _league_cleared(self, league):
+        """
+        Called by a league of the database before its teams and competitions
+        are replaced or unloaded.
+
+        :param league: the league
+        :return: none
+        """
+        self._identity.clear_league(league)
+
+    def find_by_oid(self, oid):
+        """
+        Returns the league, team, team member or competition with an oid.
+        Leagues stored in SQLite or shard files are only searched once loaded.
+
+        :param oid: the oid to look for
+        :return: the object, or None if it is not found
+        """
+        return self._identity.find_by_oid(oid)
+
+    def find_by_email(self, email):
+        """
+        Returns every league and team with a member with the provided email.
+        Case is ignored. Leagues stored in SQLite or shard files are only
+        searched once loaded.
+
+        :param email: the email to look for
+        :return: set of (league, team, member) tuples
+        """
+        return self._identity.find_by_email(email)
+
+    def backups(self):
+        """
+        Returns the backup generations kept for the file the database was last
+        loaded from or saved to.
+
+        :return: list of (generation number, time saved) tuples, oldest first
+        """
+        if self._file_name is None:
+            return []
+        return self._backup_store(self._file_name).generations()
+
+    def restore(self, generation):
+        """
+        Replaces the leagues of the database with a backup generation of the
+        file the database was last loaded from or saved to. The restored
+        leagues are only written to the file on the next save.
+
+        :param generation: the generation number, as listed by backups()
+        :return: none
+        """
+        if self._file_name is None:
+            raise ValueError("The database has not been loaded from or saved to a file")
+        self.wait_for_saves()
+        self._backup_store(self._file_name).restore(generation, self)
+        self._notify("restore", self._leagues)
+
+    def _backup_store(self, file_name):
+        """
+        Returns the backup store kept next to a database file.
+
+        :param file_name: name of the database file
+        :return: the BackupStore object
+        """
+        return BackupStore(file_name + ".backups", self.backup_generations)
+
+    def open_journal(self, file_name, fsync_every=1, compact_threshold=4 * 1024 * 1024):
+        """
+        Starts journaling changes next to the provided pickle database file
+        (see MutationJournal for the meaning of the parameters). Databases
+        stored in SQLite or shard files are loaded a league at a time and are
+        not journaled.
+
+        :param file_name: the pickle database file the journal belongs to
+        :param fsync_every: number of journal records per fsync, or None to never fsync
+        :param compact_threshold: journal size in bytes that triggers compaction
+        :return: none
+        """
+        if self._storage is not None or self.is_journaling(file_name):
+            return
+        self.close_journal()
+        self._journal = MutationJournal(self, file_name, fsync_every, compact_threshold)
+        self._journal.attach()
+
+    def close_journal(self, discard=False):
+        """
+        Stops journaling changes.
+
+        :param discard: True to delete the journal, dropping the changes made since the last save
+        :return: none
+        """
+        if self._journal is not None:
+            self._journal.detach(discard)
+            self._journal = None
+
+    def compact_journal(self):
+        """
+        Folds the journal into a new snapshot if it has grown past its
+        compaction threshold. The snapshot is encoded on the calling thread,
+        so changes to the database only mark the journal as due, and this is
+        called when the program is idle, such as from a timer in the main
+        window, instead of by the change that crossed the threshold.
+
+        :return: True if a compaction was started
+        """
+        return self._journal is not None and self._journal.compact_if_due()
+
+    def is_journaling(self, file_name):
+        """
+        Checks if changes are being journaled next to the provided file.
+
+        :param file_name: name of a database file
+        :return: True if the journal belongs to the file
+        """
+        return self._journal is not None and self._journal.handles(file_name)
+
+    def _notify(self, operation, *args):
+        """
+        Publishes a change of the leagues list on model_events (see events.py),
+        where the journal, if there is one, records it.
+
+        :param operation: name of the change
+        :param args: the leagues involved
+        :return: none
+        """
+        if model_events._subscribers:
+            model_events.publish(self, operation, args)
 
     def league_named(self, name):
         """
@@ -137,71 +495,304 @@ class LeagueDatabase:
         :param name: the league name to be searched for
         :return: the league required or None if the league is not found
         """
-        for league in self._leagues:
-            if league.name == name:
-                return league
-        return None
+        return self._leagues_by_name.find(name)
 
     def next_oid(self):
         """
         This method iterates the last_oid field by 1 when adding
-        a new league or team to the database.
+        a new league or team to the database. It is safe to call from
+        several threads.
 
         :return: updated last_oid
         """
-        self._last_oid += 1
-        return self._last_oid
+        return self._oids.next_oid()
+
+    def reserve_oids(self, count):
+        """
+        Reserves a block of oids in a row, for callers that create many
+        objects such as importers and edit dialogs. Oids are taken with
+        next_oid() on the block, and the unused ones are given back with
+        release() (see OidAllocator).
+
+        :param count: number of oids to reserve
+        :return: an OidBlock
+        """
+        return self._oids.reserve(count)
 
-    def save(self, file_name):
+    def save(self, file_name, compression=None):
         """
-        This method saves the database. If a databse file is with the name
-        provided is already found, that database is copied as a backup before the
-        changes are saved. This is done via the pickle module.
+        This method saves the database. This is done via the codec in codec.py,
+        which can also compress the file. The saved version is also added to the
+        backup generations in the <file>.backups folder, so earlier saves can be
+        brought back with restore().
+
+        When the file is the SQLite or shard file the database was loaded from,
+        or the file name ends in .sqlite or .shards, only the changes are
+        written instead.
+
+        The file is written as described in save_in_background(); this method
+        waits until it is done.
 
         :param file_name: Name of the file to save the database to.
+        :param compression: None, "zlib" or "lzma"
         :return: none
         """
-        if os.path.exists(file_name):
-            backup_file = file_name + ".backup"
-            os.replace(file_name, backup_file)
-        with open(file_name, "wb") as file:
-            pickle.dump(self, file)
-            print(f"Database saved to {file_name}")
+        self.save_in_background(file_name, compression=compression).result()
+
+    def save_in_background(self, file_name, callback=None, compression=None, backup=True):
+        """
+        This method saves the database without waiting for the file to be written,
+        so the UI does not freeze while a large database is saved.
+
+        The database is encoded right away, so later changes do not end up in
+        the file. The bytes are then written on the save thread to a temporary
+        file, forced to disk, and renamed over the database file, so the
+        database file is always a complete database, even if the program crashes
+        during the save. The save thread then stores the leagues that changed as
+        a new backup generation. Saves run one after the other in the order they
+        were started.
+
+        SQLite and shard files only write what changed and are saved right away.
+
+        :param file_name: Name of the file to save the database to.
+        :param callback: called with (file_name, error) once the save is done,
+            where error is None if the save worked. It runs on the save thread.
+        :param compression: None, "zlib" or "lzma" (only used for .db files)
+        :param backup: False to not add the save to the backup generations, for the
+            snapshots written when the journal is compacted
+        :return: a Future that is done when the file is written
+        """
+        if self._storage is None or not self._storage.handles(file_name):
+            storage_class = _storage_class_for(file_name)
+            if storage_class is not None:
+                self._release_storage()
+                self._storage = storage_class(file_name)
+
+        if self._storage is not None and self._storage.handles(file_name):
+            future = Future()
+            try:
+                self._storage.save(self)
+                future.set_result(file_name)
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            journal = self._journal if self._journal is not None and self._journal.handles(file_name) else None
+            if journal is not None:
+                self._journal_seq = journal.sequence
+                journal.rotate()
+            blocks = [codec.encode_league(league) for league in self._leagues]
+            data = codec.join(self, blocks, compression)
+            backup_store = self._backup_store(file_name) if backup else None
+            future = _save_worker.submit(_write_database_file, file_name, data, journal, self._journal_seq,
+                                         backup_store, blocks, self.last_oid)
+        self._file_name = file_name
+
+        if callback is not None:
+            future.add_done_callback(lambda done: callback(file_name, done.exception()))
+        return future
+
+    def close(self):
+        """
+        Waits for the saves in progress, stops journaling and closes the
+        storage backend's file. This is done when the database is replaced
+        by another one or the program ends; leagues of a SQLite or shard
+        file that were never used cannot be loaded afterwards.
+
+        :return: none
+        """
+        self.wait_for_saves()
+        self.close_journal()
+        self._release_storage(load_leagues=False)
+
+    def _release_storage(self, load_leagues=True):
+        """
+        Closes the storage backend, for when the database is closed or saved
+        to another file.
+
+        :param load_leagues: True to first load the leagues still waiting on the
+            storage backend, so they can be saved to the other file
+        :return: none
+        """
+        if self._storage is None:
+            return
+        if load_leagues:
+            for league in self._leagues:
+                if not league._is_loaded():
+                    # reading the teams loads the league through the storage backend
+                    league.teams
+        self._storage.close()
+        self._storage = None
+
+    @staticmethod
+    def wait_for_saves():
+        """
+        Waits for the saves started with save_in_background() to finish.
+
+        :return: none
+        """
+        _save_worker.submit(_no_op).result()
 
     def import_league_teams(self, league, file_name):
         """
         This method loads a csv file with team and team member
         data and loads that data into the league specified in the database.
 
+        The file is read one row at a time through a large buffer, so only the
+        model itself grows with the file. Teams are looked up by name and
+        members by name in dictionaries built once at the start, instead of
+        searching the team and member lists for every row. The number of rows
+        and rows per second are printed at the end.
+
+        The import is not recorded as a transaction on the league, since that
+        would keep a change event in the undo history for every row. A row
+        that cannot be added (such as a member whose email is already on the
+        team) stops the import and its error is raised to the caller; the
+        rows before it stay in the league, and the unused oids are given back.
+
         :param league: the league to load the data into
         :param file_name: the csv file with the data to be loaded
-        :return: none
+        :return: number of rows read
         """
+        start = time.perf_counter()
+        rows = 0
+        # team name -> team, and team oid -> (member name -> member)
+        teams = {}
+        for team in league.teams:
+            teams.setdefault(team.name, team)
+        members = {}
+
+        with self.reserve_oids(IMPORT_OID_BLOCK) as oids, \
+                open(file_name, mode='r', encoding="UTF_8", newline="", buffering=IMPORT_BUFFER_SIZE) as csv_file:
+            reader = csv.reader(csv_file)
+            # skip header
+            next(reader)
+
+            for row in reader:
+                if len(row) != 3:
+                    raise ValueError(f"{file_name} line {reader.line_num}: expected 3 values, found {len(row)}")
+                team_name, member_name, member_email = row
+                rows += 1
+
+                # team object
+                team = teams.get(team_name)
+                # add team is not added already
+                if team is None:
+                    team = teams[team_name] = Team(oids.next_oid(), team_name)
+                    league.add_team(team)
+
+                # member object
+                team_members = members.get(team.oid)
+                if team_members is None:
+                    team_members = members[team.oid] = {}
+                    for member in team.members:
+                        team_members.setdefault(member.name, member)
+                # add team member if not added already
+                if member_name not in team_members:
+                    member = TeamMember(oids.next_oid(), member_name, member_email)
+                    team.add_member(member)
+                    team_members[member_name] = member
+
+        elapsed = time.perf_counter() - start
+        print(f"Imported {rows} rows from {file_name} in {elapsed:.2f} s "
+              f"({rows / elapsed if elapsed > 0 else 0:,.0f} rows/s)")
+        return rows
+
+    def import_league_teams_many(self, league, file_names, workers=None):
+        """
+        This method imports several csv files into one league. The files are
+        read and checked in parallel by worker processes, and the results are
+        then added to the league in the order the files are listed, so the
+        oids given to new teams and members do not depend on which file
+        finished first.
+
+        Nothing is added if a file cannot be read, if a new member has the
+        same email as another member of the team (DuplicateEmail), or if an
+        oid to be handed out is already used in the league (DuplicateOid), and
+        the oids reserved for the import are given back. Since everything is
+        checked first, the changes are not recorded as a transaction, so the
+        undo history does not grow with the files.
 
-        try:
-            with open(file_name, mode='r', encoding="UTF_8") as csv_file:
-                reader = csv.reader(csv_file)
-                # skip header
-                next(reader)
-
-                for row in reader:
-                    team_name, member_name, member_email = row
-
-                    # team object
-                    team = league.team_named(team_name)
-                    # add team is not added already
-                    if team is None:
-                        team = Team(self.next_oid(), team_name)
-                        league.add_team(team)
-
-                    # member object
-                    member = team.member_named(member_name)
-                    # add team member if not added already
-                    if member is None:
-                        member = TeamMember(self.next_oid(), member_name, member_email)
-                        team.add_member(member)
-        except Exception as e:
-            print(f"Error {e}")
+        :param league: the league to load the data into
+        :param file_names: list of csv files with the data to be loaded
+        :param workers: number of worker processes, or None for one per processor
+        :return: number of rows read
+        """
+        start = time.perf_counter()
+        file_names = list(file_names)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(file_names))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_read_league_csv, file_names))
+        else:
+            results = [_read_league_csv(file_name) for file_name in file_names]
+
+        # plan the changes first, so a problem in any file leaves the league unchanged
+        teams = {}
+        for team in league.teams:
+            teams.setdefault(team.name, team)
+        member_names = {}
+        member_emails = {}
+        new_teams = []
+        new_members = []
+        rows = 0
+        for file_rows, file_teams in results:
+            rows += file_rows
+            for team_name, members in file_teams:
+                if team_name not in teams:
+                    teams[team_name] = team_name
+                    new_teams.append(team_name)
+                    member_names[team_name] = set()
+                    member_emails[team_name] = set()
+                elif team_name not in member_names:
+                    team = teams[team_name]
+                    member_names[team_name] = {member.name for member in team.members}
+                    member_emails[team_name] = {member.email.lower() for member in team.members
+                                                if member.email is not None}
+                for member_name, member_email in members:
+                    if member_name in member_names[team_name]:
+                        continue
+                    if member_email.lower() in member_emails[team_name]:
+                        raise DuplicateEmail(member_email)
+                    member_names[team_name].add(member_name)
+                    member_emails[team_name].add(member_email.lower())
+                    new_members.append((team_name, member_name, member_email))
+
+        if not new_teams and not new_members:
+            return rows
+        used_oids = {league.oid}
+        for team in league.teams:
+            used_oids.add(team.oid)
+            used_oids.update(member.oid for member in team.members)
+        used_oids.update(competition.oid for competition in league.competitions)
+        with self.reserve_oids(len(new_teams) + len(new_members)) as oids:
+            new_oids = [oids.next_oid() for _ in range(len(new_teams) + len(new_members))]
+            for oid in new_oids:
+                if oid in used_oids:
+                    # nothing was made with the oids, so the whole block is given back
+                    oids.cancel()
+                    raise DuplicateOid(oid)
+
+        new_oids = iter(new_oids)
+        created = []
+        for team_name in new_teams:
+            teams[team_name] = Team(next(new_oids), team_name)
+            created.append(teams[team_name])
+        # everything was checked above, so the changes are made without a transaction
+        # and its undo log, as import_league_teams() does
+        league.add_teams(created)
+        # the members of each team are added in one batch, keeping the oids in file order
+        team_members = {}
+        for team_name, member_name, member_email in new_members:
+            team_members.setdefault(team_name, []).append(TeamMember(next(new_oids), member_name, member_email))
+        for team_name, members in team_members.items():
+            teams[team_name].add_members(members)
+
+        elapsed = time.perf_counter() - start
+        print(f"Imported {rows} rows from {len(file_names)} files in {elapsed:.2f} s "
+              f"({rows / elapsed if elapsed > 0 else 0:,.0f} rows/s)")
+        return rows
 
     def export_league_teams(self, league, file_name):
         """
@@ -219,11 +810,112 @@ class LeagueDatabase:
                 writer.writerow(["Team name", "Member name", "Member email"])
 
                 for team in league.teams:
-                    for member in team.members:
-                        writer.writerow([team.name, member.name, member.email])
+                    for _, member_name, member_email in team.member_values():
+                        writer.writerow([team.name, member_name, member_email])
         except Exception as e:
             print(f"{e}")
 
+def migrate_database_file(file_name, compression=None):
+    """
+    Rewrites a .db file saved by an earlier version of the program as a
+    pickle of the model objects (which had a __dict__ per object before the
+    classes used __slots__) in the format written by the codec. Changes in
+    the file's journal are included. The pickle file is kept as
+    <file>.pickle. Files already in the codec format are left alone.
+
+    LeagueDatabase.load() reads both formats, so this is only needed to get
+    the smaller and faster file without waiting for the next save.
+
+    :param file_name: the .db file to rewrite
+    :param compression: None, "zlib" or "lzma"
+    :return: True if the file was rewritten
+    """
+    with open(file_name, mode="rb") as file:
+        if codec.is_codec_data(file.read(len(codec.MAGIC))):
+            return False
+    database = codec.load_file(file_name, LeagueDatabase())
+    replay(database, file_name)
+    shutil.copy2(file_name, file_name + ".pickle")
+    database.save(file_name, compression)
+    return True
+
+
+def _read_league_csv(file_name):
+    """
+    Reads and checks a team csv file for import_league_teams_many(). This runs
+    in a worker process, so only plain values are returned. Within each team
+    only the first row for a member name is kept, as import_league_teams() does.
+
+    :param file_name: the csv file to read
+    :return: tuple of the number of rows and a list of (team name, [(member name, member email)])
+    """
+    teams = {}
+    names = {}
+    rows = 0
+    with open(file_name, mode='r', encoding="UTF_8", newline="", buffering=IMPORT_BUFFER_SIZE) as csv_file:
+        reader = csv.reader(csv_file)
+        # skip header
+        next(reader, None)
+        for row in reader:
+            if len(row) != 3:
+                raise ValueError(f"{file_name} line {reader.line_num}: expected 3 values, found {len(row)}")
+            team_name, member_name, member_email = row
+            rows += 1
+            if team_name not in teams:
+                teams[team_name] = []
+                names[team_name] = set()
+            if member_name not in names[team_name]:
+                names[team_name].add(member_name)
+                teams[team_name].append((member_name, member_email))
+    return rows, list(teams.items())
+
+
+def _write_database_file(file_name, data, journal, journal_seq, backup_store, blocks, last_oid):
+    """
+    Writes an encoded database to its file and, unless it is a journal
+    compaction, adds it to the backup generations. Runs on the save thread.
+
+    :param file_name: name of the database file
+    :param data: the encoded database
+    :param journal: the journal of the file, or None
+    :param journal_seq: number of the last journal record in the encoded database
+    :param backup_store: the BackupStore of the file, or None to not add a generation
+    :param blocks: the encoded leagues of the database
+    :param last_oid: last oid handed out by the database
+    :return: the file name
+    """
+    replace_file(file_name, data)
+    print(f"Database saved to {file_name}")
+    if journal is not None:
+        journal.snapshot_written(journal_seq)
+    if backup_store is not None:
+        backup_store.add_generation(last_oid, journal_seq, blocks)
+    return file_name
+
+
+def _no_op():
+    """
+    Does nothing. Used to wait for the saves queued before it.
+
+    :return: none
+    """
+
+
+def _storage_class_for(file_name):
+    """
+    Works out which storage backend reads and writes the provided file,
+    from the header of an existing file or else from the file extension.
+
+    :param file_name: name of a database file
+    :return: the storage class, or None for .db files
+    """
+    if is_sqlite_file(file_name) or file_name.lower().endswith(".sqlite"):
+        return SqliteLeagueStorage
+    if is_manifest_file(file_name) or file_name.lower().endswith(".shards"):
+        return ShardedLeagueStorage
+    return None
+
+
 def main():
     """
     This method is testing all of the above methods
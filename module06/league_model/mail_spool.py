@@ -0,0 +1,382 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from module06.league_model.emailer import SENT
+
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    message_id TEXT,
+    subject TEXT,
+    body TEXT,
+    recipients TEXT,
+    created TEXT
+);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    subject TEXT,
+    body TEXT,
+    created TEXT
+);
+CREATE TABLE IF NOT EXISTS deliveries (
+    message_id TEXT,
+    recipient TEXT,
+    status TEXT,
+    attempts INTEGER,
+    next_try REAL,
+    PRIMARY KEY (message_id, recipient)
+);
+CREATE INDEX IF NOT EXISTS deliveries_due ON deliveries (next_try) WHERE status = 'pending';
+"""
+
+# status of a delivery that has not been sent yet
+PENDING = "pending"
+# status send_plain_email() gives each recipient of an email it put in the spool
+QUEUED = "queued"
+# seconds before the first retry of a failed delivery, doubled for each retry after it
+RETRY_DELAY = 30.0
+# most seconds between two retries
+MAX_RETRY_DELAY = 3600.0
+# times a delivery is tried before it is given up
+MAX_TRIES = 8
+# most recipients handed to the emailer at once; a crash while they are sent may send them again
+SEND_CHUNK = 20
+# seconds the worker waits after an error before it carries on
+ERROR_DELAY = 5.0
+# added to the spool file name for the file holding the outbox
+OUTBOX_SUFFIX = ".outbox"
+
+
+class MailSpool:
+    """
+    This class keeps the emails waiting to be sent in a SQLite file, and
+    sends them with an emailer on a background thread. It has the same
+    send_plain_email() method as Emailer, so it can be given to the
+    send_email() methods of teams, members and competitions. Like Emailer,
+    it returns the status of each recipient, which is QUEUED since nothing
+    has been sent yet; queue_email() does the same but returns the message
+    id, to follow the deliveries with status().
+
+    queue_email() writes the email to an outbox as a single row, with
+    the recipients joined into one column, and returns. That is one insert
+    however long the mailing list is, well under a millisecond, and the
+    email is on disk once the call returns. The outbox is kept in its own
+    file (the spool file name plus OUTBOX_SUFFIX), so the callers never
+    wait for the worker's larger writes to the spool file. Both files are
+    in WAL mode with synchronous=NORMAL, so a commit survives the program
+    crashing without waiting for the disk (a power cut can lose the last
+    commits).
+
+    The worker thread turns each outbox row into one delivery per recipient
+    and then deletes the row; if the program stops in between, the row is
+    expanded again and the deliveries already there are skipped. It then
+    sends the deliveries that are due a few at a time, writing down the
+    outcome of each chunk as it goes. An error in the worker is printed and
+    the worker carries on after ERROR_DELAY seconds.
+
+    A delivery that fails is tried again later, waiting twice as long each
+    time, until it has been tried MAX_TRIES times. A recipient the server
+    refuses is not tried again. Since every delivery is kept under the
+    (message id, recipient) pair, the same message is never sent twice to
+    the same recipient, even if it is put in the spool again, and a spool
+    opened on the same file after a crash or restart carries on with the
+    outbox rows and deliveries that were left.
+    """
+
+    def __init__(self, file_name, emailer, retry_delay=RETRY_DELAY, max_retry_delay=MAX_RETRY_DELAY,
+                 max_tries=MAX_TRIES):
+        """
+        Constructor for the spool. The file is made if it does not exist,
+        and the worker starts on the emails left in it.
+
+        :param file_name: the SQLite file holding the spool
+        :param emailer: the object sending the emails, such as an Emailer
+        :param retry_delay: seconds before the first retry of a failed delivery
+        :param max_retry_delay: most seconds between two retries
+        :param max_tries: times a delivery is tried before it is given up
+        """
+        self._file_name = file_name
+        self._emailer = emailer
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._max_tries = max_tries
+        connection = _connect(file_name)
+        connection.executescript(SCHEMA)
+        connection.close()
+        # the callers' connection to the outbox, shared by their threads under the lock
+        self._outbox = _connect(file_name + OUTBOX_SUFFIX, check_same_thread=False)
+        self._outbox.executescript(OUTBOX_SCHEMA)
+        # the write-ahead log is copied back into the outbox by the worker, when it deletes rows,
+        # instead of by whichever caller happens to fill it
+        self._outbox.execute("PRAGMA wal_autocheckpoint=0")
+        self._lock = threading.Lock()
+        # outbox seq of the last email put in the spool, and of the last one the worker expanded
+        self._last_seq = 0
+        self._expanded_seq = 0
+        # deliveries in the file that are not finished, updated by the worker
+        self._pending = None
+        self._condition = threading.Condition()
+        # set to wake the worker up when an email is added or the spool is closed
+        self._wake = threading.Event()
+        self._stopping = False
+        self._worker = threading.Thread(target=self._run, name="MailSpool worker", daemon=True)
+        self._worker.start()
+
+    def send_plain_email(self, recipients, subject, message, message_id=None):
+        """
+        Writes an email to the spool to be sent to each recipient, and
+        returns without waiting for it to be sent (see queue_email()).
+
+        :param recipients: list of email addresses to send to
+        :param subject: subject of the email
+        :param message: message of the email
+        :param message_id: id of the message, to put the same message in the spool again
+            without sending it twice; a new id if None
+        :return: dictionary of the delivery status of each recipient, QUEUED
+        """
+        self.queue_email(recipients, subject, message, message_id)
+        return {recipient: QUEUED for recipient in recipients}
+
+    def queue_email(self, recipients, subject, message, message_id=None):
+        """
+        Writes an email to the spool to be sent to each recipient, and
+        returns its message id without waiting for it to be sent.
+
+        :param recipients: list of email addresses to send to
+        :param subject: subject of the email
+        :param message: message of the email
+        :param message_id: id of the message, to put the same message in the spool again
+            without sending it twice; a new id if None
+        :return: the message id, to look up its deliveries with status()
+        """
+        if message_id is None:
+            message_id = uuid.uuid4().hex
+        with self._lock, self._outbox:
+            seq = self._outbox.execute(
+                "INSERT INTO outbox (message_id, subject, body, recipients, created) VALUES (?, ?, ?, ?, ?)",
+                (message_id, subject, message, "\n".join(recipients), datetime.now().isoformat())).lastrowid
+        with self._condition:
+            self._last_seq = max(self._last_seq, seq)
+        self._wake.set()
+        return message_id
+
+    def status(self, message_id):
+        """
+        Returns the delivery status of each recipient of a message. Emails
+        the worker has not expanded yet are not included.
+
+        :param message_id: the message id
+        :return: dictionary of the status of each recipient: PENDING, SENT or the reason it failed
+        """
+        connection = sqlite3.connect(self._file_name)
+        try:
+            rows = connection.execute("SELECT recipient, status FROM deliveries WHERE message_id = ?",
+                                      (message_id,))
+            return dict(rows)
+        finally:
+            connection.close()
+
+    def wait(self, timeout=None):
+        """
+        Waits until every email put in the spool is finished: sent, refused
+        or given up.
+
+        :param timeout: most seconds to wait, or None to wait as long as it takes
+        :return: True if every email is finished, False if the time ran out or the worker stopped
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._is_done() or not self._worker.is_alive(), timeout)
+            return self._is_done()
+
+    def close(self):
+        """
+        Stops the worker once it is done with the chunk it is sending. The
+        emails left are sent the next time a spool is opened on the file.
+
+        :return: none
+        """
+        self._stopping = True
+        self._wake.set()
+        self._worker.join()
+        with self._lock:
+            self._outbox.close()
+
+    def _is_done(self):
+        """
+        Checks if the worker has finished every email put in the spool.
+        Called with the condition held.
+
+        :return: True if nothing is left to send
+        """
+        return self._expanded_seq >= self._last_seq and self._pending == 0
+
+    def _run(self):
+        """
+        The worker thread: expands the outbox rows into deliveries and sends
+        the deliveries that are due, until close() is called. An error is
+        printed and the worker tries again after a pause.
+
+        :return: none
+        """
+        connection = _connect(self._file_name)
+        outbox = _connect(self._file_name + OUTBOX_SUFFIX)
+        try:
+            while not self._stopping:
+                try:
+                    self._update_pending(connection, self._expand(outbox, connection))
+                    self._send_due(connection)
+                    self._update_pending(connection)
+                    self._wake.wait(self._time_to_next(connection))
+                except Exception as e:
+                    print(f"Mail spool error: {e}")
+                    for open_connection in (connection, outbox):
+                        if open_connection.in_transaction:
+                            open_connection.rollback()
+                    self._wake.wait(ERROR_DELAY)
+                self._wake.clear()
+        finally:
+            connection.close()
+            outbox.close()
+            with self._condition:
+                self._condition.notify_all()
+
+    def _expand(self, outbox, connection):
+        """
+        Turns the outbox rows into one delivery per recipient, skipping the
+        deliveries already in the file, and then deletes the rows.
+
+        :param outbox: the worker's connection to the outbox
+        :param connection: the worker's connection to the spool file
+        :return: seq of the last row expanded, or None if the outbox was empty
+        """
+        rows = outbox.execute("SELECT seq, message_id, subject, body, recipients, created FROM outbox "
+                              "ORDER BY seq").fetchall()
+        if not rows:
+            return None
+        now = time.time()
+        with connection:
+            for seq, message_id, subject, body, recipients, created in rows:
+                connection.execute("INSERT OR IGNORE INTO messages VALUES (?, ?, ?, ?)",
+                                   (message_id, subject, body, created))
+                connection.executemany("INSERT OR IGNORE INTO deliveries VALUES (?, ?, ?, 0, ?)",
+                                       ((message_id, recipient, PENDING, now)
+                                        for recipient in dict.fromkeys(recipients.split("\n")) if recipient))
+        with outbox:
+            outbox.execute("DELETE FROM outbox WHERE seq <= ?", (rows[-1][0],))
+        return rows[-1][0]
+
+    def _send_due(self, connection):
+        """
+        Sends a chunk of the deliveries that are due, and writes down how
+        each one went.
+
+        :param connection: the worker's connection
+        :return: none
+        """
+        now = time.time()
+        rows = connection.execute(
+            "SELECT d.message_id, d.recipient, d.attempts, m.subject, m.body FROM deliveries d "
+            "JOIN messages m ON m.id = d.message_id "
+            "WHERE d.status = ? AND d.next_try <= ? ORDER BY d.next_try LIMIT ?",
+            (PENDING, now, SEND_CHUNK)).fetchall()
+        # message id -> (subject, body, {recipient: attempts so far})
+        messages = {}
+        for message_id, recipient, attempts, subject, body in rows:
+            messages.setdefault(message_id, (subject, body, {}))[2][recipient] = attempts
+        for message_id, (subject, body, attempts) in messages.items():
+            try:
+                status = self._emailer.send_plain_email(list(attempts), subject, body)
+            except Exception as e:
+                status = {recipient: f"failed: {e}" for recipient in attempts}
+            updates = []
+            for recipient, tries in attempts.items():
+                result = _result_of(status, recipient)
+                tries += 1
+                if result.startswith("failed") and tries < self._max_tries:
+                    # try again later, waiting twice as long as the time before
+                    delay = min(self._max_retry_delay, self._retry_delay * 2 ** (tries - 1))
+                    updates.append((PENDING, tries, time.time() + delay, message_id, recipient))
+                else:
+                    updates.append((result, tries, None, message_id, recipient))
+            with connection:
+                connection.executemany("UPDATE deliveries SET status = ?, attempts = ?, next_try = ? "
+                                       "WHERE message_id = ? AND recipient = ?", updates)
+
+    def _time_to_next(self, connection):
+        """
+        Returns how long the worker can wait before a delivery is due.
+
+        :param connection: the worker's connection
+        :return: seconds to wait, or None if no delivery is waiting
+        """
+        (next_try,) = connection.execute("SELECT MIN(next_try) FROM deliveries WHERE status = ?",
+                                         (PENDING,)).fetchone()
+        if next_try is None:
+            return None
+        return max(0.0, next_try - time.time())
+
+    def _update_pending(self, connection, expanded_seq=None):
+        """
+        Counts the deliveries that are not finished and wakes the threads in
+        wait(). The count and the last outbox row expanded are changed
+        together, so wait() never sees the new row without its deliveries.
+
+        :param connection: the worker's connection to the spool file
+        :param expanded_seq: seq of the last outbox row just expanded, or None
+        :return: none
+        """
+        (pending,) = connection.execute("SELECT COUNT(*) FROM deliveries WHERE status = ?", (PENDING,)).fetchone()
+        with self._condition:
+            if expanded_seq is not None:
+                self._expanded_seq = max(self._expanded_seq, expanded_seq)
+            self._pending = pending
+            self._condition.notify_all()
+
+
+def _connect(file_name, check_same_thread=True):
+    """
+    Opens a connection to a spool or outbox file in WAL mode, so the callers
+    and the worker can use the file at the same time, with
+    synchronous=NORMAL, so a commit does not wait for the disk.
+
+    :param file_name: the SQLite file
+    :param check_same_thread: False for a connection shared by several threads
+    :return: the connection
+    """
+    connection = sqlite3.connect(file_name, check_same_thread=check_same_thread)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def _result_of(status, recipient):
+    """
+    Returns the delivery status the emailer gave a recipient.
+
+    :param status: what the emailer's send_plain_email() returned: a dictionary of statuses,
+        or of futures holding them (see AsyncEmailer), or None for an emailer that reports nothing
+    :param recipient: the recipient
+    :return: SENT or the reason it failed
+    """
+    if status is None or recipient not in status:
+        return SENT
+    result = status[recipient]
+    if hasattr(result, "result"):
+        try:
+            result = result.result()
+        except Exception as e:
+            result = f"failed: {e}"
+    return result
@@ -0,0 +1,633 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from array import array
+from collections.abc import Sequence
+
+from module06.league_model.exceptions import BatchError, DuplicateOid, DuplicateEmail
+from module06.league_model.identified_object import IdentifiedObject
+from module06.league_model.name_index import NameIndex
+from module06.league_model.team import Team, _check_new_members, _email_key
+from module06.league_model.team_member import TeamMember
+
+
+class MemberTable:
+    """
+    This class stores the team members of a league as columns instead of one
+    TeamMember object per member, for leagues too big to keep as objects.
+
+    Each member is a row: its oid in an array('q'), and its name and email
+    as positions in a pool of strings, so every distinct string is stored
+    once. Teams (see ColumnarTeam) hold arrays of the rows of their members,
+    and a member on several teams is a single row.
+
+    A member is about 16 bytes in the table plus its share of the string
+    pool, instead of a TeamMember object with its own strings. Rows are not
+    removed when a member leaves a team; unused rows are dropped when the
+    league is saved.
+
+    The rows of each oid, name and lowercase email are kept in dictionaries
+    built the first time a member is looked up, so the teams can find their
+    members without scanning their rows.
+    """
+
+    def __init__(self, oids=(), names=(), emails=(), strings=()):
+        """
+        Constructor for the member table. The columns can be filled from a
+        saved file; string positions of -1 stand for None.
+
+        :param oids: the oid of each row
+        :param names: the position of each row's name in strings
+        :param emails: the position of each row's email in strings
+        :param strings: the string pool
+        """
+        self._oids = array("q", oids)
+        self._names = array("i", names)
+        self._emails = array("i", emails)
+        # the pool ends with None so position -1 reads as None
+        self._strings = list(strings) + [None]
+        # string -> position and oid -> row, built when first needed
+        self._positions = None
+        self._rows = None
+        # name -> rows and lowercase email -> rows, built when first needed
+        self._rows_by_name = None
+        self._rows_by_email = None
+
+    def __getstate__(self):
+        """
+        Returns the state used by pickle and copy. The lookup dictionaries
+        are rebuilt when needed, so they are left out.
+
+        :return: dictionary of the table fields
+        """
+        return {"_oids": self._oids, "_names": self._names, "_emails": self._emails, "_strings": self._strings}
+
+    def __setstate__(self, state):
+        """
+        Restores the state saved by __getstate__().
+
+        :param state: dictionary of the table fields
+        :return: none
+        """
+        self.__dict__.update(state)
+        self._positions = None
+        self._rows = None
+        self._rows_by_name = None
+        self._rows_by_email = None
+
+    def __len__(self):
+        """
+        Returns the number of rows in the table.
+
+        :return: the number of rows
+        """
+        return len(self._oids)
+
+    def oid(self, row):
+        """
+        Returns the oid of a row.
+
+        :param row: the row
+        :return: the oid
+        """
+        return self._oids[row]
+
+    def name(self, row):
+        """
+        Returns the name of a row.
+
+        :param row: the row
+        :return: the name
+        """
+        return self._strings[self._names[row]]
+
+    def email(self, row):
+        """
+        Returns the email of a row.
+
+        :param row: the row
+        :return: the email
+        """
+        return self._strings[self._emails[row]]
+
+    def values(self, row):
+        """
+        Returns the oid, name and email of a row.
+
+        :param row: the row
+        :return: tuple of the oid, name and email
+        """
+        strings = self._strings
+        return self._oids[row], strings[self._names[row]], strings[self._emails[row]]
+
+    def set_name(self, row, name):
+        """
+        Changes the name of a row.
+
+        :param row: the row
+        :param name: the new name
+        :return: none
+        """
+        if self._rows_by_name is not None:
+            self._rows_by_name.remove(self.name(row), row)
+            self._rows_by_name.add(name, row)
+        self._names[row] = self._position(name)
+
+    def set_email(self, row, email):
+        """
+        Changes the email of a row.
+
+        :param row: the row
+        :param email: the new email
+        :return: none
+        """
+        if self._rows_by_email is not None:
+            old_email = self.email(row)
+            if old_email is not None:
+                self._rows_by_email.remove(_email_key(old_email), row)
+            if email is not None:
+                self._rows_by_email.add(_email_key(email), row)
+        self._emails[row] = self._position(email)
+
+    def row_for(self, oid, name, email):
+        """
+        Returns the row of a member, adding a row if the oid is not in the table yet.
+
+        :param oid: the member oid
+        :param name: the member name, used for a new row
+        :param email: the member email, used for a new row
+        :return: the row
+        """
+        row = self.row_of(oid)
+        if row is None:
+            row = self._rows[oid] = len(self._oids)
+            self._oids.append(oid)
+            self._names.append(self._position(name))
+            self._emails.append(self._position(email))
+            if self._rows_by_name is not None:
+                self._rows_by_name.add(name, row)
+                if email is not None:
+                    self._rows_by_email.add(_email_key(email), row)
+        return row
+
+    def row_of(self, oid):
+        """
+        Returns the row of a member.
+
+        :param oid: the member oid
+        :return: the row, or None if the oid is not in the table
+        """
+        if self._rows is None:
+            self._rows = {member_oid: row for row, member_oid in enumerate(self._oids)}
+        return self._rows.get(oid)
+
+    def rows_named(self, name):
+        """
+        Returns the rows with a name, in any team.
+
+        :param name: the name
+        :return: list of rows
+        """
+        if self._rows_by_name is None:
+            self._index_strings()
+        return self._rows_by_name.find_all(name)
+
+    def rows_with_email(self, email):
+        """
+        Returns the rows with an email, in any team. Case is ignored.
+
+        :param email: the email
+        :return: list of rows
+        """
+        if self._rows_by_email is None:
+            self._index_strings()
+        return self._rows_by_email.find_all(_email_key(email))
+
+    def _index_strings(self):
+        """
+        Builds the name and email dictionaries.
+
+        :return: none
+        """
+        strings = self._strings
+        self._rows_by_name = NameIndex((strings[position], row) for row, position in enumerate(self._names))
+        self._rows_by_email = NameIndex((_email_key(strings[position]), row)
+                                        for row, position in enumerate(self._emails) if position != -1)
+
+    def view(self, row, team):
+        """
+        Returns a TeamMember for a row. The object is made on each call and
+        is not kept; changing its name or email writes the change back to
+        the table through the team.
+
+        :param row: the row
+        :param team: the ColumnarTeam the member is accessed through
+        :return: the TeamMember
+        """
+        member = TeamMember.__new__(TeamMember)
+        member._oid = self._oids[row]
+        member._name = self._strings[self._names[row]]
+        member._email = self._strings[self._emails[row]]
+        member._owners = (team,)
+        return member
+
+    def _position(self, value):
+        """
+        Returns the position of a string in the pool, adding it if needed.
+
+        :param value: the string, or None
+        :return: the position, -1 for None
+        """
+        if value is None:
+            return -1
+        if self._positions is None:
+            self._positions = {string: i for i, string in enumerate(self._strings[:-1])}
+        position = self._positions.get(value)
+        if position is None:
+            position = self._positions[value] = len(self._strings) - 1
+            self._strings.insert(position, value)
+        return position
+
+
+class MemberSequence(Sequence):
+    """
+    This class is the read-only sequence returned by ColumnarTeam.members.
+    Items are TeamMember views made when they are read.
+    """
+
+    __slots__ = ("_team",)
+
+    def __init__(self, team):
+        """
+        Constructor for the sequence.
+
+        :param team: the ColumnarTeam
+        """
+        self._team = team
+
+    def __len__(self):
+        """
+        Returns the number of members.
+
+        :return: the number of members
+        """
+        return len(self._team._rows)
+
+    def __getitem__(self, index):
+        """
+        Returns the member at a position, or a list for a slice.
+
+        :param index: the position or slice
+        :return: the TeamMember view, or a list of them
+        """
+        team = self._team
+        if isinstance(index, slice):
+            return [team._table.view(row, team) for row in team._rows[index]]
+        return team._table.view(team._rows[index], team)
+
+    def __iter__(self):
+        """
+        Returns an iterator over the member views.
+
+        :return: the iterator
+        """
+        team = self._team
+        view = team._table.view
+        return (view(row, team) for row in team._rows)
+
+    def __contains__(self, member):
+        """
+        Checks if a member is on the team, by oid.
+
+        :param member: the member
+        :return: True if the member is on the team
+        """
+        return isinstance(member, TeamMember) and self._team._row_of(member.oid) is not None
+
+
+class ColumnarTeam(Team):
+    """
+    This class is a Team whose members are rows in a MemberTable shared by
+    the teams of a league, instead of TeamMember objects.
+
+    It has the same methods as Team. members returns a read-only sequence
+    of TeamMember views made on access, and changes to a view's name or email
+    are written back to the table. member_values(), send_email() and the
+    codec read the columns directly without making any objects.
+
+    Lookups by name, email or oid use the dictionaries of the table, which
+    are shared by the teams of the league, and then check that the row is
+    on this team with a set of the team's rows, made on the first lookup.
+    """
+
+    __slots__ = ("_table", "_rows", "_row_set")
+
+    def __init__(self, oid, name, table, rows=()):
+        """
+        Constructor for the columnar team.
+
+        :param oid: id for the team object
+        :param name: name of the team
+        :param table: the MemberTable holding the members
+        :param rows: rows of the members in the table
+        """
+        # Team.__init__() is skipped, since the member lists and indexes are not used
+        IdentifiedObject.__init__(self, oid)
+        self._name = name
+        self._table = table
+        self._rows = array("i", rows)
+        # set of the rows, for lookups, made when first needed
+        self._row_set = None
+
+    @property
+    def table(self):
+        """
+        Getter method for the member table.
+
+        :return: the MemberTable
+        """
+        return self._table
+
+    @property
+    def members(self):
+        """
+        Getter method for the team members.
+
+        :return: read-only sequence of TeamMember views
+        """
+        return MemberSequence(self)
+
+    @members.setter
+    def members(self, value):
+        """
+        Setter method for the team members.
+
+        :param value: A list of team members to set
+        :return: none
+        """
+        self._restore(value)
+
+    def member_values(self):
+        """
+        Returns the oid, name and email of each member, read from the columns.
+
+        :return: iterator of (oid, name, email) tuples
+        """
+        values = self._table.values
+        return (values(row) for row in self._rows)
+
+    def add_member(self, member):
+        """
+        Adds a member to the team, as Team.add_member() does.
+
+        :param member: member to add to the team
+        :return: none
+        """
+        if self._row_of(member.oid) is not None:
+            raise DuplicateOid(member.oid)
+        if self._row_with_email(member.email) is not None:
+            raise DuplicateEmail(member.email)
+        self._insert_member(len(self._rows), member)
+
+    def add_members(self, members):
+        """
+        Adds several members to the team, as Team.add_members() does. The
+        rows of the team are read once to check the whole batch.
+
+        :param members: the members to add, in order
+        :return: none
+        """
+        members = list(members)
+        errors = _check_new_members(members, *self._member_keys())
+        if errors:
+            raise BatchError(errors)
+        for member in members:
+            self._insert_member(len(self._rows), member)
+
+    def remove_member(self, member):
+        """
+        Removes a member from the team.
+
+        :param member: member to remove from the team
+        :return: none
+        """
+        index = self._row_index(member.oid)
+        if index is not None:
+            self._team_rows().discard(self._rows[index])
+            del self._rows[index]
+            for league in self._owners:
+                league._member_removed(self, member)
+            self._notify("remove_member", member, index)
+
+    def _insert_member(self, index, member):
+        """
+        Puts a member in the team at a position, without the checks of add_member().
+
+        :param index: the position, or None for the end
+        :param member: the member
+        :return: none
+        """
+        row = self._table.row_for(member.oid, member.name, member.email)
+        if index is None or index >= len(self._rows):
+            self._rows.append(row)
+        else:
+            self._rows.insert(index, row)
+        if self._row_set is not None:
+            self._row_set.add(row)
+        for league in self._owners:
+            league._member_added(self, member)
+        self._notify("add_member", member, index)
+
+    def member_named(self, s):
+        """
+        Returns the first member with the provided name.
+
+        :param s: name of the member to return if it exists
+        :return: the member view, or None
+        """
+        rows = self._team_rows()
+        # the first of the team's rows with the name, as the team lists them
+        found = [row for row in self._table.rows_named(s) if row in rows]
+        if not found:
+            return None
+        row = found[0] if len(found) == 1 else min(found, key=self._rows.index)
+        return self._table.view(row, self)
+
+    def member_with_oid(self, oid):
+        """
+        Returns the member with the provided oid.
+
+        :param oid: oid of the member to return if it exists
+        :return: the member view, or None
+        """
+        row = self._row_of(oid)
+        return self._table.view(row, self) if row is not None else None
+
+    def member_with_email(self, email):
+        """
+        Returns the member with the provided email. Case is ignored.
+
+        :param email: email of the member to return if it exists
+        :return: the member view, or None
+        """
+        row = self._row_with_email(email)
+        return self._table.view(row, self) if row is not None else None
+
+    def send_email(self, emailer, subject, message):
+        """
+        Sends an email to all members of the team
+
+        :param emailer: emailer object
+        :param subject: subject of the email
+        :param message: message of the email
+        :return: the delivery status of each recipient, from the emailer
+        """
+        email_recipients = [email for _, _, email in self.member_values() if email is not None]
+        return emailer.send_plain_email(email_recipients, subject, message)
+
+    def _restore(self, members):
+        """
+        Replaces the members of the team in one step.
+
+        :param members: list of team members
+        :return: none
+        """
+        if self._owners and hasattr(self, "_rows"):
+            for member in self.members:
+                for league in self._owners:
+                    league._member_removed(self, member)
+        self._rows = array("i", (self._table.row_for(member.oid, member.name, member.email) for member in members))
+        self._row_set = None
+        for member in members:
+            for league in self._owners:
+                league._member_added(self, member)
+
+    def _index_changed(self, member, attribute, old_value, new_value):
+        """
+        Called by a member view when its name or email changes, to write the
+        change to the table.
+
+        :param member: the team member that changed
+        :param attribute: "name" or "email"
+        :param old_value: the value before the change
+        :param new_value: the value after the change
+        :return: none
+        """
+        row = self._row_of(member.oid)
+        if row is None:
+            return
+        if attribute == "name":
+            self._table.set_name(row, new_value)
+        elif attribute == "email":
+            self._table.set_email(row, new_value)
+        for league in self._owners:
+            league._member_changed(self, member, attribute, old_value, new_value)
+
+    def _member_keys(self):
+        """
+        Returns containers of the oids and lowercase emails of the members,
+        for checking a batch of new members. They look the keys up in the
+        table instead of reading every row of the team.
+
+        :return: tuple of the oid container and the lowercase email container
+        """
+        return (_KeyCheck(lambda oid: self._row_of(oid) is not None),
+                _KeyCheck(lambda email_key: self._row_with_email(email_key) is not None))
+
+    def _team_rows(self):
+        """
+        Returns the set of the team's rows, making it the first time.
+
+        :return: set of rows
+        """
+        if self._row_set is None:
+            self._row_set = set(self._rows)
+        return self._row_set
+
+    def _row_index(self, oid):
+        """
+        Finds the position in the team of the member with an oid. The
+        position is only needed when a member is removed, which moves the
+        rows after it anyway.
+
+        :param oid: the member oid
+        :return: the position in _rows, or None
+        """
+        row = self._row_of(oid)
+        return self._rows.index(row) if row is not None else None
+
+    def _row_of(self, oid):
+        """
+        Finds the table row of the team member with an oid.
+
+        :param oid: the member oid
+        :return: the row, or None
+        """
+        row = self._table.row_of(oid)
+        return row if row is not None and row in self._team_rows() else None
+
+    def _row_with_email(self, email):
+        """
+        Finds the table row of the team member with an email, ignoring case.
+
+        :param email: the email
+        :return: the row, or None
+        """
+        if email is None:
+            return None
+        rows = self._team_rows()
+        for row in self._table.rows_with_email(email):
+            if row in rows:
+                return row
+        return None
+
+    def __setstate__(self, state):
+        """
+        Restores the state used by pickle and copy. The table is copied along
+        with the team, so a copy of a single team holds the whole table of
+        its league.
+
+        :param state: dictionary of the team fields
+        :return: none
+        """
+        state.pop("_row_set", None)
+        IdentifiedObject.__setstate__(self, state)
+        self._row_set = None
+
+    def __str__(self):
+        """
+        Returns a string value of the object.
+
+        :return: string value of the object
+        """
+        return f"{self._name}: {len(self._rows)} members"
+
+
+class _KeyCheck:
+    """
+    Container used by ColumnarTeam._member_keys(), whose "in" checks a key
+    with one of the team's lookups instead of holding every key.
+    """
+
+    __slots__ = ("_check",)
+
+    def __init__(self, check):
+        """
+        Constructor for the container.
+
+        :param check: function returning True if a key is on the team
+        """
+        self._check = check
+
+    def __contains__(self, key):
+        """
+        Checks if a key is on the team.
+
+        :param key: the oid or lowercase email
+        :return: True if it is on the team
+        """
+        return self._check(key)
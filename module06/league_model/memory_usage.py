@@ -0,0 +1,124 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import gc
+import sys
+import tracemalloc
+
+from module06.league_model.league import League
+from module06.league_model.team import Team
+from module06.league_model.team_member import TeamMember
+
+
+def build_test_database(database, member_total, members_per_team=25, teams_per_league=100):
+    """
+    Fills a database with generated leagues, teams and members, for the
+    benchmarks in this module and in codec.py.
+
+    :param database: an empty LeagueDatabase object
+    :param member_total: number of team members to create
+    :param members_per_team: number of members on each team
+    :param teams_per_league: number of teams in each league
+    :return: the database
+    """
+    team_count = max(1, member_total // members_per_team)
+    for team_number in range(team_count):
+        if team_number % teams_per_league == 0:
+            league = League(database.next_oid(), f"League {team_number // teams_per_league}")
+            database.add_league(league)
+        team = Team(database.next_oid(), f"Team {team_number}")
+        for member_number in range(members_per_team):
+            oid = database.next_oid()
+            team.add_member(TeamMember(oid, f"Member {oid}", f"member{oid}@example.com"))
+        league.add_team(team)
+    return database
+
+
+class _DictTeamMember:
+    """
+    A team member with its fields in a __dict__, the way TeamMember was
+    stored before it used __slots__. Used as the baseline in main().
+    """
+
+    def __init__(self, oid, name, email):
+        """
+        Constructor for the baseline member.
+
+        :param oid: id for the member
+        :param name: name of the member
+        :param email: email of the member
+        """
+        self._oid = oid
+        self._name = name
+        self._email = email
+        self._owners = ()
+
+
+def _measure(make):
+    """
+    Measures the memory taken by the objects made by a function, while
+    they are still alive.
+
+    :param make: function with no parameters returning the objects
+    :return: bytes allocated for the objects
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    made = make()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del made
+    return used
+
+
+def main():
+    """
+    Measures the memory used by the model objects. The number of members
+    is given on the command line (200,000 by default), for example
+
+    python -m module06.league_model.memory_usage 1000000
+
+    First the same members are made as TeamMember objects and as members
+    with a __dict__, as before __slots__ was added, to show the reduction.
+    Then a test database is built and the memory taken by it is divided by
+    the number of members, so the result includes each member's share of
+    its team and league, and the same database is loaded with the members
+    in MemberTables.
+
+    :return: none
+    """
+    from module06.league_model import codec
+    from module06.league_model.league_database import LeagueDatabase
+
+    member_total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    def make_members(member_class):
+        return [member_class(oid, f"Member {oid}", f"member{oid}@example.com") for oid in range(member_total)]
+
+    dict_used = _measure(lambda: make_members(_DictTeamMember))
+    slots_used = _measure(lambda: make_members(TeamMember))
+    print(f"{member_total} members, with their strings:")
+    print(f"  before __slots__: {dict_used / member_total:.0f} bytes per member")
+    print(f"  with __slots__: {slots_used / member_total:.0f} bytes per member "
+          f"({1 - slots_used / dict_used:.0%} less)")
+
+    database = build_test_database(LeagueDatabase(), member_total)
+    member_count = sum(len(team.members) for league in database.leagues for team in league.teams)
+    data = codec.dumps(database)
+    del database
+    used = _measure(lambda: codec.loads(data, LeagueDatabase()))
+    columnar_used = _measure(lambda: codec.loads(data, LeagueDatabase(), columnar=True))
+    print(f"database of {member_count} members:")
+    print(f"  objects: {used / 1_000_000:.1f} MB in total, {used / member_count:.0f} bytes per member")
+    print(f"  columnar: {columnar_used / 1_000_000:.1f} MB in total, {columnar_used / member_count:.0f} bytes "
+          f"per member ({1 - columnar_used / used:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
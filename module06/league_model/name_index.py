@@ -0,0 +1,104 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+
+class NameIndex:
+    """
+    This class maps names (or any other key) to the objects that have them,
+    so an object can be found without searching a whole list.
+
+    Names do not have to be unique. A name held by one object maps straight
+    to the object, and only a name shared by several objects uses a list,
+    which keeps the index small for large teams. find() returns the object
+    that was indexed under the name first.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, pairs=()):
+        """
+        Constructor for the index.
+
+        :param pairs: (key, object) pairs to start with
+        """
+        self._entries = {}
+        for key, obj in pairs:
+            self.add(key, obj)
+
+    def add(self, key, obj):
+        """
+        Adds an object under a key.
+
+        :param key: the name or other key
+        :param obj: the object
+        :return: none
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries[key] = obj
+        elif type(entry) is list:
+            entry.append(obj)
+        else:
+            self._entries[key] = [entry, obj]
+
+    def remove(self, key, obj):
+        """
+        Removes an object from under a key, if it is there.
+
+        :param key: the name or other key
+        :param obj: the object
+        :return: none
+        """
+        entry = self._entries.get(key)
+        if entry is obj:
+            del self._entries[key]
+        elif type(entry) is list:
+            entry = [other for other in entry if other is not obj]
+            self._entries[key] = entry[0] if len(entry) == 1 else entry
+
+    def find(self, key):
+        """
+        Returns the first object indexed under a key.
+
+        :param key: the name or other key
+        :return: the object, or None if there is none
+        """
+        entry = self._entries.get(key)
+        if type(entry) is list:
+            return entry[0]
+        return entry
+
+    def find_all(self, key):
+        """
+        Returns every object indexed under a key.
+
+        :param key: the name or other key
+        :return: list of objects
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return []
+        if type(entry) is list:
+            return list(entry)
+        return [entry]
+
+    def __contains__(self, key):
+        """
+        Checks if any object is indexed under a key.
+
+        :param key: the name or other key
+        :return: True if the key is in the index
+        """
+        return key in self._entries
+
+    def __len__(self):
+        """
+        Returns the number of different keys in the index.
+
+        :return: the number of keys
+        """
+        return len(self._entries)
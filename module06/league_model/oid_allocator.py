@@ -0,0 +1,225 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import threading
+
+
+class OidAllocator:
+    """
+    This class hands out the oids of a LeagueDatabase.
+
+    The only state is the high-water mark, the last oid handed out, which is
+    saved with the database as last_oid. It is protected by a lock, so
+    several threads can take oids at the same time.
+
+    Callers that create many objects (importers, dialogs) reserve a block of
+    oids with reserve() and take oids from the block without touching the
+    lock again. The unused part of a block is given back with
+    OidBlock.release(). Given back ranges are handed out again by later
+    reservations that fit in them, and a range at the top lowers the
+    high-water mark, so a cancelled dialog does not use up any oids.
+    """
+
+    def __init__(self, high_water=0):
+        """
+        Constructor for the oid allocator.
+
+        :param high_water: the last oid already handed out
+        """
+        self._high_water = high_water
+        # ranges (start, stop) below the high-water mark that were given back
+        self._free = []
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        """
+        Returns the state used by pickle. Locks cannot be pickled, so only the
+        high-water mark and the given back ranges are kept.
+
+        :return: dictionary of the allocator fields
+        """
+        return {"_high_water": self._high_water, "_free": list(self._free)}
+
+    def __setstate__(self, state):
+        """
+        Restores the state saved by __getstate__() with a new lock.
+
+        :param state: dictionary of the allocator fields
+        :return: none
+        """
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def high_water(self):
+        """
+        Getter method for the last oid handed out.
+
+        :return: the high-water mark
+        """
+        return self._high_water
+
+    @high_water.setter
+    def high_water(self, value):
+        """
+        Setter method for the last oid handed out. This is used when a
+        database is read from a file, and forgets the given back ranges.
+
+        :param value: the new high-water mark
+        :return: none
+        """
+        with self._lock:
+            self._high_water = value
+            self._free = []
+
+    def next_oid(self):
+        """
+        Hands out one new oid.
+
+        :return: the oid
+        """
+        with self._lock:
+            self._high_water += 1
+            return self._high_water
+
+    def reserve(self, count):
+        """
+        Reserves a block of count oids in a row for one caller.
+
+        :param count: number of oids in the block
+        :return: an OidBlock
+        """
+        if count < 1:
+            raise ValueError("An oid block must hold at least one oid")
+        with self._lock:
+            for i, (start, stop) in enumerate(self._free):
+                if stop - start >= count:
+                    if stop - start == count:
+                        del self._free[i]
+                    else:
+                        self._free[i] = (start + count, stop)
+                    return OidBlock(self, start, start + count)
+            start = self._high_water + 1
+            self._high_water += count
+            return OidBlock(self, start, start + count)
+
+    def _give_back(self, start, stop):
+        """
+        Takes back the unused oids start to stop - 1 of a block.
+
+        :param start: first unused oid
+        :param stop: one past the last unused oid
+        :return: none
+        """
+        if start >= stop:
+            return
+        with self._lock:
+            self._free.append((start, stop))
+            self._free.sort()
+            # join neighbouring ranges, then lower the high-water mark
+            merged = []
+            for range_start, range_stop in self._free:
+                if merged and merged[-1][1] == range_start:
+                    merged[-1] = (merged[-1][0], range_stop)
+                else:
+                    merged.append((range_start, range_stop))
+            if merged and merged[-1][1] == self._high_water + 1:
+                self._high_water = merged.pop()[0] - 1
+            self._free = merged
+
+
+class OidBlock:
+    """
+    This class is a block of oids reserved with OidAllocator.reserve().
+    Oids are taken with next_oid(), in order. When the block is used up, a
+    new block of the same size is reserved, so callers that do not know how
+    many objects they will create can keep going.
+
+    A block is not meant to be shared between threads; each thread or
+    worker should reserve its own. It can be used in a with statement,
+    which gives back the unused oids at the end. cancel() gives back every
+    oid of the block, for when the objects created with them are thrown
+    away, such as in an edit dialog that is cancelled.
+    """
+
+    def __init__(self, allocator, start, stop):
+        """
+        Constructor for the oid block.
+
+        :param allocator: the OidAllocator the block came from
+        :param start: the first oid of the block
+        :param stop: one past the last oid of the block
+        """
+        self._allocator = allocator
+        self._next = start
+        self._stop = stop
+        self._size = stop - start
+        # every range (start, stop) reserved for this block
+        self._ranges = [(start, stop)]
+
+    @property
+    def remaining(self):
+        """
+        Getter method for the number of oids not yet taken.
+
+        :return: the number of unused oids
+        """
+        return self._stop - self._next
+
+    def next_oid(self):
+        """
+        Takes the next oid from the block.
+
+        :return: the oid
+        """
+        if self._next >= self._stop:
+            block = self._allocator.reserve(self._size)
+            self._next, self._stop = block._next, block._stop
+            self._ranges.append((self._next, self._stop))
+        oid = self._next
+        self._next += 1
+        return oid
+
+    def release(self):
+        """
+        Gives the unused oids back to the allocator. The block is empty afterwards.
+
+        :return: none
+        """
+        self._allocator._give_back(self._next, self._stop)
+        self._stop = self._next
+        if self._ranges:
+            self._ranges[-1] = (self._ranges[-1][0], self._stop)
+
+    def cancel(self):
+        """
+        Gives back every oid of the block, including the ones already taken.
+        This must only be used if none of the objects created with them are kept.
+
+        :return: none
+        """
+        self.release()
+        for start, stop in self._ranges:
+            self._allocator._give_back(start, stop)
+        self._ranges = []
+
+    def __enter__(self):
+        """
+        Starts a with statement.
+
+        :return: the block
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Gives back the unused oids at the end of a with statement.
+
+        :return: False so exceptions are not hidden
+        """
+        self.release()
+        return False
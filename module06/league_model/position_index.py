@@ -0,0 +1,103 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+
+class PositionIndex:
+    """
+    This class keeps the position of each key of an ordered collection
+    where keys are added at the end and removed from anywhere, such as the
+    members of a team, so the position of a key can be found without
+    searching the collection.
+
+    Each key keeps the slot it was given when it was added, and a Fenwick
+    tree (binary indexed tree) counts the keys still in the slots before
+    it, so adding a key, removing one and finding a position each take
+    O(log n). Putting a key anywhere but the end is not supported; the
+    owner drops the index and makes a new one instead.
+    """
+
+    __slots__ = ("_slots", "_tree")
+
+    def __init__(self, keys=()):
+        """
+        Constructor for the index.
+
+        :param keys: the keys in order
+        """
+        # key -> slot, starting at 1
+        self._slots = {}
+        # _tree[i] is the number of keys in the slots i - (i & -i) + 1 to i; _tree[0] is not used
+        tree = self._tree = [0]
+        for key in keys:
+            self._slots[key] = len(tree)
+            tree.append(1)
+        size = len(tree)
+        for i in range(1, size):
+            parent = i + (i & -i)
+            if parent < size:
+                tree[parent] += tree[i]
+
+    def append(self, key):
+        """
+        Adds a key at the end.
+
+        :param key: the key
+        :return: none
+        """
+        i = len(self._tree)
+        self._slots[key] = i
+        # the new node counts its own key and the keys in the slots it covers before it
+        self._tree.append(1 + self._count(i - 1) - self._count(i - (i & -i)))
+
+    def position(self, key):
+        """
+        Returns the position of a key.
+
+        :param key: the key
+        :return: the position, starting at 0, or None if the key is not in the index
+        """
+        i = self._slots.get(key)
+        return self._count(i - 1) if i is not None else None
+
+    def remove(self, key):
+        """
+        Removes a key.
+
+        :param key: the key
+        :return: the position the key was at, or None if it was not in the index
+        """
+        i = self._slots.pop(key, None)
+        if i is None:
+            return None
+        position = self._count(i - 1)
+        tree = self._tree
+        while i < len(tree):
+            tree[i] -= 1
+            i += i & -i
+        return position
+
+    def __len__(self):
+        """
+        Returns the number of keys in the index.
+
+        :return: the number of keys
+        """
+        return len(self._slots)
+
+    def _count(self, i):
+        """
+        Counts the keys in the slots 1 to i.
+
+        :param i: the last slot to count
+        :return: the number of keys
+        """
+        count = 0
+        tree = self._tree
+        while i > 0:
+            count += tree[i]
+            i -= i & -i
+        return count
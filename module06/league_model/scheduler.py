@@ -0,0 +1,303 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import timedelta
+
+from module06.league_model.competition import Competition
+
+# how long a competition is taken to last when checking for conflicts
+DEFAULT_DURATION = timedelta(hours=2)
+
+
+class IntervalIndex:
+    """
+    This class keeps the busy times of each key (a team oid or a location)
+    so a new competition can be checked for double booking with a binary
+    search, instead of being compared to every other competition.
+
+    The busy times of a key are kept as sorted, non-overlapping intervals;
+    an interval that touches or overlaps others is merged with them when it
+    is added. An interval ends at its end time, so a competition can start
+    at the time the one before it ends.
+    """
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self):
+        """
+        Constructor for the index.
+        """
+        # key -> sorted interval starts, and key -> the matching ends
+        self._starts = {}
+        self._ends = {}
+
+    def overlaps(self, key, start, end):
+        """
+        Checks if a key is busy at any time from start to end.
+
+        :param key: the team oid or location
+        :param start: start of the interval
+        :param end: end of the interval
+        :return: True if the key is busy in the interval
+        """
+        starts = self._starts.get(key)
+        if not starts:
+            return False
+        ends = self._ends[key]
+        # schedules are made in time order, so most checks come after every busy time
+        if start >= ends[-1]:
+            return False
+        # the interval starting at or before start, then the one after it
+        index = bisect_right(starts, start)
+        if index > 0 and ends[index - 1] > start:
+            return True
+        return index < len(starts) and starts[index] < end
+
+    def add(self, key, start, end):
+        """
+        Marks a key as busy from start to end.
+
+        :param key: the team oid or location
+        :param start: start of the interval
+        :param end: end of the interval
+        :return: none
+        """
+        starts = self._starts.get(key)
+        if starts is None:
+            self._starts[key] = [start]
+            self._ends[key] = [end]
+            return
+        ends = self._ends[key]
+        if start > ends[-1]:
+            starts.append(start)
+            ends.append(end)
+            return
+        first = bisect_left(starts, start)
+        if first > 0 and ends[first - 1] >= start:
+            first -= 1
+        last = first
+        while last < len(starts) and starts[last] <= end:
+            last += 1
+        if first < last:
+            start = min(start, starts[first])
+            end = max(end, ends[last - 1])
+        starts[first:last] = [start]
+        ends[first:last] = [end]
+
+
+class Scheduler:
+    """
+    This class makes the competitions of a season for the teams of a league,
+    given the venues (locations) and time slots to use.
+
+    The pairings are made first: a round robin with the circle method, or
+    the rounds of a single elimination bracket. The games are then put in
+    the time slots in order, each in the first slot where both teams and a
+    venue are free. Teams and venues are checked with IntervalIndexes that
+    already hold the dated competitions of the league, so nothing is double
+    booked, and each check is a binary search.
+
+    The competitions made are not added to the league; they are returned
+    so they can be checked and then added with League.add_competitions().
+    """
+
+    def __init__(self, league, venues, slots, oids, duration=DEFAULT_DURATION):
+        """
+        Constructor for the scheduler.
+
+        :param league: the league to schedule
+        :param venues: list of locations
+        :param slots: list of the datetimes games can start at
+        :param oids: object with a next_oid() method for the new competitions,
+            such as the database or a block from reserve_oids()
+        :param duration: how long a competition lasts
+        """
+        if not venues:
+            raise ValueError("At least one venue is needed")
+        self._league = league
+        self._venues = list(venues)
+        self._slots = sorted(slots)
+        self._oids = oids
+        self._duration = duration
+        self._teams = IntervalIndex()
+        self._locations = IntervalIndex()
+        for competition in league.competitions:
+            if competition.date_time is not None:
+                self._book(competition.teams_competing, competition.location, competition.date_time)
+
+    def round_robin(self, teams=None, rounds=1):
+        """
+        Schedules every team against every other team.
+
+        :param teams: the teams, all the teams of the league if None
+        :param rounds: how many times each pair of teams plays, with home and away swapped each time
+        :return: list of the new competitions, in date order
+        """
+        teams = list(self._league.teams if teams is None else teams)
+        games = []
+        for repeat in range(rounds):
+            for pairs in round_robin_pairs(teams):
+                if repeat % 2:
+                    pairs = [(away, home) for home, away in pairs]
+                games.extend(pairs)
+        return self._place(games)
+
+    def bracket(self, teams=None):
+        """
+        Schedules the first round of a single elimination bracket. The teams
+        are taken as seeded in the order given; the best seeds get a bye
+        when the number of teams is not a power of two. Later rounds are
+        scheduled with next_round() once the winners are known.
+
+        :param teams: the teams, best seed first, all the teams of the league if None
+        :return: tuple of the new competitions and the teams that got a bye
+        """
+        teams = list(self._league.teams if teams is None else teams)
+        size = 1
+        while size < len(teams):
+            size *= 2
+        byes = size - len(teams)
+        # seed 1 plays the last seed, seed 2 the second to last, and so on
+        playing = teams[byes:]
+        games = [(playing[i], playing[-1 - i]) for i in range(len(playing) // 2)]
+        return self._place(games), teams[:byes]
+
+    def next_round(self, winners):
+        """
+        Schedules the next round of a bracket, pairing the winners in order
+        (the first with the second, the third with the fourth, and so on).
+
+        :param winners: the teams still in the bracket, in bracket order
+        :return: list of the new competitions
+        """
+        winners = list(winners)
+        if len(winners) % 2:
+            raise ValueError("A bracket round needs an even number of teams")
+        return self._place([(winners[i], winners[i + 1]) for i in range(0, len(winners), 2)])
+
+    def _place(self, games):
+        """
+        Puts games in the time slots, in order, each in the first slot where
+        both teams and a venue are free, and makes the competitions.
+
+        :param games: list of (home team, away team) pairs
+        :return: list of the new competitions, in date order
+        """
+        duration = self._duration
+        pending = deque(games)
+        team_count = len({team.oid for game in games for team in game})
+        competitions = []
+        # looked up once, since this loop runs for every game of the season
+        team_busy, team_book = self._teams.overlaps, self._teams.add
+        location_busy, location_book = self._locations.overlaps, self._locations.add
+        next_oid = self._oids.next_oid
+        for slot in self._slots:
+            if not pending:
+                break
+            end = slot + duration
+            venues = [venue for venue in self._venues if not location_busy(venue, slot, end)]
+            # games that cannot be played in this slot keep their place in the queue
+            skipped = []
+            checked = 0
+            limit = len(pending)
+            playing = 0
+            # stop once every venue is used, every game was tried, or too few teams are left to make a game
+            while venues and checked < limit and playing < team_count - 1:
+                home, away = game = pending.popleft()
+                checked += 1
+                home_oid, away_oid = home.oid, away.oid
+                if team_busy(home_oid, slot, end) or team_busy(away_oid, slot, end):
+                    skipped.append(game)
+                    continue
+                venue = venues.pop()
+                playing += 2
+                competitions.append(Competition(next_oid(), [home, away], venue, slot))
+                team_book(home_oid, slot, end)
+                team_book(away_oid, slot, end)
+                location_book(venue, slot, end)
+            pending.extendleft(reversed(skipped))
+        if pending:
+            raise ValueError(f"Not enough time slots: {len(pending)} games could not be scheduled")
+        return competitions
+
+    def _book(self, teams, location, start):
+        """
+        Marks the teams and location of a competition as busy.
+
+        :param teams: the teams competing
+        :param location: the location, or None
+        :param start: the date and time of the competition
+        :return: none
+        """
+        end = start + self._duration
+        for team in teams:
+            self._teams.add(team.oid, start, end)
+        if location is not None:
+            self._locations.add(location, start, end)
+
+
+def round_robin_pairs(teams):
+    """
+    Returns the rounds of a round robin with the circle method: the first
+    team stays in place and the others turn around it, so every team plays
+    once per round and every pair of teams plays once. With an odd number
+    of teams, one team sits out each round.
+
+    :param teams: the teams
+    :return: list of rounds, each a list of (home, away) pairs
+    """
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)
+    count = len(teams)
+    rounds = []
+    for round_number in range(count - 1):
+        pairs = []
+        for i in range(count // 2):
+            home, away = teams[i], teams[count - 1 - i]
+            if home is not None and away is not None:
+                # switch home and away every other round so no team is always at home
+                pairs.append((away, home) if round_number % 2 and i == 0 else (home, away))
+        rounds.append(pairs)
+        teams.insert(1, teams.pop())
+    return rounds
+
+
+def find_conflicts(competitions, duration=DEFAULT_DURATION):
+    """
+    Finds the competitions that double book a team or a location. The
+    competitions of each team and location are sorted by start and swept
+    once, so this costs O(n log n) instead of comparing every pair.
+
+    :param competitions: the competitions to check
+    :param duration: how long a competition lasts
+    :return: list of (team or location, competition, competition) tuples,
+        one for each competition that starts before an earlier one ends
+    """
+    by_key = {}
+    for competition in competitions:
+        if competition.date_time is None:
+            continue
+        for team in competition.teams_competing:
+            by_key.setdefault(("team", team.oid), []).append(competition)
+        if competition.location is not None:
+            by_key.setdefault(("location", competition.location), []).append(competition)
+
+    conflicts = []
+    for (kind, key), booked in by_key.items():
+        booked.sort(key=lambda competition: (competition.date_time, competition.oid))
+        # the competition that ends last among the ones already swept
+        latest = booked[0]
+        for competition in booked[1:]:
+            if competition.date_time < latest.date_time + duration:
+                what = next(team for team in competition.teams_competing if team.oid == key) if kind == "team" else key
+                conflicts.append((what, latest, competition))
+            if competition.date_time > latest.date_time:
+                latest = competition
+    return conflicts
@@ -0,0 +1,285 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+
+from module06.league_model.competition import Competition
+from module06.league_model.file_utils import replace_file
+from module06.league_model.league import League
+from module06.league_model.team import Team
+from module06.league_model.team_member import TeamMember
+
+# every manifest file starts with this line, followed by a pickle
+MANIFEST_HEADER = b"LEAGUE SHARDS 1\n"
+
+
+def is_manifest_file(file_name):
+    """
+    Checks the first bytes of a file to see if it is a shard manifest.
+
+    :param file_name: the file to check
+    :return: True if the file exists and is a shard manifest
+    """
+    try:
+        with open(file_name, mode="rb") as file:
+            return file.read(len(MANIFEST_HEADER)) == MANIFEST_HEADER
+    except OSError:
+        return False
+
+
+class ShardedLeagueStorage:
+    """
+    This class stores a LeagueDatabase as a small manifest file plus one
+    shard file per league.
+
+    The manifest (the file the user opens, normally ending in .shards) holds
+    the last oid and the oid, name and shard file of every league. The
+    shards hold the teams, members and competitions of single leagues as
+    pickled plain values, and are kept in the <manifest>.d folder.
+    Loading a database only reads the manifest; a league's shard is read the
+    first time the league's teams or competitions are used.
+
+    To keep memory use bounded, loaded leagues are counted by their number of
+    team members. When the total passes max_resident_members, the leagues
+    that were loaded first are dropped from memory again. A dropped league
+    that was changed is kept as pickled bytes until the next save, so no
+    change is lost; an unchanged one is simply read from its shard again.
+    Objects taken out of a league (such as a Team) should not be held on to
+    across loading other leagues, since they may belong to a dropped league.
+
+    Shard files are named after the league oid and a hash of their contents
+    and are never overwritten. A save writes the changed shards under new
+    names, then replaces the manifest, then deletes the shards that are no
+    longer listed, so a crash during a save leaves the previous database intact.
+    """
+
+    def __init__(self, file_name, max_resident_members=200_000):
+        """
+        Constructor for the sharded storage.
+
+        :param file_name: name of the manifest file
+        :param max_resident_members: number of team members to keep in memory before dropping leagues
+        """
+        self._file_name = file_name
+        self._shard_folder = file_name + ".d"
+        self._max_resident_members = max_resident_members
+        # league oid -> shard file name as listed in the manifest
+        self._shards = {}
+        # league oid -> hash of the league as last read or written
+        self._digests = {}
+        # league oid -> pickled league dropped from memory with unsaved changes
+        self._dirty = {}
+        # league oid -> (league, number of members) in the order they were loaded
+        self._resident = OrderedDict()
+        self._resident_members = 0
+
+    @property
+    def file_name(self):
+        """
+        Getter method for the name of the manifest file.
+
+        :return: the file name
+        """
+        return self._file_name
+
+    @property
+    def resident_members(self):
+        """
+        Getter method for the number of team members currently in memory.
+
+        :return: the number of members in loaded leagues
+        """
+        return self._resident_members
+
+    def handles(self, file_name):
+        """
+        Checks if this storage object writes to the provided file.
+
+        :param file_name: name of a database file
+        :return: True if the file is the manifest of this storage
+        """
+        return os.path.abspath(file_name) == os.path.abspath(self._file_name)
+
+    def close(self):
+        """
+        Nothing is kept open between reads, so there is nothing to close.
+
+        :return: none
+        """
+
+    def load(self, database):
+        """
+        Reads the manifest into the provided database. Each league is created
+        with only its oid and name and is loaded when first used.
+
+        :param database: an empty LeagueDatabase object
+        :return: the database
+        """
+        with open(self._file_name, mode="rb") as file:
+            file.read(len(MANIFEST_HEADER))
+            manifest = pickle.load(file)
+        database.last_oid = manifest["last_oid"]
+        leagues = []
+        for oid, name, shard in manifest["leagues"]:
+            league = League._stub(oid, name, self)
+            self._shards[oid] = shard
+            leagues.append(league)
+        database._restore_leagues(leagues)
+        database._storage = self
+        return database
+
+    def load_league_contents(self, league):
+        """
+        Reads one league from its shard, or from memory if it was dropped with
+        unsaved changes. This is called by League.__getattr__ the first time
+        the league is used. Older leagues are then dropped if the memory cap
+        is passed.
+
+        :param league: the league to load
+        :return: none
+        """
+        data = self._dirty.pop(league.oid, None)
+        if data is None:
+            with open(os.path.join(self._shard_folder, self._shards[league.oid]), mode="rb") as file:
+                data = file.read()
+            self._digests[league.oid] = hashlib.sha1(data).hexdigest()
+        league._restore(*_read_shard_data(data))
+
+        size = _member_count(league)
+        self._resident[league.oid] = (league, size)
+        self._resident_members += size
+        while self._resident_members > self._max_resident_members and len(self._resident) > 1:
+            self._evict(next(iter(self._resident)))
+
+    def save(self, database):
+        """
+        Writes the shards of the leagues that changed, then the manifest.
+        Leagues that were never loaded are not read or rewritten.
+
+        :param database: the LeagueDatabase object to save
+        :return: none
+        """
+        os.makedirs(self._shard_folder, exist_ok=True)
+        entries = []
+        shards = {}
+        for league in database.leagues:
+            shard = self._shards.get(league.oid)
+            if league.oid in self._dirty and not league._is_loaded():
+                shard = self._write_shard(league.oid, self._dirty.pop(league.oid), shard)
+            elif league._is_loaded() or league._loader is not self:
+                # loaded leagues, and leagues still waiting to be loaded from another storage
+                shard = self._write_shard(league.oid, _shard_data(league), shard)
+            shards[league.oid] = shard
+            entries.append((league.oid, league.name, shard))
+
+        manifest = {"last_oid": database.last_oid, "leagues": entries}
+        replace_file(self._file_name, MANIFEST_HEADER + pickle.dumps(manifest))
+
+        # forget leagues that were removed or replaced by an edited copy
+        current = {league.oid: league for league in database.leagues}
+        for oid, (league, size) in list(self._resident.items()):
+            if current.get(oid) is not league:
+                del self._resident[oid]
+                self._resident_members -= size
+        self._shards = shards
+        self._digests = {oid: digest for oid, digest in self._digests.items() if oid in shards}
+        self._dirty = {oid: data for oid, data in self._dirty.items()
+                       if oid in shards and not current[oid]._is_loaded()}
+        listed = set(shards.values())
+        for name in os.listdir(self._shard_folder):
+            if name not in listed:
+                os.remove(os.path.join(self._shard_folder, name))
+        print(f"Database saved to {self._file_name}")
+
+    def _write_shard(self, oid, data, shard):
+        """
+        Writes the pickled league to a new shard file if it differs from the
+        shard last read or written for that league.
+
+        :param oid: the league oid
+        :param data: the pickled league
+        :param shard: name of the current shard file, or None for a new league
+        :return: name of the shard file holding the data
+        """
+        digest = hashlib.sha1(data).hexdigest()
+        if shard is not None and self._digests.get(oid) == digest:
+            return shard
+        shard = f"league_{oid}_{digest[:16]}.pickle"
+        replace_file(os.path.join(self._shard_folder, shard), data)
+        self._digests[oid] = digest
+        return shard
+
+    def _evict(self, oid):
+        """
+        Drops a loaded league from memory. If it changed since it was read,
+        its pickled bytes are kept so the changes are saved later.
+
+        :param oid: oid of the league to drop
+        :return: none
+        """
+        league, size = self._resident.pop(oid)
+        self._resident_members -= size
+        data = _shard_data(league)
+        if hashlib.sha1(data).hexdigest() != self._digests.get(oid):
+            self._dirty[oid] = data
+        league._unload(self)
+
+
+def _shard_data(league):
+    """
+    Pickles the contents of a league for its shard. Only plain values are
+    stored, in list order, so the same league always gives the same bytes
+    and its hash shows whether it changed. The name is kept in the manifest,
+    so renaming a league does not rewrite its shard.
+
+    :param league: the league to pickle
+    :return: the pickled teams and competitions
+    """
+    teams = [(team.oid, team.name, list(team.member_values()))
+             for team in league.teams]
+    competitions = [(competition.oid, [team.oid for team in competition.teams_competing],
+                     competition.location, competition.date_time, competition.result)
+                    for competition in league.competitions]
+    return pickle.dumps((teams, competitions))
+
+
+def _read_shard_data(data):
+    """
+    Rebuilds the teams and competitions pickled by _shard_data(). A member
+    on several teams becomes one shared TeamMember object.
+
+    :param data: the pickled teams and competitions
+    :return: tuple of the list of teams and the list of competitions
+    """
+    team_rows, competition_rows = pickle.loads(data)
+    members = {}
+    teams = {}
+    for oid, name, member_rows in team_rows:
+        team = Team(oid, name)
+        for member_oid, member_name, email in member_rows:
+            if member_oid not in members:
+                members[member_oid] = TeamMember(member_oid, member_name, email)
+            team.add_member(members[member_oid])
+        teams[oid] = team
+    # shards written before results were kept have no result in their rows
+    competitions = [Competition(row[0], [teams[team_oid] for team_oid in row[1]], row[2], row[3],
+                                row[4] if len(row) > 4 else None)
+                    for row in competition_rows]
+    return list(teams.values()), competitions
+
+
+def _member_count(league):
+    """
+    Counts the team members of a league, used as an estimate of its memory use.
+
+    :param league: a loaded league
+    :return: total number of members over all teams
+    """
+    return sum(len(team.members) for team in league.teams)
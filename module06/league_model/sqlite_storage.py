@@ -0,0 +1,596 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+from module06.league_model import codec
+from module06.league_model.competition import Competition
+from module06.league_model.events import model_events
+from module06.league_model.league import League
+from module06.league_model.team import Team
+from module06.league_model.team_member import TeamMember
+
+# every SQLite database file starts with this header
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value
+);
+CREATE TABLE IF NOT EXISTS leagues (
+    oid INTEGER PRIMARY KEY,
+    name TEXT
+);
+CREATE TABLE IF NOT EXISTS teams (
+    league_oid INTEGER,
+    oid INTEGER,
+    name TEXT,
+    PRIMARY KEY (league_oid, oid)
+);
+CREATE TABLE IF NOT EXISTS members (
+    league_oid INTEGER,
+    oid INTEGER,
+    name TEXT,
+    email TEXT,
+    PRIMARY KEY (league_oid, oid)
+);
+CREATE TABLE IF NOT EXISTS team_members (
+    league_oid INTEGER,
+    team_oid INTEGER,
+    member_oid INTEGER,
+    PRIMARY KEY (league_oid, team_oid, member_oid)
+);
+CREATE TABLE IF NOT EXISTS competitions (
+    league_oid INTEGER,
+    oid INTEGER,
+    location TEXT,
+    date_time TEXT,
+    PRIMARY KEY (league_oid, oid)
+);
+CREATE TABLE IF NOT EXISTS competition_teams (
+    league_oid INTEGER,
+    competition_oid INTEGER,
+    team_oid INTEGER,
+    PRIMARY KEY (league_oid, competition_oid, team_oid)
+);
+CREATE TABLE IF NOT EXISTS competition_results (
+    league_oid INTEGER,
+    competition_oid INTEGER,
+    team_oid INTEGER,
+    score INTEGER,
+    PRIMARY KEY (league_oid, competition_oid, team_oid)
+);
+"""
+
+# columns that make up the primary key of each table holding league contents,
+# in the same order as the keys of the rows made by _league_rows()
+KEY_COLUMNS = {
+    "teams": ("league_oid", "oid"),
+    "members": ("league_oid", "oid"),
+    "team_members": ("league_oid", "team_oid", "member_oid"),
+    "competitions": ("league_oid", "oid"),
+    "competition_teams": ("league_oid", "competition_oid", "team_oid"),
+    "competition_results": ("league_oid", "competition_oid", "team_oid"),
+}
+
+VALUE_COLUMNS = {
+    "teams": ("name",),
+    "members": ("name", "email"),
+    "team_members": (),
+    "competitions": ("location", "date_time"),
+    "competition_teams": (),
+    "competition_results": ("score",),
+}
+
+
+def is_sqlite_file(file_name):
+    """
+    Checks the first bytes of a file to see if it is a SQLite database.
+
+    :param file_name: the file to check
+    :return: True if the file exists and is a SQLite database
+    """
+    try:
+        with open(file_name, mode="rb") as file:
+            return file.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+class SqliteLeagueStorage:
+    """
+    This class stores a LeagueDatabase in a SQLite file instead of a pickle.
+
+    Only the league names are read when the database is loaded. The teams,
+    members and competitions of a league are read the first time the league
+    is used. While the file is open, the storage follows the change events
+    of the database on model_events and keeps the rows each change touched
+    (see on_change()), so a save only writes those rows instead of going
+    through every league, and no copy of the rows is kept in memory. A
+    league that is added, replaced or restored is written in full. All the
+    writes of a save happen in one transaction, so a crash leaves the file
+    as it was before the save.
+
+    Rows are returned in the order they were first inserted, which keeps the
+    order of the teams, members and competitions lists.
+    """
+
+    def __init__(self, file_name):
+        """
+        Constructor that opens (or creates) the SQLite file.
+
+        :param file_name: name of the SQLite database file
+        """
+        self._file_name = file_name
+        self._connection = sqlite3.connect(file_name)
+        self._connection.executescript(SCHEMA)
+        # the database whose changes are followed, set by load() or the first save()
+        self._database = None
+        # (table, key) -> ("upsert", values), ("update", values) or ("delete", None) for the
+        # rows changed since the last save, in the order they were last changed
+        self._pending = {}
+        # oids of the leagues whose rows are all written again on the next save
+        self._rewrite = set()
+        # league oid -> league name as last stored in the file
+        self._stored_leagues = {}
+        # leagues handed out by load() whose contents have not been read yet
+        self._stubs = {}
+        # False until the rows in the file are known from a load() or save()
+        self._synced = False
+
+    @property
+    def file_name(self):
+        """
+        Getter method for the name of the SQLite file.
+
+        :return: the file name
+        """
+        return self._file_name
+
+    def handles(self, file_name):
+        """
+        Checks if this storage object writes to the provided file.
+
+        :param file_name: name of a database file
+        :return: True if the file is the one opened by this storage
+        """
+        return os.path.abspath(file_name) == os.path.abspath(self._file_name)
+
+    def close(self):
+        """
+        Stops following the changes of the database and closes the
+        connection to the SQLite file.
+
+        :return: none
+        """
+        model_events.unsubscribe(self.on_change)
+        self._connection.close()
+
+    def load(self, database):
+        """
+        Loads the league names and the last oid into the provided database.
+        Each league is created without its contents and is loaded through
+        load_league_contents() when first used.
+
+        :param database: an empty LeagueDatabase object
+        :return: the database
+        """
+        row = self._connection.execute("SELECT value FROM meta WHERE key = 'last_oid'").fetchone()
+        database.last_oid = row[0] if row else 0
+        leagues = []
+        for oid, name in self._connection.execute("SELECT oid, name FROM leagues ORDER BY rowid"):
+            league = League._stub(oid, name, self)
+            self._stubs[oid] = league
+            self._stored_leagues[oid] = name
+            leagues.append(league)
+        database._restore_leagues(leagues)
+        self._synced = True
+        database._storage = self
+        self._follow(database)
+        return database
+
+    def load_league_contents(self, league):
+        """
+        Reads the teams, members and competitions of one league from the file.
+        This is called by League.__getattr__ the first time the league is used.
+
+        :param league: the league to load
+        :return: none
+        """
+        self._stubs.pop(league.oid, None)
+        oid = league.oid
+        execute = self._connection.execute
+
+        members = {}
+        for member_oid, name, email in execute(
+                "SELECT oid, name, email FROM members WHERE league_oid = ? ORDER BY rowid", (oid,)):
+            members[member_oid] = TeamMember(member_oid, name, email)
+
+        teams = {}
+        for team_oid, name in execute(
+                "SELECT oid, name FROM teams WHERE league_oid = ? ORDER BY rowid", (oid,)):
+            teams[team_oid] = Team(team_oid, name)
+        for team_oid, member_oid in execute(
+                "SELECT team_oid, member_oid FROM team_members WHERE league_oid = ? ORDER BY rowid", (oid,)):
+            teams[team_oid].add_member(members[member_oid])
+
+        competitions = {}
+        for competition_oid, location, date_time in execute(
+                "SELECT oid, location, date_time FROM competitions WHERE league_oid = ? ORDER BY rowid", (oid,)):
+            when = datetime.fromisoformat(date_time) if date_time else None
+            competitions[competition_oid] = Competition(competition_oid, [], location, when)
+        for competition_oid, team_oid in execute(
+                "SELECT competition_oid, team_oid FROM competition_teams WHERE league_oid = ? ORDER BY rowid",
+                (oid,)):
+            competitions[competition_oid].teams_competing.append(teams[team_oid])
+        scores = {}
+        for competition_oid, team_oid, score in execute(
+                "SELECT competition_oid, team_oid, score FROM competition_results WHERE league_oid = ?", (oid,)):
+            scores.setdefault(competition_oid, {})[team_oid] = score
+        for competition_oid, team_scores in scores.items():
+            competition = competitions[competition_oid]
+            competition._result = tuple(team_scores[team.oid] for team in competition.teams_competing)
+
+        league._restore(teams.values(), competitions.values())
+
+    def save(self, database):
+        """
+        Writes the changes made to the database since it was loaded or last
+        saved: the league names, the leagues added, replaced or restored in
+        full, and the rows kept by on_change() for the other leagues. Leagues
+        that were never loaded cannot have changed, so they are not read.
+
+        If the file was not loaded through this object, whatever it held
+        before is replaced by the database.
+
+        :param database: the LeagueDatabase object to save
+        :return: none
+        """
+        with self._connection:
+            execute = self._connection.execute
+            if not self._synced:
+                for table in ("leagues", *KEY_COLUMNS):
+                    execute(f"DELETE FROM {table}")
+                self._pending.clear()
+                self._rewrite.update(league.oid for league in database.leagues)
+            execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_oid', ?)",
+                    (database.last_oid,))
+
+            current_oids = set()
+            for league in database.leagues:
+                current_oids.add(league.oid)
+                stored_name = self._stored_leagues.get(league.oid)
+                if league.oid not in self._stored_leagues:
+                    execute("INSERT INTO leagues (oid, name) VALUES (?, ?)", (league.oid, league.name))
+                elif stored_name != league.name:
+                    execute("UPDATE leagues SET name = ? WHERE oid = ?", (league.name, league.oid))
+                self._stored_leagues[league.oid] = league.name
+
+                if league.oid in self._rewrite and self._stubs.get(league.oid) is not league:
+                    for table in KEY_COLUMNS:
+                        execute(f"DELETE FROM {table} WHERE league_oid = ?", (league.oid,))
+                    for table, key, values in _league_rows(league):
+                        self._write_row(table, key, "upsert", values)
+
+            for oid in set(self._stored_leagues) - current_oids:
+                execute("DELETE FROM leagues WHERE oid = ?", (oid,))
+                for table in KEY_COLUMNS:
+                    execute(f"DELETE FROM {table} WHERE league_oid = ?", (oid,))
+                del self._stored_leagues[oid]
+                self._stubs.pop(oid, None)
+
+            for (table, key), (kind, values) in self._pending.items():
+                # rows of leagues written in full or removed are already up to date
+                if key[0] in current_oids and key[0] not in self._rewrite:
+                    self._write_row(table, key, kind, values)
+        self._synced = True
+        self._pending.clear()
+        self._rewrite.clear()
+        self._follow(database)
+        print(f"Database saved to {self._file_name}")
+
+    def on_change(self, event):
+        """
+        Called by model_events for every change. The rows touched by a
+        change to the database are kept until the next save, with the values
+        they have after the change, so the work done is the same however big
+        the league is. Changes to a league, team, member or competition that
+        is not in the database (such as the objects of an edit session) are
+        ignored.
+
+        :param event: the ChangeEvent
+        :return: none
+        """
+        obj, operation, args = event.source, event.operation, event.args
+        database = self._database
+        if obj is database:
+            if operation == "add_league":
+                self._rewrite.add(args[0].oid)
+            elif operation == "replace_league":
+                self._rewrite.add(args[1].oid)
+            elif operation == "restore":
+                self._rewrite.update(league.oid for league in args[0])
+            return
+
+        if isinstance(obj, League):
+            # league names are compared on save
+            if database not in obj._owners or obj.oid in self._rewrite:
+                return
+            if operation == "add_team":
+                self._team_added(obj.oid, args[0])
+            elif operation == "remove_team":
+                self._team_removed(obj, args[0])
+            elif operation == "replace_team":
+                self._team_removed(obj, args[0])
+                self._team_added(obj.oid, args[1])
+            elif operation == "add_competition":
+                self._competition_added(obj.oid, args[0])
+            elif operation == "remove_competition":
+                self._competition_removed(obj.oid, args[0])
+        elif isinstance(obj, Team):
+            for league in self._leagues_of(obj):
+                if operation == "rename":
+                    self._change("teams", (league.oid, obj.oid), "update", (obj.name,))
+                elif operation == "add_member":
+                    self._member_added(league.oid, obj, args[0])
+                elif operation == "remove_member":
+                    self._member_removed(league, obj, args[0])
+        elif isinstance(obj, TeamMember):
+            # a member on several teams of a league has one row in members
+            leagues = {league.oid for team in obj._owners for league in self._leagues_of(team)}
+            for league_oid in leagues:
+                self._change("members", (league_oid, obj.oid), "update", (obj.name, obj.email))
+        elif isinstance(obj, Competition):
+            for league in self._leagues_of(obj):
+                if operation == "set_result":
+                    for team in obj.teams_competing:
+                        self._change("competition_results", (league.oid, obj.oid, team.oid), "delete")
+                    self._result_rows(league.oid, obj)
+                else:
+                    self._change("competitions", (league.oid, obj.oid), "update", _competition_values(obj))
+
+    def _follow(self, database):
+        """
+        Starts following the change events of a database, if it is not
+        followed already.
+
+        :param database: the LeagueDatabase
+        :return: none
+        """
+        if self._database is not database:
+            model_events.unsubscribe(self.on_change)
+            self._database = database
+            model_events.subscribe(self.on_change)
+
+    def _leagues_of(self, obj):
+        """
+        Returns the leagues of the database that a team or competition is in.
+
+        :param obj: the team or competition
+        :return: list of leagues
+        """
+        database = self._database
+        return [league for league in obj._owners
+                if isinstance(league, League) and database in league._owners and league.oid not in self._rewrite]
+
+    def _change(self, table, key, kind, values=None):
+        """
+        Keeps the change of one row for the next save. A row is written once
+        with its last values, in the order of its last change. An update of a
+        row that is not in the file yet stays an insert.
+
+        :param table: the table
+        :param key: the primary key of the row, starting with the league oid
+        :param kind: "upsert" to insert or replace the row, "update" to change its values, or "delete"
+        :param values: the values of the other columns, or None for a delete
+        :return: none
+        """
+        old = self._pending.pop((table, key), None)
+        if kind == "update" and old is not None and old[0] == "upsert":
+            kind = "upsert"
+        self._pending[(table, key)] = (kind, values)
+
+    def _team_added(self, league_oid, team):
+        """
+        Keeps the rows of a team added to a league, and of its members.
+
+        :param league_oid: oid of the league
+        :param team: the team
+        :return: none
+        """
+        self._change("teams", (league_oid, team.oid), "upsert", (team.name,))
+        for member_oid, name, email in team.member_values():
+            self._change("members", (league_oid, member_oid), "upsert", (name, email))
+            self._change("team_members", (league_oid, team.oid, member_oid), "upsert", ())
+
+    def _team_removed(self, league, team):
+        """
+        Keeps the deletes for a team removed from a league.
+
+        :param league: the league
+        :param team: the team
+        :return: none
+        """
+        self._change("teams", (league.oid, team.oid), "delete")
+        for member_oid, _, _ in team.member_values():
+            self._change("team_members", (league.oid, team.oid, member_oid), "delete")
+            if not league._teams_by_member.find_all(member_oid):
+                self._change("members", (league.oid, member_oid), "delete")
+
+    def _member_added(self, league_oid, team, member):
+        """
+        Keeps the rows of a member added to a team of a league.
+
+        :param league_oid: oid of the league
+        :param team: the team
+        :param member: the member
+        :return: none
+        """
+        self._change("members", (league_oid, member.oid), "upsert", (member.name, member.email))
+        self._change("team_members", (league_oid, team.oid, member.oid), "upsert", ())
+
+    def _member_removed(self, league, team, member):
+        """
+        Keeps the deletes for a member removed from a team of a league. The
+        member's row stays while it is on another team of the league.
+
+        :param league: the league
+        :param team: the team
+        :param member: the member
+        :return: none
+        """
+        self._change("team_members", (league.oid, team.oid, member.oid), "delete")
+        if not league.teams_for_member(member):
+            self._change("members", (league.oid, member.oid), "delete")
+
+    def _competition_added(self, league_oid, competition):
+        """
+        Keeps the rows of a competition added to a league.
+
+        :param league_oid: oid of the league
+        :param competition: the competition
+        :return: none
+        """
+        self._change("competitions", (league_oid, competition.oid), "upsert", _competition_values(competition))
+        for team in competition.teams_competing:
+            self._change("competition_teams", (league_oid, competition.oid, team.oid), "upsert", ())
+        self._result_rows(league_oid, competition)
+
+    def _competition_removed(self, league_oid, competition):
+        """
+        Keeps the deletes for a competition removed from a league.
+
+        :param league_oid: oid of the league
+        :param competition: the competition
+        :return: none
+        """
+        self._change("competitions", (league_oid, competition.oid), "delete")
+        for team in competition.teams_competing:
+            self._change("competition_teams", (league_oid, competition.oid, team.oid), "delete")
+            self._change("competition_results", (league_oid, competition.oid, team.oid), "delete")
+
+    def _result_rows(self, league_oid, competition):
+        """
+        Keeps the result rows of a competition, if it has a result.
+
+        :param league_oid: oid of the league
+        :param competition: the competition
+        :return: none
+        """
+        if competition.result is not None:
+            for team, score in zip(competition.teams_competing, competition.result):
+                self._change("competition_results", (league_oid, competition.oid, team.oid), "upsert", (score,))
+
+    def _write_row(self, table, key, kind, values):
+        """
+        Inserts, updates or deletes one row of the file.
+
+        :param table: the table
+        :param key: the primary key of the row
+        :param kind: "upsert", "update" or "delete"
+        :param values: the values of the other columns, or None for a delete
+        :return: none
+        """
+        keys = KEY_COLUMNS[table]
+        key_match = " AND ".join(f"{column} = ?" for column in keys)
+        if kind == "delete":
+            self._connection.execute(f"DELETE FROM {table} WHERE {key_match}", key)
+        elif kind == "update":
+            assignments = ", ".join(f"{column} = ?" for column in VALUE_COLUMNS[table])
+            self._connection.execute(f"UPDATE {table} SET {assignments} WHERE {key_match}", values + key)
+        else:
+            columns = keys + VALUE_COLUMNS[table]
+            placeholders = ", ".join("?" * len(columns))
+            self._connection.execute(f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                                     f"VALUES ({placeholders})", key + values)
+
+
+def _competition_values(competition):
+    """
+    Returns the values of the competitions row of a competition.
+
+    :param competition: the competition
+    :return: tuple of the location and the date and time as text
+    """
+    when = competition.date_time.isoformat() if competition.date_time else None
+    return competition.location, when
+
+
+def _league_rows(league):
+    """
+    Returns the rows of every table for the contents of one league, in the
+    order of the league lists. A member on several teams has one row in
+    members for each of them, which INSERT OR REPLACE writes once.
+
+    :param league: the league to convert
+    :return: iterator of (table, key, values) tuples
+    """
+    oid = league.oid
+    for team in league.teams:
+        yield "teams", (oid, team.oid), (team.name,)
+        for member_oid, name, email in team.member_values():
+            yield "members", (oid, member_oid), (name, email)
+            yield "team_members", (oid, team.oid, member_oid), ()
+    for competition in league.competitions:
+        yield "competitions", (oid, competition.oid), _competition_values(competition)
+        for team in competition.teams_competing:
+            yield "competition_teams", (oid, competition.oid, team.oid), ()
+        if competition.result is not None:
+            for team, score in zip(competition.teams_competing, competition.result):
+                yield "competition_results", (oid, competition.oid, team.oid), (score,)
+
+
+def convert_pickle_database(pickle_file, sqlite_file):
+    """
+    Converts a .db database file written by LeagueDatabase.save(), either
+    with pickle or with the codec, into a SQLite database file.
+
+    :param pickle_file: name of the existing .db database file
+    :param sqlite_file: name of the SQLite file to create
+    :return: none
+    """
+    # imported here since league_database imports this module
+    from module06.league_model.league_database import LeagueDatabase
+
+    if os.path.exists(sqlite_file):
+        raise FileExistsError(sqlite_file)
+    database = codec.load_file(pickle_file, LeagueDatabase())
+    storage = SqliteLeagueStorage(sqlite_file)
+    storage.save(database)
+    storage.close()
+
+
+def main():
+    """
+    Converts the .db database files named on the command line, for example
+
+    python -m module06.league_model.sqlite_storage data/league.db data/league2.db
+
+    Each file is written next to the original with a .sqlite extension. With
+    no arguments, every .db file in league_model/data is converted.
+
+    :return: none
+    """
+    file_names = sys.argv[1:]
+    if not file_names:
+        data_folder = os.path.join(os.path.dirname(__file__), "data")
+        file_names = [os.path.join(data_folder, name) for name in sorted(os.listdir(data_folder))
+                      if name.endswith(".db")]
+    for file_name in file_names:
+        sqlite_file = os.path.splitext(file_name)[0] + ".sqlite"
+        try:
+            convert_pickle_database(file_name, sqlite_file)
+        except FileExistsError:
+            print(f"Skipping {file_name}, {sqlite_file} already exists")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+# points given for each game won, drawn and lost
+WIN_POINTS = 3
+DRAW_POINTS = 1
+LOSS_POINTS = 0
+
+
+class TeamRecord:
+    """
+    This class holds the totals of one team in the standings.
+    """
+
+    __slots__ = ("team", "played", "wins", "draws", "losses", "scored", "conceded", "points")
+
+    def __init__(self, team):
+        """
+        Constructor for the record.
+
+        :param team: the team
+        """
+        self.team = team
+        self.played = 0
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        # total score for and against the team
+        self.scored = 0
+        self.conceded = 0
+        self.points = 0
+
+    @property
+    def difference(self):
+        """
+        Getter method for the score difference.
+
+        :return: the score for minus the score against
+        """
+        return self.scored - self.conceded
+
+    def __str__(self):
+        """
+        Returns a string value of the object.
+
+        :return: string value of the object
+        """
+        return (f"{self.team.name}: {self.wins}-{self.draws}-{self.losses}, "
+                f"{self.points} points ({self.difference:+d})")
+
+
+class Standings:
+    """
+    This class is the standings table of a league, built from the results
+    recorded on its competitions (see Competition.result).
+
+    The totals of each team, and of each pair of teams for the head-to-head
+    tiebreaker, are updated when a result is added, corrected or cleared:
+    the old result is taken off and the new one added, so nothing is
+    recounted from the competition list. In a competition with more than two
+    teams, each pair of teams is counted as a game between them.
+
+    The sorted table is kept until something changes, so reading the
+    standings again is free. It is sorted by points, then head-to-head
+    points between the teams tied on points, then score difference, then
+    score for, then name.
+
+    League builds its standings the first time they are used (see
+    League.standings) and keeps them up to date after that.
+    """
+
+    __slots__ = ("_league", "_records", "_head_to_head", "_table")
+
+    def __init__(self, league):
+        """
+        Constructor for the standings. The results already recorded in the
+        league are added.
+
+        :param league: the league
+        """
+        self._league = league
+        # team oid -> TeamRecord, for teams with at least one result
+        self._records = {}
+        # (team oid, opponent oid) -> points the team took from games against the opponent
+        self._head_to_head = {}
+        # the sorted table, or None when it has to be sorted again
+        self._table = None
+        for competition in league.competitions:
+            if competition.result is not None:
+                self._count(competition.teams_competing, competition.result, 1)
+
+    def table(self):
+        """
+        Returns the standings, best team first. Every team of the league is
+        included, with an empty record if it has no results yet.
+
+        :return: list of TeamRecords
+        """
+        if self._table is None:
+            self._table = self._sort()
+        return self._table
+
+    def record_for(self, team):
+        """
+        Returns the totals of a team.
+
+        :param team: the team
+        :return: the TeamRecord, empty if the team has no results
+        """
+        record = self._records.get(team.oid)
+        return record if record is not None else TeamRecord(team)
+
+    def position(self, team):
+        """
+        Returns the place of a team in the standings.
+
+        :param team: the team
+        :return: the place, starting at 1, or None if the team is not in the league
+        """
+        for place, record in enumerate(self.table(), 1):
+            if record.team.oid == team.oid:
+                return place
+        return None
+
+    def head_to_head(self, team, opponent):
+        """
+        Returns the points a team took from its games against another team.
+
+        :param team: the team
+        :param opponent: the other team
+        :return: the points
+        """
+        return self._head_to_head.get((team.oid, opponent.oid), 0)
+
+    def result_changed(self, competition, old_result, new_result):
+        """
+        Updates the totals after the result of a competition was recorded,
+        corrected or cleared.
+
+        :param competition: the competition
+        :param old_result: the result before the change, or None
+        :param new_result: the result after the change, or None
+        :return: none
+        """
+        if old_result is not None:
+            self._count(competition.teams_competing, old_result, -1)
+        if new_result is not None:
+            self._count(competition.teams_competing, new_result, 1)
+
+    def teams_changed(self):
+        """
+        Called by the league when a team is added, removed or renamed, so
+        the table is sorted again the next time it is read.
+
+        :return: none
+        """
+        self._table = None
+
+    def _count(self, teams, result, sign):
+        """
+        Adds a result to the totals, or takes it off.
+
+        :param teams: the teams of the competition
+        :param result: the score of each team
+        :param sign: 1 to add the result, -1 to take it off
+        :return: none
+        """
+        records = self._records
+        head_to_head = self._head_to_head
+        for i, team in enumerate(teams):
+            record = records.get(team.oid)
+            if record is None:
+                record = records[team.oid] = TeamRecord(team)
+            for j, opponent in enumerate(teams):
+                if i == j:
+                    continue
+                score, other = result[i], result[j]
+                record.played += sign
+                record.scored += sign * score
+                record.conceded += sign * other
+                if score > other:
+                    record.wins += sign
+                    points = WIN_POINTS
+                elif score == other:
+                    record.draws += sign
+                    points = DRAW_POINTS
+                else:
+                    record.losses += sign
+                    points = LOSS_POINTS
+                record.points += sign * points
+                key = (team.oid, opponent.oid)
+                head_to_head[key] = head_to_head.get(key, 0) + sign * points
+            if record.played == 0:
+                del records[team.oid]
+        self._table = None
+
+    def _sort(self):
+        """
+        Sorts the teams of the league into the standings.
+
+        :return: list of TeamRecords, best first
+        """
+        table = []
+        for team in self._league.teams:
+            record = self._records.get(team.oid)
+            if record is None:
+                record = TeamRecord(team)
+            else:
+                # the team may have been replaced by an edited copy since its first result
+                record.team = team
+            table.append(record)
+        table.sort(key=lambda record: -record.points)
+        # teams tied on points are ordered by the points they took from each other
+        start = 0
+        while start < len(table):
+            end = start + 1
+            while end < len(table) and table[end].points == table[start].points:
+                end += 1
+            tied = table[start:end]
+            if len(tied) > 1:
+                oids = [record.team.oid for record in tied]
+                between = {oid: sum(self._head_to_head.get((oid, other), 0) for other in oids if other != oid)
+                           for oid in oids}
+                tied.sort(key=lambda record: (-between[record.team.oid], -record.difference, -record.scored,
+                                              record.team.name))
+                table[start:end] = tied
+            start = end
+        return table
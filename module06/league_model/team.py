@@ -5,8 +5,76 @@
 # Author: Alan Cruce
 # Date: April 28, 2025
 
-from module06.league_model.exceptions import DuplicateOid, DuplicateEmail
+from collections.abc import Sequence
+
+from module06.league_model.exceptions import BatchError, DuplicateOid, DuplicateEmail
 from module06.league_model.identified_object import IdentifiedObject
+from module06.league_model.name_index import NameIndex
+from module06.league_model.position_index import PositionIndex
+
+
+class MemberView(Sequence):
+    """
+    This class is the read-only sequence returned by Team.members. It reads
+    the team's member dictionary directly, so it always shows the current
+    members without copying them. Members are added and removed with
+    Team.add_member() and Team.remove_member().
+    """
+
+    __slots__ = ("_team",)
+
+    def __init__(self, team):
+        """
+        Constructor for the view.
+
+        :param team: the team
+        """
+        self._team = team
+
+    def __len__(self):
+        """
+        Returns the number of members.
+
+        :return: the number of members
+        """
+        return len(self._team._members)
+
+    def __getitem__(self, index):
+        """
+        Returns the member at a position, or a list for a slice.
+
+        :param index: the position or slice
+        :return: the member, or a list of members
+        """
+        members = self._team._member_list()
+        if isinstance(index, slice):
+            return list(members[index])
+        return members[index]
+
+    def __iter__(self):
+        """
+        Returns an iterator over the members in the order they were added.
+
+        :return: the iterator
+        """
+        return iter(self._team._members.values())
+
+    def __contains__(self, member):
+        """
+        Checks if a member is on the team.
+
+        :param member: the member
+        :return: True if the member is on the team
+        """
+        return self._team._members.get(getattr(member, "oid", None)) == member
+
+    def __repr__(self):
+        """
+        Returns a string value of the view, shown like a list.
+
+        :return: string value of the view
+        """
+        return repr(list(self))
 
 
 class Team(IdentifiedObject):
@@ -14,22 +82,31 @@ class Team(IdentifiedObject):
     The class for the Team object
     """
 
+    __slots__ = ("_name", "_members", "_members_by_name", "_members_by_email", "_members_list", "_positions")
+
     def __init__(self, oid, name):
         """
         The constructor for the Team object.
 
-        For module04, sets for oid and email were added
-        to help ensure duplicates aren't allowed when
-        team members are added.
+        The members are kept in a dictionary by oid, which keeps the order
+        they were added in, so adding, removing and finding a member takes
+        the same time however big the team is. They are also indexed by name
+        and by lowercase email, so member_named() and member_with_email() do
+        not search the team. The indexes are kept up to date when a member's
+        name or email changes.
 
         :param oid: id for the team object
         :param name: name of the team
         """
         super().__init__(oid)
         self._name = name
-        self._members = []
-        self._members_oids = set()
-        self._members_emails = set()
+        self._members = {}
+        self._members_by_name = NameIndex()
+        self._members_by_email = {}
+        # list of the members for MemberView indexing, made when first needed
+        self._members_list = None
+        # PositionIndex of the members, made by the first removal in a transaction
+        self._positions = None
 
     @property
     def name(self):
@@ -48,16 +125,19 @@ class Team(IdentifiedObject):
         :param value: value to set for the team name
         :return: none
         """
+        old_name = self._name
         self._name = value
+        self._reindex("name", old_name, value)
+        self._notify("rename", value, old_name)
 
     @property
     def members(self):
         """
-        Getter method for team members list
+        Getter method for team members
 
-        :return: list of team members
+        :return: read-only sequence of the team members
         """
-        return self._members
+        return MemberView(self)
 
     @members.setter
     def members(self, value):
@@ -67,7 +147,18 @@ class Team(IdentifiedObject):
         :param value: A list of team members to set
         :return: none
         """
-        self._members = value
+        self._restore(value)
+
+    def member_values(self):
+        """
+        Returns the oid, name and email of each member. Code that only reads
+        the members, such as saving or exporting, uses this so that teams
+        that keep their members in a MemberTable do not have to create
+        TeamMember objects.
+
+        :return: iterator of (oid, name, email) tuples
+        """
+        return ((member.oid, member.name, member.email) for member in self._members.values())
 
     def add_member(self, member):
         """
@@ -80,18 +171,29 @@ class Team(IdentifiedObject):
         :param member: member to add to the team
         :return: none
         """
-        lowercase_email = member.email.lower()
-        if member.oid in self._members_oids:
+        if member.oid in self._members:
             raise DuplicateOid(member.oid)
-        if lowercase_email in self._members_emails:
+        email_key = _email_key(member.email) if member.email is not None else None
+        if email_key is not None and email_key in self._members_by_email:
             raise DuplicateEmail(member.email)
-        if member not in self._members:
-            self._members.append(member)
-            self._members_oids.add(member.oid)
-            self._members_emails.add(lowercase_email)
-
+        self._insert_member(len(self._members), member)
 
+    def add_members(self, members):
+        """
+        Adds several members to the team. The whole batch is checked for
+        duplicate oids and emails first, against the team and against the
+        other members of the batch, and either every member is added or none
+        is and a BatchError with every problem found is raised.
 
+        :param members: the members to add, in order
+        :return: none
+        """
+        members = list(members)
+        errors = _check_new_members(members, *self._member_keys())
+        if errors:
+            raise BatchError(errors)
+        for member in members:
+            self._insert_member(len(self._members), member)
 
     def member_named(self, s):
         """
@@ -100,25 +202,201 @@ class Team(IdentifiedObject):
         :param s: name of the member to return if it exists
         :return: the member object
         """
-        for member in self._members:
-            if member.name == s:
-                return member
-        return None
+        return self._members_by_name.find(s)
+
+    def member_with_oid(self, oid):
+        """
+        Returns the member with the provided oid.
+
+        :param oid: oid of the member to return if it exists
+        :return: the member object, or None
+        """
+        return self._members.get(oid)
+
+    def member_with_email(self, email):
+        """
+        Returns the member with the provided email. Case is ignored.
+
+        :param email: email of the member to return if it exists
+        :return: the member object, or None
+        """
+        if email is None:
+            return None
+        return self._members_by_email.get(_email_key(email))
 
     def remove_member(self, member):
         """
-        Removes a member from the team list
+        Removes a member from the team
 
         Module04 added functionality to also have a removed member
         also removed from the _member_oids and _member_emails sets.
 
-        :param member: member to remove from the team list
+        :param member: member to remove from the team
+        :return: none
+        """
+        if member.oid in self._members:
+            index = self._removed_position(member.oid)
+            member = self._members.pop(member.oid)
+            self._members_list = None
+            self._members_by_name.remove(member.name, member)
+            if member.email is not None:
+                email_key = _email_key(member.email)
+                if self._members_by_email.get(email_key) is member:
+                    del self._members_by_email[email_key]
+            member._remove_owner(self)
+            for league in self._owners:
+                league._member_removed(self, member)
+            self._notify("remove_member", member, index)
+
+    def _insert_member(self, index, member):
+        """
+        Puts a member in the team at a position, without the checks of
+        add_member(). This is also used to undo the removal of a member.
+        Putting a member anywhere but the end rebuilds the member dictionary.
+
+        :param index: the position, or None for the end
+        :param member: the member
+        :return: none
+        """
+        if index is None or index >= len(self._members):
+            self._members[member.oid] = member
+            if self._positions is not None:
+                self._positions.append(member.oid)
+        else:
+            items = list(self._members.items())
+            items.insert(index, (member.oid, member))
+            self._members = dict(items)
+            self._positions = None
+        self._members_list = None
+        self._members_by_name.add(member.name, member)
+        if member.email is not None:
+            self._members_by_email[_email_key(member.email)] = member
+        member._add_owner(self)
+        for league in self._owners:
+            league._member_added(self, member)
+        self._notify("add_member", member, index)
+
+    def _member_keys(self):
+        """
+        Returns the oids and lowercase emails of the members, for checking a batch of new members.
+
+        :return: tuple of two containers that support the in operator
+        """
+        return self._members, self._members_by_email
+
+    def _removed_position(self, oid):
+        """
+        Returns the position of a member that is being removed, which is only
+        needed to undo the removal in a transaction. The positions are kept
+        in a PositionIndex made by the first removal recorded, so a removal
+        does not search the members. The index is dropped by a removal that
+        is not recorded, so it is only kept while transactions use it.
+
+        :param oid: oid of the member
+        :return: the position, or None if no transaction is recording the team
+        """
+        if not self._is_recorded():
+            self._positions = None
+            return None
+        if self._positions is None:
+            self._positions = PositionIndex(self._members)
+        return self._positions.remove(oid)
+
+    def _is_recorded(self):
+        """
+        Checks if a transaction is recording the changes of one of the
+        leagues of the team.
+
+        :return: True if a league of the team has an open transaction
+        """
+        return any(league._recorder is not None for league in self._owners)
+
+    def _restore(self, members):
+        """
+        Replaces the members of the team in one step. This is used when a team
+        is read back from disk, so the members are not re-checked one at a time.
+
+        :param members: list of team members
+        :return: none
+        """
+        old_members = getattr(self, "_members", {})
+        for member in old_members.values() if isinstance(old_members, dict) else old_members:
+            member._remove_owner(self)
+            for league in self._owners:
+                league._member_removed(self, member)
+        self._members = {member.oid: member for member in members}
+        self._members_list = None
+        self._positions = None
+        self._members_by_name = NameIndex((member.name, member) for member in self._members.values())
+        self._members_by_email = {_email_key(member.email): member for member in self._members.values()
+                                  if member.email is not None}
+        for member in self._members.values():
+            member._add_owner(self)
+            for league in self._owners:
+                league._member_added(self, member)
+
+    def _index_changed(self, member, attribute, old_value, new_value):
+        """
+        Called by a member of the team when its name or email changes, so the
+        indexes can be updated.
+
+        :param member: the team member that changed
+        :param attribute: "name" or "email"
+        :param old_value: the value before the change
+        :param new_value: the value after the change
         :return: none
         """
-        if member in self._members:
-            self._members.remove(member)
-            self._members_oids.remove(member.oid)
-            self._members_emails.remove(member.email)
+        if attribute == "name":
+            self._members_by_name.remove(old_value, member)
+            self._members_by_name.add(new_value, member)
+        elif attribute == "email":
+            if old_value is not None and self._members_by_email.get(_email_key(old_value)) is member:
+                del self._members_by_email[_email_key(old_value)]
+            if new_value is not None:
+                self._members_by_email[_email_key(new_value)] = member
+        for league in self._owners:
+            league._member_changed(self, member, attribute, old_value, new_value)
+
+    def _member_list(self):
+        """
+        Returns the members as a list, for MemberView indexing. The list is
+        kept until the members change, so reading the members by position in
+        a loop does not copy them each time.
+
+        :return: list of the members
+        """
+        if self._members_list is None:
+            self._members_list = list(self._members.values())
+        return self._members_list
+
+    def __getstate__(self):
+        """
+        Returns the state used by pickle and copy, without the member list
+        kept for MemberView and the member positions.
+
+        :return: dictionary of the team fields
+        """
+        state = super().__getstate__()
+        state.pop("_members_list", None)
+        state.pop("_positions", None)
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state used by pickle and copy. Teams pickled before the
+        indexes were added, or when the members were a list, get them built here.
+
+        :param state: dictionary of the team fields
+        :return: none
+        """
+        super().__setstate__(state)
+        self._members_list = None
+        self._positions = None
+        if "_members_by_name" in state and isinstance(self._members, dict):
+            for member in self._members.values():
+                member._add_owner(self)
+        else:
+            self._restore(self._members)
 
     def send_email(self, emailer, subject, message):
         """
@@ -127,10 +405,10 @@ class Team(IdentifiedObject):
         :param emailer: emailer object
         :param subject: subject of the email
         :param message: message of the email
-        :return: none
+        :return: the delivery status of each recipient, from the emailer
         """
-        email_recipients = [member.email for member in self._members if member.email is not None]
-        emailer.send_plain_email(email_recipients, subject, message)
+        email_recipients = [member.email for member in self._members.values() if member.email is not None]
+        return emailer.send_plain_email(email_recipients, subject, message)
 
     def __str__(self):
         """
@@ -139,3 +417,43 @@ class Team(IdentifiedObject):
         :return: string value of the object
         """
         return f"{self._name}: {len(self._members)} members"
+
+
+def _email_key(email):
+    """
+    Returns the lowercase email used as the key of the email index. Most
+    emails are already lowercase, and then the email itself is used so the
+    index does not hold a second copy of the string.
+
+    :param email: the email
+    :return: the lowercase email
+    """
+    lowercase_email = email.lower()
+    return email if lowercase_email == email else lowercase_email
+
+
+def _check_new_members(members, oids, email_keys):
+    """
+    Checks a batch of members to be added to a team, in one pass, for oids
+    and emails already on the team or used twice in the batch.
+
+    :param members: the members to add
+    :param oids: container of the oids on the team
+    :param email_keys: container of the lowercase emails on the team
+    :return: list of (member, exception) pairs, empty if the batch can be added
+    """
+    errors = []
+    batch_oids = set()
+    batch_emails = set()
+    for member in members:
+        if member.oid in oids or member.oid in batch_oids:
+            errors.append((member, DuplicateOid(member.oid)))
+            continue
+        batch_oids.add(member.oid)
+        if member.email is not None:
+            email_key = _email_key(member.email)
+            if email_key in email_keys or email_key in batch_emails:
+                errors.append((member, DuplicateEmail(member.email)))
+            else:
+                batch_emails.add(email_key)
+    return errors
@@ -5,6 +5,7 @@
 # Author: Alan Cruce
 # Date: April 28, 2025
 
+from module06.league_model.exceptions import DuplicateEmail
 from module06.league_model.identified_object import IdentifiedObject
 
 
@@ -13,6 +14,8 @@ class TeamMember(IdentifiedObject):
     Class for the TeamMember object
     """
 
+    __slots__ = ("_name", "_email")
+
     def __init__(self, oid, name, email):
         """
         Constructor for the TeamMember object.
@@ -42,7 +45,10 @@ class TeamMember(IdentifiedObject):
         :param value: name to set for the team member
         :return: none
         """
+        old_name = self._name
         self._name = value
+        self._reindex("name", old_name, value)
+        self._notify("rename", value, old_name)
 
     @property
     def email(self):
@@ -55,11 +61,23 @@ class TeamMember(IdentifiedObject):
     @email.setter
     def email(self, value):
         """
-        Setter for the email of the team member
+        Setter for the email of the team member. A DuplicateEmail is raised,
+        and nothing is changed, if another member of one of the member's teams
+        already has the email.
+
         :param value: value of the email for the team member
         :return: none
         """
+        for team in self._owners:
+            other = team.member_with_email(value) if value is not None else None
+            # compared by oid, since teams using a MemberTable return a new
+            # TeamMember object each time
+            if other is not None and other != self:
+                raise DuplicateEmail(value)
+        old_email = self._email
         self._email = value
+        self._reindex("email", old_email, value)
+        self._notify("set_email", value, old_email)
 
     def send_email(self, emailer, subject, message):
         """
@@ -68,9 +86,9 @@ class TeamMember(IdentifiedObject):
         :param emailer: emailer object
         :param subject: subject of the email
         :param message: message of the email
-        :return: none
+        :return: the delivery status of each recipient, from the emailer
         """
-        emailer.send_plain_email([self._email], subject, message)
+        return emailer.send_plain_email([self._email], subject, message)
 
     def __str__(self):
         """
@@ -0,0 +1,178 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import asyncio
+import time
+
+from module06.league_model.async_emailer import AsyncEmailer, TokenBucket
+from module06.league_model.emailer import SENT, print_summary
+
+
+class FakeSmtpServer:
+    """
+    A small SMTP server on localhost that stands in for the mail provider.
+    It accepts every message, except for the recipients in refuse, and
+    counts the connections and the messages being taken at the same time.
+    """
+
+    def __init__(self, refuse=(), delay=0.0):
+        """
+        Constructor for the server.
+
+        :param refuse: recipients answered with 550
+        :param delay: seconds each message takes to be accepted
+        """
+        self.refuse = set(refuse)
+        self.delay = delay
+        self.messages = []
+        self.connections = 0
+        self.active = 0
+        self.most_active = 0
+        self.port = None
+        self._server = None
+
+    async def start(self):
+        """
+        Starts listening on a free port.
+
+        :return: none
+        """
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        Stops listening.
+
+        :return: none
+        """
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        """
+        Talks SMTP with one client until it quits.
+
+        :param reader: the stream reader
+        :param writer: the stream writer
+        :return: none
+        """
+        self.connections += 1
+        recipients = []
+        writer.write(b"220 fake\r\n")
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode().strip()
+            verb = command.upper()
+            if verb.startswith("MAIL"):
+                recipients = []
+                reply = "250 ok"
+            elif verb.startswith("RCPT"):
+                recipient = command[command.index("<") + 1:command.index(">")]
+                if recipient in self.refuse:
+                    reply = "550 no such user"
+                else:
+                    recipients.append(recipient)
+                    reply = "250 ok"
+            elif verb == "DATA":
+                writer.write(b"354 go ahead\r\n")
+                while await reader.readline() not in (b".\r\n", b""):
+                    pass
+                self.active += 1
+                self.most_active = max(self.most_active, self.active)
+                await asyncio.sleep(self.delay)
+                self.active -= 1
+                self.messages.append(recipients)
+                reply = "250 queued"
+            elif verb == "QUIT":
+                writer.write(b"221 bye\r\n")
+                await writer.drain()
+                break
+            else:
+                reply = "250 ok"
+            writer.write(f"{reply}\r\n".encode())
+            await writer.drain()
+        writer.close()
+
+
+def make_emailer(server, **kwargs):
+    """
+    Returns an AsyncEmailer sending to the fake server.
+
+    :param server: the FakeSmtpServer
+    :param kwargs: other arguments for the emailer
+    :return: the emailer
+    """
+    return AsyncEmailer("league@example.com", host="127.0.0.1", port=server.port, use_ssl=False, **kwargs)
+
+
+def test_sessions_are_shared_and_limited():
+    async def run():
+        server = FakeSmtpServer(refuse={"nobody@example.com"}, delay=0.02)
+        await server.start()
+        emailer = make_emailer(server, sessions=3, rate=1000, burst=1000)
+        recipients = [f"member{i}@example.com" for i in range(30)] + ["nobody@example.com"]
+        status = await emailer.send_all(recipients, "Practice", "Practice is at 6.")
+        await asyncio.to_thread(emailer.close)
+        await server.stop()
+        return server, status
+
+    server, status = asyncio.run(run())
+    assert sum(value == SENT for value in status.values()) == 30
+    assert status["nobody@example.com"].startswith("refused")
+    # the 31 messages went over the 3 sessions, never more at once
+    assert server.connections == 3
+    assert server.most_active <= 3
+    assert len(server.messages) == 30
+
+
+def test_rate_limit_spaces_out_messages():
+    async def run():
+        server = FakeSmtpServer()
+        await server.start()
+        emailer = make_emailer(server, sessions=8, rate=20, burst=1)
+        start = time.monotonic()
+        status = await emailer.send_all([f"member{i}@example.com" for i in range(11)], "s", "m")
+        elapsed = time.monotonic() - start
+        await asyncio.to_thread(emailer.close)
+        await server.stop()
+        return status, elapsed
+
+    status, elapsed = asyncio.run(run())
+    assert all(value == SENT for value in status.values())
+    # one message right away, then one every 1/20 of a second
+    assert elapsed >= 0.45
+
+
+def test_token_bucket_waits_when_empty():
+    async def run():
+        bucket = TokenBucket(rate=100, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.015
+
+
+def test_unreachable_server_fails():
+    async def run():
+        emailer = AsyncEmailer("league@example.com", host="127.0.0.1", port=1, use_ssl=False, timeout=2)
+        status = await emailer.send_message("member@example.com", "s", "m")
+        await asyncio.to_thread(emailer.close)
+        return status
+
+    assert asyncio.run(run()).startswith("failed")
+
+
+def test_print_summary(capsys):
+    print_summary({"a@example.com": SENT, "b@example.com": "refused: 550"})
+    out = capsys.readouterr().out
+    assert "Email sent to 1 of 2 recipients" in out
+    assert "b@example.com refused: 550" in out
@@ -0,0 +1,54 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import os
+
+import pytest
+
+from module06.league_model import codec
+from module06.league_model.backup_store import BackupStore
+from module06.league_model.conftest import league_contents, make_league
+from module06.league_model.league_database import LeagueDatabase
+
+
+def test_restore_earlier_save(database, tmp_path):
+    file_name = str(tmp_path / "league.db")
+    database.save(file_name)
+    expected = league_contents(database)
+    database.leagues[0].name = "Renamed"
+    database.leagues[0].remove_team(database.leagues[0].teams[0])
+    database.save(file_name)
+    database.wait_for_saves()
+
+    generations = database.backups()
+    assert [number for number, _ in generations] == [1, 2]
+    database.restore(1)
+    assert league_contents(database) == expected
+
+
+def test_unchanged_leagues_share_chunks(database, tmp_path):
+    make_league(database, "Darts")
+    store = BackupStore(str(tmp_path / "backups"))
+    store.add_generation(database.last_oid, 0, [codec.encode_league(league) for league in database.leagues])
+    database.leagues[1].name = "Renamed"
+    store.add_generation(database.last_oid, 0, [codec.encode_league(league) for league in database.leagues])
+    # two versions of the second league, one of the first
+    assert len(os.listdir(tmp_path / "backups" / "chunks")) == 3
+
+
+def test_old_generations_are_pruned(database, tmp_path):
+    store = BackupStore(str(tmp_path / "backups"), max_generations=2)
+    for i in range(4):
+        database.leagues[0].name = f"Name {i}"
+        store.add_generation(database.last_oid, 0, [codec.encode_league(database.leagues[0])])
+    assert [number for number, _ in store.generations()] == [3, 4]
+    # only the chunks of the kept generations are left
+    assert len(os.listdir(tmp_path / "backups" / "chunks")) == 2
+    restored = store.restore(3, LeagueDatabase())
+    assert restored.leagues[0].name == "Name 2"
+    with pytest.raises(ValueError):
+        store.restore(1, LeagueDatabase())
@@ -0,0 +1,68 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from datetime import date, datetime
+
+from module06.league_model.calendar_index import CompetitionCalendar
+from module06.league_model.competition import Competition
+
+
+def add_games(database):
+    """
+    Adds competitions on a few days of April to the league of the database,
+    plus one without a date.
+
+    :param database: the LeagueDatabase
+    :return: the competitions added, in the order they were added
+    """
+    league = database.leagues[0]
+    first, second, third = league.teams
+    games = [
+        ([first, second], datetime(2025, 4, 3, 18, 0)),
+        ([second, third], datetime(2025, 4, 1, 18, 0)),
+        ([first, third], datetime(2025, 4, 3, 12, 0)),
+        ([first, second], datetime(2025, 4, 9, 18, 0)),
+        ([second, third], None),
+    ]
+    competitions = []
+    for teams, when in games:
+        competition = Competition(database.next_oid(), teams, "Rink", when)
+        league.add_competition(competition)
+        competitions.append(competition)
+    return competitions
+
+
+def test_range_queries(database):
+    league = database.leagues[0]
+    c1, c2, c3, c4, c5 = add_games(database)
+    assert league.competitions_between(None, None) == [c2, c3, c1, c4]
+    assert league.competitions_between(datetime(2025, 4, 2), datetime(2025, 4, 9, 18, 0)) == [c3, c1]
+    assert league.calendar.competitions_on(date(2025, 4, 3)) == [c3, c1]
+    assert league.calendar.by_day(None, None) == [
+        (date(2025, 4, 1), [c2]), (date(2025, 4, 3), [c3, c1]), (date(2025, 4, 9), [c4])]
+    assert league.calendar.unscheduled() == [c5]
+    assert len(league.calendar) == 4
+
+
+def test_next_competitions(database):
+    league = database.leagues[0]
+    c1, _, c3, c4, _ = add_games(database)
+    first = league.teams[0]
+    assert league.next_competitions(first, 2, datetime(2025, 4, 2)) == [c3, c1]
+    assert league.next_competitions(first, 5, datetime(2025, 4, 4)) == [c4]
+
+
+def test_date_change_moves_competition(database):
+    league = database.leagues[0]
+    c1, c2, c3, c4, c5 = add_games(database)
+    calendar = league.calendar
+    c4.date_time = datetime(2025, 3, 30, 9, 0)
+    c5.date_time = datetime(2025, 4, 20, 9, 0)
+    assert calendar.competitions_between(None, None) == [c4, c2, c3, c1, c5]
+    assert calendar.unscheduled() == []
+    # the same as a calendar built from scratch
+    assert CompetitionCalendar(league.competitions).competitions_between(None, None) == [c4, c2, c3, c1, c5]
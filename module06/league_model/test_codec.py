@@ -0,0 +1,61 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from datetime import datetime
+
+import pytest
+
+from module06.league_model import codec
+from module06.league_model.competition import Competition
+from module06.league_model.conftest import league_contents, make_league
+from module06.league_model.league_database import LeagueDatabase
+
+
+@pytest.mark.parametrize("compression", [None, "zlib", "lzma"])
+def test_round_trip(database, compression):
+    league = make_league(database, "Bowling", teams=2)
+    teams = league.teams
+    competition = Competition(database.next_oid(), [teams[0], teams[1]], "Lanes", datetime(2025, 4, 1, 18, 0))
+    league.add_competition(competition)
+    competition.result = (3, 1)
+
+    data = codec.dumps(database, compression)
+    copy = codec.loads(data, LeagueDatabase())
+    assert league_contents(copy) == league_contents(database)
+    assert copy.last_oid == database.last_oid
+
+
+def test_columnar_round_trip(database):
+    copy = codec.loads(codec.dumps(database), LeagueDatabase(), columnar=True)
+    assert league_contents(copy) == league_contents(database)
+
+
+def test_header(database):
+    data = codec.dumps(database, "zlib")
+    magic, version, compression = codec.HEADER.unpack_from(data)
+    assert codec.is_codec_data(data)
+    assert (magic, version, compression) == (codec.MAGIC, codec.VERSION, codec.COMPRESSIONS["zlib"])
+
+
+def test_unknown_version_is_refused(database):
+    data = bytearray(codec.dumps(database))
+    data[len(codec.MAGIC)] = codec.VERSION + 1
+    with pytest.raises(ValueError):
+        codec.loads(bytes(data), LeagueDatabase())
+
+
+def test_not_codec_data():
+    assert not codec.is_codec_data(b"\x80\x04pickle")
+    with pytest.raises(ValueError):
+        codec.loads(b"XXXX\x02\x00", LeagueDatabase())
+
+
+def test_league_block_is_stable(database):
+    league = database.leagues[0]
+    block = codec.encode_league(league)
+    assert codec.encode_league(league) == block
+    assert codec.decode_league(block).name == league.name
@@ -0,0 +1,84 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from module06.league_model.edit_session import LeagueEditSession, TeamEditSession
+from module06.league_model.team import Team
+from module06.league_model.team_member import TeamMember
+
+
+def members_of(team):
+    """
+    Returns the members of a team as plain values.
+
+    :param team: the team or session
+    :return: list of (oid, name, email) tuples
+    """
+    return [(member.oid, member.name, member.email) for member in team.members]
+
+
+def test_team_commit(database):
+    team = database.leagues[0].teams[0]
+    first, second, third = team.members
+    session = TeamEditSession(team)
+    session.name = "Renamed"
+    session.edit_member(first).email = "changed@example.com"
+    session.remove_member(second)
+    session.add_member(TeamMember(database.next_oid(), "New member", "new@example.com"))
+    # nothing changes until the commit
+    assert team.name != "Renamed" and first.email != "changed@example.com" and second in team.members
+    assert session.is_modified()
+
+    session.commit()
+    assert team.name == "Renamed"
+    assert team.members[0] is first and first.email == "changed@example.com"
+    assert second not in team.members and team.member_named("New member") is not None
+    assert not session.is_modified()
+
+
+def test_team_cancel(database):
+    team = database.leagues[0].teams[0]
+    before = members_of(team)
+    session = TeamEditSession(team)
+    session.edit_member(team.members[0]).name = "Someone else"
+    session.remove_member(team.members[1])
+    session.cancel()
+    assert not session.is_modified()
+    assert members_of(session) == before
+    assert members_of(team) == before
+
+
+def test_league_commit(database):
+    league = database.leagues[0]
+    removed = league.teams[2]
+    session = LeagueEditSession(league)
+    session.name = "Renamed league"
+    session.remove_team(removed)
+    added = Team(database.next_oid(), "Added team")
+    session.add_team(added)
+    session.team_named(league.teams[0].name).name = "Renamed team"
+    assert session.team_named("Added team") is added
+    assert session.team_named("Renamed team") is not None
+    assert removed in league.teams and added not in league.teams
+
+    session.commit()
+    assert league.name == "Renamed league"
+    assert removed not in league.teams
+    assert league.team_named("Added team") is added
+    assert league.teams[0].name == "Renamed team"
+
+
+def test_league_cancel(database):
+    league = database.leagues[0]
+    names = [team.name for team in league.teams]
+    session = LeagueEditSession(league)
+    session.remove_team(league.teams[0])
+    session.add_team(Team(database.next_oid(), "Added team"))
+    session.cancel()
+    assert not session.is_modified()
+    assert [team.name for team in session.teams] == names
+    assert session.team_named("Added team") is None
+    assert [team.name for team in league.teams] == names
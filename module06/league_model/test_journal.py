@@ -0,0 +1,117 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import os
+import pickle
+from datetime import datetime
+
+from module06.league_model.competition import Competition
+from module06.league_model.conftest import league_contents, make_league
+from module06.league_model.league_database import LeagueDatabase
+from module06.league_model.team import Team
+from module06.league_model.team_member import TeamMember
+
+
+def journaled(database, tmp_path, **kwargs):
+    """
+    Saves a database as the snapshot and starts journaling next to it.
+
+    :param database: the LeagueDatabase
+    :param tmp_path: the test's folder
+    :param kwargs: other arguments for open_journal()
+    :return: name of the snapshot file
+    """
+    file_name = str(tmp_path / "league.db")
+    database.save(file_name)
+    database.open_journal(file_name, **kwargs)
+    return file_name
+
+
+def test_replay_after_crash(database, tmp_path):
+    file_name = journaled(database, tmp_path)
+    league = database.leagues[0]
+    team = league.teams[0]
+    team.name = "Renamed"
+    team.members[0].email = "changed@example.com"
+    team.remove_member(team.members[1])
+    new_team = Team(database.next_oid(), "New team")
+    new_team.add_member(TeamMember(database.next_oid(), "New member", "new@example.com"))
+    league.add_team(new_team)
+    # a member on two teams is still one member once replayed
+    league.teams[1].add_member(team.members[0])
+    competition = Competition(database.next_oid(), [team, new_team], "Rink", datetime(2025, 5, 2, 19, 0))
+    league.add_competition(competition)
+    competition.result = (2, 2)
+    make_league(database, "Darts", teams=1)
+    expected = league_contents(database)
+
+    # the program stops without saving; the snapshot plus the journal give the same database
+    LeagueDatabase.load(file_name)
+    loaded = LeagueDatabase.instance()
+    assert league_contents(loaded) == expected
+    assert loaded.last_oid == database.last_oid
+    replayed = loaded.leagues[0]
+    assert replayed.teams[0].members[0] is replayed.teams[1].members[-1]
+
+
+def test_undo_is_journaled(database, tmp_path):
+    file_name = journaled(database, tmp_path)
+    league = database.leagues[0]
+    with league.transaction():
+        league.remove_team(league.teams[0])
+    league.undo()
+    expected = league_contents(database)
+    LeagueDatabase.load(file_name)
+    assert league_contents(LeagueDatabase.instance()) == expected
+
+
+def test_torn_group_is_skipped(database, tmp_path):
+    file_name = journaled(database, tmp_path)
+    expected = league_contents(database)
+    team = Team(database.next_oid(), "Half written")
+    team.add_member(TeamMember(database.next_oid(), "Someone", "someone@example.com"))
+    database.leagues[0].add_team(team)
+    database.close_journal()
+
+    # cut the journal inside the group written for the new team
+    journal_file = file_name + ".journal"
+    with open(journal_file, "rb") as file:
+        records = []
+        while True:
+            start = file.tell()
+            try:
+                record = pickle.load(file)
+            except EOFError:
+                break
+            records.append((start, record))
+    ends = [start for start, record in records if record[2] == "end"]
+    with open(journal_file, "r+b") as file:
+        file.truncate(ends[-1])
+
+    LeagueDatabase.load(file_name)
+    assert league_contents(LeagueDatabase.instance()) == expected
+
+
+def test_compaction_waits_for_idle(database, tmp_path):
+    file_name = journaled(database, tmp_path, compact_threshold=1)
+    database.leagues[0].name = "Renamed"
+    journal = database._journal
+    assert journal.compact_due
+    assert os.path.getsize(file_name + ".journal") > 0
+    assert database.compact_journal()
+    database.wait_for_saves()
+    assert not journal.compact_due
+    LeagueDatabase.load(file_name)
+    assert LeagueDatabase.instance().leagues[0].name == "Renamed"
+
+
+def test_other_objects_are_not_journaled(database, tmp_path):
+    file_name = journaled(database, tmp_path)
+    size = os.path.getsize(file_name + ".journal")
+    # a team that is not in the database
+    Team(12345, "Loose team").add_member(TeamMember(12346, "Loose", "loose@example.com"))
+    assert os.path.getsize(file_name + ".journal") == size
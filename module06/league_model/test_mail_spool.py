@@ -0,0 +1,112 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import threading
+
+import pytest
+
+from module06.league_model.emailer import SENT
+from module06.league_model.mail_spool import PENDING, QUEUED, MailSpool
+
+
+class FakeEmailer:
+    """
+    An emailer that sends nothing. flaky@ fails the first two times,
+    down@ always fails and refused@ is refused by the server.
+    """
+
+    def __init__(self):
+        """
+        Constructor for the emailer.
+        """
+        self.tries = {}
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def send_plain_email(self, recipients, subject, message):
+        """
+        Pretends to send an email to each recipient.
+
+        :param recipients: list of email addresses
+        :param subject: subject of the email
+        :param message: message of the email
+        :return: dictionary of the delivery status of each recipient
+        """
+        status = {}
+        with self.lock:
+            for recipient in recipients:
+                tries = self.tries[recipient] = self.tries.get(recipient, 0) + 1
+                if recipient.startswith("flaky") and tries < 3 or recipient.startswith("down"):
+                    status[recipient] = "failed: connection lost"
+                elif recipient.startswith("refused"):
+                    status[recipient] = "refused: 550"
+                else:
+                    status[recipient] = SENT
+                    self.sent.append((recipient, subject))
+        return status
+
+
+@pytest.fixture
+def spool_file(tmp_path):
+    """
+    Name of a new spool file.
+
+    :return: the file name
+    """
+    return str(tmp_path / "mail.spool")
+
+
+def test_send_plain_email_returns_statuses(spool_file):
+    spool = MailSpool(spool_file, FakeEmailer())
+    status = spool.send_plain_email(["a@example.com", "b@example.com"], "Practice", "At 6.")
+    assert status == {"a@example.com": QUEUED, "b@example.com": QUEUED}
+    assert spool.wait(10)
+    spool.close()
+
+
+def test_retries(spool_file):
+    emailer = FakeEmailer()
+    spool = MailSpool(spool_file, emailer, retry_delay=0.01, max_tries=4)
+    recipients = ["flaky@example.com", "down@example.com", "refused@example.com", "fine@example.com"]
+    message_id = spool.queue_email(recipients, "Practice", "At 6.")
+    assert spool.wait(10)
+    status = spool.status(message_id)
+    spool.close()
+    assert status["flaky@example.com"] == SENT and emailer.tries["flaky@example.com"] == 3
+    assert status["down@example.com"].startswith("failed") and emailer.tries["down@example.com"] == 4
+    # a refused recipient is not tried again
+    assert status["refused@example.com"].startswith("refused") and emailer.tries["refused@example.com"] == 1
+    assert status["fine@example.com"] == SENT
+
+
+def test_message_is_sent_once(spool_file):
+    emailer = FakeEmailer()
+    spool = MailSpool(spool_file, emailer)
+    message_id = spool.queue_email(["a@example.com", "b@example.com"], "Practice", "At 6.")
+    assert spool.wait(10)
+    spool.queue_email(["a@example.com", "b@example.com", "c@example.com"], "Practice", "At 6.", message_id)
+    assert spool.wait(10)
+    spool.close()
+    assert sorted(recipient for recipient, _ in emailer.sent) == ["a@example.com", "b@example.com", "c@example.com"]
+
+
+def test_emails_left_are_sent_after_restart(spool_file):
+    class StoppedEmailer(FakeEmailer):
+        def send_plain_email(self, recipients, subject, message):
+            return {recipient: "failed: not started" for recipient in recipients}
+
+    spool = MailSpool(spool_file, StoppedEmailer(), retry_delay=0.01, max_tries=100)
+    message_id = spool.queue_email(["a@example.com", "b@example.com"], "Practice", "At 6.")
+    spool.close()
+
+    emailer = FakeEmailer()
+    spool = MailSpool(spool_file, emailer, retry_delay=0.01)
+    assert spool.wait(10)
+    status = spool.status(message_id)
+    spool.close()
+    assert PENDING not in status.values()
+    assert status == {"a@example.com": SENT, "b@example.com": SENT}
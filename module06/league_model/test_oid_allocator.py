@@ -0,0 +1,78 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import pickle
+import threading
+
+from module06.league_model.oid_allocator import OidAllocator
+
+
+def test_blocks_do_not_overlap():
+    allocator = OidAllocator(10)
+    first = allocator.reserve(5)
+    second = allocator.reserve(5)
+    assert [first.next_oid() for _ in range(5)] == [11, 12, 13, 14, 15]
+    assert second.next_oid() == 16
+    assert allocator.next_oid() == 21
+
+
+def test_block_grows_when_used_up():
+    allocator = OidAllocator()
+    block = allocator.reserve(2)
+    oids = [block.next_oid() for _ in range(5)]
+    assert len(set(oids)) == 5
+    assert allocator.high_water >= 5
+
+
+def test_release_lowers_high_water():
+    allocator = OidAllocator(100)
+    with allocator.reserve(50) as block:
+        block.next_oid()
+        block.next_oid()
+    assert allocator.high_water == 102
+
+
+def test_cancel_gives_back_every_oid():
+    allocator = OidAllocator(7)
+    block = allocator.reserve(10)
+    block.next_oid()
+    block.cancel()
+    assert allocator.high_water == 7
+    assert allocator.next_oid() == 8
+
+
+def test_given_back_range_is_reused():
+    allocator = OidAllocator()
+    low = allocator.reserve(10)
+    high = allocator.reserve(10)
+    high.next_oid()
+    low.cancel()
+    reused = allocator.reserve(4)
+    assert reused.next_oid() == 1
+    assert allocator.high_water == 20
+
+
+def test_threads_get_unique_oids():
+    allocator = OidAllocator()
+    taken = []
+
+    def take():
+        oids = [allocator.next_oid() for _ in range(1000)]
+        taken.extend(oids)
+
+    threads = [threading.Thread(target=take) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(taken) == list(range(1, 4001))
+
+
+def test_pickle_keeps_high_water():
+    allocator = OidAllocator(42)
+    copy = pickle.loads(pickle.dumps(allocator))
+    assert copy.next_oid() == 43
@@ -0,0 +1,31 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import random
+
+from module06.league_model.position_index import PositionIndex
+
+
+def test_positions_follow_removals():
+    keys = list(range(100, 200))
+    index = PositionIndex(keys)
+    rng = random.Random(4970)
+    for _ in range(60):
+        key = rng.choice(keys)
+        assert index.position(key) == keys.index(key)
+        assert index.remove(key) == keys.index(key)
+        keys.remove(key)
+        assert len(index) == len(keys)
+    assert index.remove(100000) is None
+
+
+def test_append_after_removal():
+    index = PositionIndex(["a", "b", "c"])
+    index.remove("a")
+    index.append("d")
+    assert [index.position(key) for key in ("b", "c", "d")] == [0, 1, 2]
+    assert index.position("a") is None
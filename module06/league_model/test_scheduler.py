@@ -0,0 +1,84 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from module06.league_model.competition import Competition
+from module06.league_model.conftest import make_league
+from module06.league_model.scheduler import Scheduler, find_conflicts, round_robin_pairs
+
+
+def slots(days, per_day=3):
+    """
+    Returns evening time slots, two hours apart.
+
+    :param days: number of days
+    :param per_day: slots on each day
+    :return: list of datetimes
+    """
+    start = datetime(2025, 6, 2, 17, 0)
+    return [start + timedelta(days=day, hours=2 * i) for day in range(days) for i in range(per_day)]
+
+
+@pytest.mark.parametrize("count", [4, 5])
+def test_round_robin_pairs(count):
+    rounds = round_robin_pairs(list(range(count)))
+    pairs = [frozenset(pair) for games in rounds for pair in games]
+    # every pair once, and no team twice in a round
+    assert len(pairs) == count * (count - 1) // 2 == len(set(pairs))
+    for games in rounds:
+        teams = [team for game in games for team in game]
+        assert len(teams) == len(set(teams))
+
+
+def test_round_robin_has_no_conflicts(database):
+    league = make_league(database, "Soccer", teams=6, members=1)
+    scheduler = Scheduler(league, ["Field 1", "Field 2"], slots(10), database)
+    competitions = scheduler.round_robin()
+    assert len(competitions) == 15
+    assert find_conflicts(competitions) == []
+    assert len({competition.oid for competition in competitions}) == 15
+    assert [c.date_time for c in competitions] == sorted(c.date_time for c in competitions)
+
+
+def test_existing_competitions_are_not_double_booked(database):
+    league = make_league(database, "Soccer", teams=4, members=1)
+    first = slots(1)[0]
+    league.add_competition(Competition(database.next_oid(), league.teams[:2], "Field 1", first))
+    competitions = Scheduler(league, ["Field 1"], slots(5), database).round_robin()
+    assert find_conflicts(list(league.competitions) + competitions) == []
+
+
+def test_bracket_gives_byes_to_best_seeds(database):
+    league = make_league(database, "Soccer", teams=6, members=1)
+    teams = league.teams
+    scheduler = Scheduler(league, ["Field 1", "Field 2"], slots(3), database)
+    competitions, byes = scheduler.bracket()
+    assert byes == teams[:2]
+    assert [[team.name for team in c.teams_competing] for c in competitions] == [
+        [teams[2].name, teams[5].name], [teams[3].name, teams[4].name]]
+    later = scheduler.next_round([teams[0], teams[5], teams[1], teams[3]])
+    assert len(later) == 2
+    assert min(c.date_time for c in later) >= max(c.date_time for c in competitions)
+
+
+def test_not_enough_slots(database):
+    league = make_league(database, "Soccer", teams=6, members=1)
+    with pytest.raises(ValueError):
+        Scheduler(league, ["Field 1"], slots(1), database).round_robin()
+
+
+def test_find_conflicts(database):
+    league = database.leagues[0]
+    home, away, other = league.teams
+    when = datetime(2025, 6, 2, 17, 0)
+    first = Competition(1, [home, away], "Field 1", when)
+    second = Competition(2, [home, other], "Field 2", when + timedelta(hours=1))
+    third = Competition(3, [away, other], "Field 1", when + timedelta(hours=4))
+    assert find_conflicts([first, second, third]) == [(home, first, second)]
@@ -0,0 +1,63 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import os
+
+from module06.league_model.conftest import league_contents, make_league
+from module06.league_model.league_database import LeagueDatabase
+from module06.league_model.sharded_storage import ShardedLeagueStorage, is_manifest_file
+
+
+def shard_files(file_name):
+    """
+    Returns the shard files kept for a manifest.
+
+    :param file_name: the manifest file
+    :return: set of shard file names
+    """
+    return set(os.listdir(file_name + ".d"))
+
+
+def test_round_trip(database, tmp_path):
+    file_name = str(tmp_path / "league.shards")
+    make_league(database, "Darts", teams=2)
+    database.save(file_name)
+    assert is_manifest_file(file_name)
+    LeagueDatabase.load(file_name)
+    loaded = LeagueDatabase.instance()
+    assert league_contents(loaded) == league_contents(database)
+    assert loaded.last_oid == database.last_oid
+
+
+def test_only_changed_leagues_are_written(database, tmp_path):
+    file_name = str(tmp_path / "league.shards")
+    make_league(database, "Darts")
+    database.save(file_name)
+    before = shard_files(file_name)
+    LeagueDatabase.load(file_name)
+    loaded = LeagueDatabase.instance()
+    loaded.leagues[1].teams[0].name = "Renamed"
+    loaded.save(file_name)
+    after = shard_files(file_name)
+    # one shard replaced, the other kept
+    assert len(after) == 2
+    assert len(before & after) == 1
+    LeagueDatabase.load(file_name)
+    assert LeagueDatabase.instance().leagues[1].teams[0].name == "Renamed"
+
+
+def test_dropped_league_keeps_its_changes(database, tmp_path):
+    file_name = str(tmp_path / "league.shards")
+    make_league(database, "Darts")
+    database.save(file_name)
+    loaded = ShardedLeagueStorage(file_name, max_resident_members=9).load(LeagueDatabase())
+    first, second = loaded.leagues
+    first.teams[0].name = "Renamed"
+    # loading the second league drops the first from memory
+    second.teams
+    assert not first._is_loaded()
+    assert first.teams[0].name == "Renamed"
@@ -0,0 +1,116 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+import sqlite3
+from datetime import datetime
+
+from module06.league_model.competition import Competition
+from module06.league_model.conftest import league_contents, make_league
+from module06.league_model.league_database import LeagueDatabase
+from module06.league_model.sqlite_storage import KEY_COLUMNS, SqliteLeagueStorage
+from module06.league_model.team import Team
+from module06.league_model.team_member import TeamMember
+
+
+def reload(file_name):
+    """
+    Loads a SQLite database file with every league read in.
+
+    :param file_name: the file
+    :return: the loaded LeagueDatabase
+    """
+    LeagueDatabase.load(file_name)
+    database = LeagueDatabase.instance()
+    for league in database.leagues:
+        league.teams
+    return database
+
+
+def rows(file_name):
+    """
+    Returns every row of the league tables of a file.
+
+    :param file_name: the file
+    :return: dictionary of the sorted rows of each table
+    """
+    connection = sqlite3.connect(file_name)
+    try:
+        return {table: sorted(connection.execute(f"SELECT * FROM {table}")) for table in ("leagues", *KEY_COLUMNS)}
+    finally:
+        connection.close()
+
+
+def test_round_trip(database, tmp_path):
+    file_name = str(tmp_path / "league.sqlite")
+    league = database.leagues[0]
+    competition = Competition(database.next_oid(), league.teams[:2], "Rink", datetime(2025, 3, 1, 10, 30))
+    league.add_competition(competition)
+    competition.result = (4, 7)
+    make_league(database, "Darts", teams=1)
+    database.save(file_name)
+    assert league_contents(reload(file_name)) == league_contents(database)
+
+
+def test_leagues_load_when_used(database, tmp_path):
+    file_name = str(tmp_path / "league.sqlite")
+    make_league(database, "Darts")
+    database.save(file_name)
+    LeagueDatabase.load(file_name)
+    loaded = LeagueDatabase.instance()
+    assert not any(league._is_loaded() for league in loaded.leagues)
+    assert [team.name for team in loaded.leagues[1].teams] == [team.name for team in database.leagues[1].teams]
+    assert not loaded.leagues[0]._is_loaded()
+
+
+def test_saves_write_the_changes(database, tmp_path):
+    file_name = str(tmp_path / "league.sqlite")
+    database.save(file_name)
+    loaded = reload(file_name)
+    league = loaded.leagues[0]
+    team = league.teams[0]
+    team.name = "Renamed"
+    team.members[0].email = "changed@example.com"
+    team.remove_member(team.members[1])
+    league.teams[1].add_member(team.members[0])
+    new_team = Team(loaded.next_oid(), "New team")
+    new_team.add_member(TeamMember(loaded.next_oid(), "New member", "new@example.com"))
+    league.add_team(new_team)
+    league.remove_team(league.teams[2])
+    competition = Competition(loaded.next_oid(), [team, new_team], "Rink", datetime(2025, 3, 8, 10, 30))
+    league.add_competition(competition)
+    competition.result = (1, 0)
+    competition.location = "Other rink"
+    loaded.save(file_name)
+
+    # the file holds the same rows as a new file written from scratch
+    fresh = str(tmp_path / "fresh.sqlite")
+    storage = SqliteLeagueStorage(fresh)
+    storage.save(loaded)
+    storage.close()
+    assert rows(file_name) == rows(fresh)
+    expected = league_contents(loaded)
+    assert league_contents(reload(file_name)) == expected
+
+
+def test_replaced_league_is_written(database, tmp_path):
+    file_name = str(tmp_path / "league.sqlite")
+    database.save(file_name)
+    loaded = reload(file_name)
+    other = LeagueDatabase()
+    replacement = make_league(other, "Replacement", teams=2)
+    loaded.replace_league(loaded.leagues[0], replacement)
+    loaded.save(file_name)
+    assert league_contents(reload(file_name)) == league_contents(other)
+
+
+def test_changes_outside_the_database_are_ignored(database, tmp_path):
+    file_name = str(tmp_path / "league.sqlite")
+    database.save(file_name)
+    before = rows(file_name)
+    Team(12345, "Loose team").add_member(TeamMember(12346, "Loose", "loose@example.com"))
+    database.save(file_name)
+    assert rows(file_name) == before
@@ -0,0 +1,70 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from datetime import datetime
+
+from module06.league_model.competition import Competition
+from module06.league_model.standings import DRAW_POINTS, WIN_POINTS, Standings
+
+
+def play(database, league, home, away, result):
+    """
+    Adds a competition with a result to a league.
+
+    :param database: the LeagueDatabase, for the oid
+    :param league: the league
+    :param home: the first team
+    :param away: the second team
+    :param result: the score of each team
+    :return: the competition
+    """
+    competition = Competition(database.next_oid(), [home, away], "Rink", datetime(2025, 1, 5))
+    league.add_competition(competition)
+    competition.result = result
+    return competition
+
+
+def test_table(database):
+    league = database.leagues[0]
+    first, second, third = league.teams
+    play(database, league, first, second, (3, 1))
+    play(database, league, second, third, (2, 2))
+    play(database, league, third, first, (0, 1))
+
+    table = league.standings.table()
+    # second and third are level on points and drew each other, so the difference decides
+    assert [record.team for record in table] == [first, third, second]
+    record = league.standings.record_for(first)
+    assert (record.played, record.wins, record.points, record.difference) == (2, 2, 2 * WIN_POINTS, 3)
+    assert league.standings.record_for(second).points == DRAW_POINTS
+    assert league.standings.position(first) == 1
+
+
+def test_head_to_head_breaks_ties(database):
+    league = database.leagues[0]
+    first, second, third = league.teams
+    play(database, league, first, second, (0, 1))
+    play(database, league, first, third, (5, 0))
+    # first and second are on 3 points; second beat first, which has the better difference
+    standings = league.standings
+    assert standings.head_to_head(second, first) == WIN_POINTS
+    assert standings.position(second) < standings.position(first)
+
+
+def test_corrected_result(database):
+    league = database.leagues[0]
+    first, second, _ = league.teams
+    competition = play(database, league, first, second, (1, 0))
+    standings = league.standings
+    assert standings.record_for(first).wins == 1
+    competition.result = (0, 2)
+    assert standings.record_for(first).wins == 0
+    assert standings.record_for(second).wins == 1
+    competition.result = None
+    assert standings.record_for(second).played == 0
+    # kept up to date the same as when built from scratch
+    assert [r.team for r in standings.table()] == [r.team for r in Standings(league).table()]
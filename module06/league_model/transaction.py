@@ -0,0 +1,269 @@
+# CPSC 4970 - Python Programming
+#
+# Assignment 6 - Final Project
+#
+# Author: Alan Cruce
+# Date: April 28, 2025
+
+from module06.league_model.events import FieldChanged, model_events
+
+
+class Transaction:
+    """
+    This class records the changes made to a league, its teams, their
+    members and its competitions so they can be undone as one step.
+
+    The changes are taken from the change events of model_events while the
+    transaction is open, so nothing is copied and a change costs one list
+    append. rollback() makes the inverse of each change in reverse order
+    (removing a team that was added, putting a removed member back at the
+    same position, setting a field back to its old value, and so on).
+    commit() keeps the changes and puts them in the undo history of the
+    league (see History).
+
+    A transaction started on a league that already has one open is nested
+    in it: it shares the open transaction's list of changes, its commit()
+    leaves the changes to the outer transaction, and its rollback() only
+    undoes the changes made since it started.
+    """
+
+    __slots__ = ("_league", "_log", "_mark", "_nested", "_open")
+
+    def __init__(self, league):
+        """
+        Constructor for the transaction. Recording starts right away.
+
+        :param league: the league to record
+        """
+        self._league = league
+        outer = league._recorder
+        self._nested = outer is not None
+        if self._nested:
+            self._log = outer._log
+        else:
+            self._log = []
+            model_events.subscribe(self._record)
+            league._recorder = self
+        # the changes of this transaction are the ones after this position
+        self._mark = len(self._log)
+        self._open = True
+
+    @property
+    def changes(self):
+        """
+        Getter method for the changes recorded by the transaction so far.
+
+        :return: list of ChangeEvents, oldest first
+        """
+        return self._log[self._mark:]
+
+    def commit(self):
+        """
+        Keeps the changes of the transaction. A top level transaction stops
+        recording and adds its changes to the undo history of the league.
+        Nothing happens if the transaction is already closed.
+
+        :return: none
+        """
+        if self._open:
+            log = self._close()
+            if log:
+                self._league._undo_history().push(log)
+
+    def rollback(self):
+        """
+        Undoes the changes of the transaction, newest first, and closes it.
+        Nothing happens if the transaction is already closed.
+
+        :return: none
+        """
+        if self._open:
+            log = self._log
+            undo_changes(log[self._mark:])
+            # the inverse changes were recorded too, and are dropped with the ones they undid
+            del log[self._mark:]
+            self._close()
+
+    def _close(self):
+        """
+        Stops the transaction.
+
+        :return: the changes recorded by a top level transaction, or None if it is nested
+        """
+        self._open = False
+        if self._nested:
+            return None
+        model_events.unsubscribe(self._record)
+        self._league._recorder = None
+        return self._log
+
+    def _record(self, event):
+        """
+        Called by model_events for every change; keeps the changes made to
+        the league or to anything in it.
+
+        :param event: the ChangeEvent
+        :return: none
+        """
+        if _belongs_to(event.source, self._league):
+            self._log.append(event)
+
+    def __enter__(self):
+        """
+        Returns the transaction at the start of a with statement.
+
+        :return: the transaction
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Commits the transaction at the end of a with statement, or rolls it
+        back if an exception was raised. The exception is not suppressed.
+
+        :param exc_type: type of the exception raised, or None
+        :param exc_value: the exception raised, or None
+        :param traceback: traceback of the exception, or None
+        :return: False
+        """
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+class History:
+    """
+    This class is the undo and redo history of a league: a list of the
+    changes of each committed transaction.
+
+    undo() undoes the last transaction inside a new transaction, and the
+    changes recorded while undoing are put on the redo list, so redo() can
+    undo them in turn. The history has no limit; committing a new
+    transaction clears the redo list.
+    """
+
+    __slots__ = ("_league", "_undo", "_redo")
+
+    def __init__(self, league):
+        """
+        Constructor for the history.
+
+        :param league: the league
+        """
+        self._league = league
+        self._undo = []
+        self._redo = []
+
+    def push(self, changes):
+        """
+        Adds the changes of a committed transaction.
+
+        :param changes: list of ChangeEvents
+        :return: none
+        """
+        self._undo.append(changes)
+        self._redo.clear()
+
+    def can_undo(self):
+        """
+        Checks if there is a transaction to undo.
+
+        :return: True if there is one
+        """
+        return bool(self._undo)
+
+    def can_redo(self):
+        """
+        Checks if there is an undone transaction to redo.
+
+        :return: True if there is one
+        """
+        return bool(self._redo)
+
+    def undo(self):
+        """
+        Undoes the last committed transaction.
+
+        :return: True if a transaction was undone, False if there was none
+        """
+        return self._move(self._undo, self._redo)
+
+    def redo(self):
+        """
+        Makes the changes of the last undone transaction again.
+
+        :return: True if a transaction was redone, False if there was none
+        """
+        return self._move(self._redo, self._undo)
+
+    def _move(self, source, target):
+        """
+        Undoes the last changes of one list and adds the changes made by
+        doing so to the other list. If undoing fails, the league is put back
+        as it was and the changes stay on their list.
+
+        :param source: the list to take the changes from
+        :param target: the list to add the inverse changes to
+        :return: True if changes were undone, False if the list was empty
+        """
+        if self._league._recorder is not None:
+            raise ValueError("A transaction is open on the league")
+        if not source:
+            return False
+        changes = source.pop()
+        transaction = Transaction(self._league)
+        try:
+            undo_changes(changes)
+        except Exception:
+            transaction.rollback()
+            source.append(changes)
+            raise
+        target.append(transaction._close())
+        return True
+
+
+def undo_changes(changes):
+    """
+    Makes the inverse of each change, newest first.
+
+    :param changes: list of ChangeEvents
+    :return: none
+    """
+    for event in reversed(changes):
+        source, operation, args = event.source, event.operation, event.args
+        if isinstance(event, FieldChanged):
+            setattr(source, event.field, event.old_value)
+        elif operation == "add_team":
+            source.remove_team(args[0])
+        elif operation == "remove_team":
+            source._insert_team(args[1], args[0])
+        elif operation == "replace_team":
+            source.replace_team(args[1], args[0])
+        elif operation == "add_member":
+            source.remove_member(args[0])
+        elif operation == "remove_member":
+            source._insert_member(args[1], args[0])
+        elif operation == "add_competition":
+            source._remove_competition(args[0])
+        elif operation == "remove_competition":
+            source._insert_competition(args[1], args[0])
+
+
+def _belongs_to(obj, league):
+    """
+    Checks if an object is the league or part of it: one of its teams, a
+    member of one of its teams, or one of its competitions.
+
+    :param obj: the object that changed
+    :param league: the league
+    :return: True if the object is part of the league
+    """
+    if obj is league:
+        return True
+    # teams and competitions have the league as an owner, and members have their team
+    owners = getattr(obj, "_owners", ())
+    if any(owner is league for owner in owners):
+        return True
+    return any(league_owner is league for owner in owners for league_owner in getattr(owner, "_owners", ()))
@@ -5,13 +5,13 @@
 # Author: Alan Cruce
 # Date: April 28, 2025
 
-import copy
 import os
 
 from PyQt6 import uic, QtWidgets
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QMessageBox, QFileDialog, QDialog
 
+from module06.league_model.edit_session import LeagueEditSession
 from module06.league_model.team import Team
 from module06.ui.edit_team_dialog import EditTeamDialog
 
@@ -32,10 +32,11 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
         This is the constructor for the edit league dialog. A league database object is passed
         along with the selected league being edited.
 
-        A copy of the selected league is made in the constructor so any changes made are not
-        saved to the actual league object until the user hits save. If the dialog is not saved,
-        changes are not updated in the database. If saved, the changes are updated in the database
-        at that time.
+        An edit session is opened on the selected league in the constructor so any changes made
+        are not saved to the actual league object until the user hits save. The session only
+        copies the teams and members that are changed, so the dialog opens quickly for any
+        league size. If the dialog is not saved, changes are not updated in the database. If saved,
+        the changes are updated in the database at that time.
 
         :param league_db: The league database object
         :param selected_league: The object for the league that was selected to edit
@@ -46,9 +47,12 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
         self.setupUi(self)
         # league database object
         self.league_db = league_db
-        # the selected league is copied for temporary changes until the user saves to the database
+        # changes are kept in an edit session until the user saves to the database
         self.selected_league_original = selected_league
-        self.selected_league_copy = copy.deepcopy(selected_league)
+        self.league_session = LeagueEditSession(selected_league)
+        # oids for new teams and members are reserved for this dialog and given back
+        # when it closes, so cancelling the dialog does not use up any oids
+        self.oids = self.league_db.reserve_oids(16)
         self.update_ui()
         # buttons
         self.add_team_button.clicked.connect(self.add_team_button_clicked)
@@ -77,10 +81,10 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
             self.warn("Enter Name", "You must enter a team name to add")
         else:
             # creates a new Team object using the name provided by the user
-            new_team = Team(self.league_db.next_oid(),
+            new_team = Team(self.oids.next_oid(),
                                 self.team_name_line_edit.text())
-            # updates the team copy object and updates the UI
-            self.selected_league_copy.add_team(new_team)
+            # adds the team to the edit session and updates the UI
+            self.league_session.add_team(new_team)
             # this makes the add team name field blank
             self.team_name_line_edit.setText("")
             self.update_ui()
@@ -101,7 +105,7 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
         if selected_team is None:
             self.warn("Select Team", "You must select a team to delete")
         else:
-            self.selected_league_copy.remove_team(selected_team)
+            self.league_session.remove_team(selected_team)
             self.update_ui()
 
     def edit_team_button_clicked(self):
@@ -126,7 +130,7 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
             self.warn("Select Team", "You must select a team to edit")
         else:
             # the edit team dialog is executed
-            dialog = EditTeamDialog(self.league_db, self.selected_league_copy, selected_team)
+            dialog = EditTeamDialog(self.league_db, self.league_session, selected_team, self.oids)
             # the UI is updated if changes are saved in the edit team dialog
             # a message stating if changes were made or not is displayed to the user
             if dialog.exec() == QDialog.DialogCode.Accepted:
@@ -158,47 +162,53 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
             if not fn[0].lower().endswith(".csv"):
                 fn[0] += ".csv"
             # generate csv method is executed and a message is displayed to the user
-            self.league_db.export_league_teams(self.selected_league_copy, fn[0])
+            self.league_db.export_league_teams(self.league_session, fn[0])
             self.warn("Data Imported", f"Data Imported to file: {fn[0]}")
 
     def import_data_button_clicked(self):
         """
         This method is executed when the import data button is clicked.
 
-        The user will be shown a QFileDialog box, allowing the user to choose a csv file
-        to import. The filter below only allows .csv files to be clickable. The default folder
+        The user will be shown a QFileDialog box, allowing the user to choose one or more csv
+        files to import. The filter below only allows .csv files to be clickable. The default folder
         is the module06/league_model/data folder.
 
-        The imported file is loaded into the copy of the selected_team object to ensure changes
+        The imported files are loaded into the edit session of the selected league to ensure changes
         are only kept if the user clicks the save button in the edit league dialog.
 
         :return: none
         """
-        # this returns a tuple with the file name in the 0 index
-        fn = QFileDialog.getOpenFileName(self, "Open File", "../league_model/data",
-                                         "CSV Files (*.csv)")
-        # the import_league_teams() method in the league database object is executed and ui updated
-        self.league_db.import_league_teams(self.selected_league_copy, fn[0])
+        # this returns a tuple with the list of file names in the 0 index
+        fn = QFileDialog.getOpenFileNames(self, "Open Files", "../league_model/data",
+                                          "CSV Files (*.csv)")
+        if not fn[0]:
+            return
+        # the import_league_teams_many() method in the league database object is executed and ui updated
+        try:
+            self.league_db.import_league_teams_many(self.league_session, fn[0])
+        except Exception as e:
+            self.warn("Import Failed", f"The files could not be imported: {e}")
         self.update_ui()
 
     def save_button_clicked(self):
         """
         This method is executed when the save button in the dialog button box is clicked. Since all
-        changes made prior to clicking save have been stored in the league copy object, this method
+        changes made prior to clicking save have been stored in the edit session, this method
         transfers the changes into the actual database.
 
-        First, a list of leagues in the database is saved and then the index of the selected league
-        in found. Finally, the copy object (with the updated changes) is copied into the leagues list
-        in the database, thus updating the actual database.
+        Committing the session makes each change to the selected league itself, thus updating
+        the actual database. If a change cannot be made (such as a duplicate oid), none of them
+        are, the error is shown to the user and the dialog stays open.
 
         :return:
         """
-        # the list of leagues in the database is saved
-        leagues = self.league_db.leagues
-        # the index in the leagues list for the selected league is saved
-        index = leagues.index(self.selected_league_original)
-        # the data from the copy is saved to the database leagues list
-        leagues[index] = self.selected_league_copy
+        # the changes in the session are made to the league in the database
+        try:
+            self.league_session.commit()
+        except Exception as e:
+            self.warn("Changes Not Saved", f"The changes could not be saved: {e}")
+            return
+        self.oids.release()
         # the dialog box is then closed
         self.accept()
 
@@ -206,9 +216,9 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
         """
         This method is selected when the cancel button in the dialog button box is clicked.
 
-        Since all changes made prior to clicking cancel are only made to the copy of the selected
-        league object, no changes are saved to the actual database (which occurs in the save_button_clicked()
-        method.
+        Since all changes made prior to clicking cancel are only made in the edit session of the
+        selected league, no changes are saved to the actual database (which occurs in the
+        save_button_clicked() method.
 
         This method just closes the dialog.
 
@@ -217,6 +227,18 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
         # the dialog box is closed with no changes being saved to the database
         self.reject()
 
+    def reject(self):
+        """
+        This is a Qt method that is called when the dialog is closed without saving: by the
+        cancel button, the Esc key or the window close button. The changes in the edit session
+        are dropped and the reserved oids are given back, however the dialog is closed.
+
+        :return: none
+        """
+        self.league_session.cancel()
+        self.oids.cancel()
+        super().reject()
+
     def get_selected_team(self):
         """
         This method is used by the edit and delete team methods to return which
@@ -243,13 +265,13 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
         """
         row = self.team_list_selected_row()
         self.team_list_widget.clear()
-        for team in self.selected_league_copy.teams:
+        for team in self.league_session.teams:
             # self.league_list_widget.addItem(f"League name: {league.name}")
             item = QtWidgets.QListWidgetItem(f"Team name: {team.name}")
             item.setData(Qt.ItemDataRole.UserRole, team)
             self.team_list_widget.addItem(item)
 
-        if row != -1 and len(self.selected_league_copy.teams) > row:
+        if row != -1 and len(self.league_session.teams) > row:
             self.team_list_widget.setCurrentItem(self.team_list_widget.item(row))
 
     def team_list_selected_row(self):
@@ -266,7 +288,7 @@ class EditLeagueDialog(QTBaseWindow, UI_MainWindow):
         assert len(selected) == 1
         selected_item = selected[0]
         selected_team = selected_item.data(Qt.ItemDataRole.UserRole)
-        for i, team in enumerate(self.selected_league_copy.teams):
+        for i, team in enumerate(self.league_session.teams):
             if team == selected_team:
                 return i
         return -1
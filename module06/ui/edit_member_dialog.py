@@ -8,6 +8,9 @@
 import os
 
 from PyQt6 import uic
+from PyQt6.QtWidgets import QMessageBox
+
+from module06.league_model.exceptions import DuplicateEmail
 
 # this code helps prevent issues with relative file paths
 complete_file_path = os.path.join(os.path.dirname(__file__), "edit_member_dialog.ui")
@@ -51,8 +54,16 @@ class EditMemberDialog(QTBaseWindow, UI_MainWindow):
 
         :return: none
         """
+        # the email is set first since it is refused if another member of the team has it
+        try:
+            self.selected_member.email = self.member_email_line_edit.text()
+        except DuplicateEmail:
+            mb = QMessageBox(QMessageBox.Icon.NoIcon, "Duplicate Email",
+                             "Another member of the team already has this email",
+                             QMessageBox.StandardButton.Ok)
+            mb.exec()
+            return
         self.selected_member.name = self.member_name_line_edit.text()
-        self.selected_member.email = self.member_email_line_edit.text()
         self.accept()
 
     def cancel_button_clicked(self):
@@ -5,13 +5,13 @@
 # Author: Alan Cruce
 # Date: April 28, 2025
 
-import copy
 import os
 
 from PyQt6 import uic, QtWidgets
 from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QMessageBox, QDialog
 
+from module06.league_model.edit_session import TeamEditSession
 from module06.league_model.team_member import TeamMember
 from module06.ui.edit_member_dialog import EditMemberDialog
 
@@ -26,19 +26,20 @@ class EditTeamDialog(QTBaseWindow, UI_MainWindow):
     on the team that was selected in the main window.
     """
 
-    def __init__(self, league_db=None, selected_league=None, selected_team=None, parent=None):
+    def __init__(self, league_db=None, selected_league=None, selected_team=None, oids=None, parent=None):
         """
         This is the constructor for the edit team dialog. A league database object is passed
         along with the selected team being edited and the league that the team belongs to.
 
-        A copy of the selected team is made in the constructor so any changes made are not
-        saved to the actual team object until the user hits save. If the dialog is not saved,
-        changes are not updated in the database. If saved, the changes are updated in the database
-        at that time.
+        An edit session is opened on the selected team in the constructor so any changes made are
+        not saved to the actual team object until the user hits save. Members are only copied
+        when they are edited. If the dialog is not saved, changes are not updated in the database.
+        If saved, the changes are updated in the database at that time.
 
         :param league_db: The league database object
         :param selected_team: The actual team selected to be edited
         :param selected_league: The league that the selected team belows to
+        :param oids: The oid block of the edit league dialog, new members take their oids from it
         :param parent:
         """
         # initial setup
@@ -47,9 +48,12 @@ class EditTeamDialog(QTBaseWindow, UI_MainWindow):
         # league database object and selected league object
         self.league_db = league_db
         self.selected_league = selected_league
-        # the selected team is copied for temporary changes until the user saves to the database
+        # changes are kept in an edit session until the user saves to the database
         self.selected_team_original = selected_team
-        self.selected_team_copy = copy.deepcopy(selected_team)
+        self.team_session = TeamEditSession(selected_team)
+        # oids for new members, normally the block of the edit league dialog, which gives them back
+        self.oids = oids if oids is not None else self.league_db.reserve_oids(16)
+        self.owns_oids = oids is None
         self.update_ui()
         # buttons
         self.add_member_button.clicked.connect(self.add_member_button_clicked)
@@ -75,10 +79,10 @@ class EditTeamDialog(QTBaseWindow, UI_MainWindow):
             self.warn("Enter Name and Email", "You must enter a member name and email to add")
         else:
             # creates a new TeamMember object using the name and email provided by the user
-            new_member = TeamMember(self.league_db.next_oid(), self.member_name_line_edit.text(),
+            new_member = TeamMember(self.oids.next_oid(), self.member_name_line_edit.text(),
                                     self.member_email_line_edit.text())
-            # updates the team copy object and updates the UI
-            self.selected_team_copy.add_member(new_member)
+            # adds the member to the edit session and updates the UI
+            self.team_session.add_member(new_member)
             # this makes the add member name and email fields blank
             self.member_name_line_edit.setText("")
             self.member_email_line_edit.setText("")
@@ -99,7 +103,7 @@ class EditTeamDialog(QTBaseWindow, UI_MainWindow):
         if selected_member is None:
             self.warn("Select Member", "You must select a team member to delete")
         else:
-            self.selected_team_copy.remove_member(selected_member)
+            self.team_session.remove_member(selected_member)
             self.update_ui()
 
     def edit_member_button_clicked(self):
@@ -121,7 +125,8 @@ class EditTeamDialog(QTBaseWindow, UI_MainWindow):
         if selected_member is None:
             self.warn("Select Member", "You must select a team member to edit")
         else:
-            dialog = EditMemberDialog(selected_member)
+            # the member dialog changes the session's copy of the member
+            dialog = EditMemberDialog(self.team_session.edit_member(selected_member))
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 self.update_ui()
                 self.warn("Changes saved", f"Changes to {selected_member.name} were saved")
@@ -131,21 +136,23 @@ class EditTeamDialog(QTBaseWindow, UI_MainWindow):
     def save_button_clicked(self):
         """
         This method is executed when the save button in the dialog button box is clicked. Since all
-        changes made prior to clicking save have been stored in the team copy object, this method
-        transfers the changes into the actual database.
+        changes made prior to clicking save have been stored in the edit session, this method
+        transfers the changes into the selected team.
 
-        First, a list of teams in the selected league object is saved and then  the index of the
-        selected team in found. Finally, the copy object (with the updated changes) is copied into
-        the teams list in the selected_league object, thus updating the team and league data.
+        Committing the session makes each change to the selected team itself, which is the
+        edit session of the edit league dialog when the dialog was opened from there. If the
+        changes cannot be made, the error is shown to the user and the dialog stays open.
 
         :return: none
         """
-        # the list of teams in the selected league object is saved
-        teams = self.selected_league.teams
-        # the index in the team list for the selected team is saved
-        index = teams.index(self.selected_team_original)
-        # the data from the copy is saved to the selected league teams list
-        teams[index] = self.selected_team_copy
+        # the changes in the session are made to the selected team
+        try:
+            self.team_session.commit()
+        except Exception as e:
+            self.warn("Changes Not Saved", f"The changes could not be saved: {e}")
+            return
+        if self.owns_oids:
+            self.oids.release()
         # the dialog box is then closed
         self.accept()
 
@@ -153,16 +160,29 @@ class EditTeamDialog(QTBaseWindow, UI_MainWindow):
         """
         This method is selected when the cancel button in the dialog button box is clicked.
 
-        Since all changes made prior to clicking cancel are only made to the copy of the selected
-        team object, no changes are saved to the selected league object (which occurs in the
+        Since all changes made prior to clicking cancel are only made in the edit session of the
+        selected team, no changes are saved to the selected team (which occurs in the
         save_button_clicked() method.
 
-        This method just closes the dialog.
+        This method closes the dialog, which drops the changes.
 
         :return:
         """
         self.reject()
 
+    def reject(self):
+        """
+        This is a Qt method that is called when the dialog is closed without saving: by the
+        cancel button, the Esc key or the window close button. The changes in the edit session
+        are dropped, and the oids are given back if the dialog reserved them itself.
+
+        :return: none
+        """
+        self.team_session.cancel()
+        if self.owns_oids:
+            self.oids.cancel()
+        super().reject()
+
     def get_selected_member(self):
         """
         This method is used by the edit and delete member methods to return which
@@ -189,12 +209,12 @@ class EditTeamDialog(QTBaseWindow, UI_MainWindow):
         """
         row = self.member_list_selected_row()
         self.member_list_widget.clear()
-        for member in self.selected_team_copy.members:
+        for member in self.team_session.members:
             item = QtWidgets.QListWidgetItem(f"Member name: {member.name}")
             item.setData(Qt.ItemDataRole.UserRole, member)
             self.member_list_widget.addItem(item)
 
-        if row != -1 and len(self.selected_team_copy.members) > row:
+        if row != -1 and len(self.team_session.members) > row:
             self.member_list_widget.setCurrentItem(self.member_list_widget.item(row))
 
     def member_list_selected_row(self):
@@ -211,7 +231,7 @@ class EditTeamDialog(QTBaseWindow, UI_MainWindow):
         assert len(selected) == 1
         selected_item = selected[0]
         selected_member = selected_item.data(Qt.ItemDataRole.UserRole)
-        for i, member in enumerate(self.selected_team_copy.members):
+        for i, member in enumerate(self.team_session.members):
             if member == selected_member:
                 return i
         return -1
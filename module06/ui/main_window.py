@@ -6,25 +6,31 @@
 # Date: April 28, 2025
 
 import os
-import pickle
 import sys
 
 from module06.ui.edit_league_dialog import EditLeagueDialog
 from module06.league_model.league import League
 from module06.league_model.league_database import LeagueDatabase
 from PyQt6 import uic, QtWidgets
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtWidgets import QFileDialog, QMessageBox, QDialog
 
 # this code helps prevent issues with relative file paths
 complete_file_path = os.path.join(os.path.dirname(__file__), "main_window.ui")
 UI_MainWindow, QTBaseWindow = uic.loadUiType(complete_file_path)
 
+# how often, in milliseconds, the journal is checked for a compaction that is due
+COMPACT_INTERVAL = 5000
+
 class MainWindow(QTBaseWindow, UI_MainWindow):
     """
     This class is the main window of the UI for the league manager application.
     """
 
+    # emitted by the save thread when a save finishes with (file name, error or None);
+    # Qt delivers it to the connected method on the UI thread
+    save_finished = pyqtSignal(str, object)
+
     def __init__(self, parent=None):
         """
         This is the constructor for the UI main window.
@@ -46,10 +52,15 @@ class MainWindow(QTBaseWindow, UI_MainWindow):
         # file menu items
         self.action_load.triggered.connect(self.action_load_triggered)
         self.action_save.triggered.connect(self.action_save_triggered)
+        self.save_finished.connect(self.save_finished_handler)
         # buttons
         self.add_league_button.clicked.connect(self.add_league_button_clicked)
         self.delete_league_button.clicked.connect(self.delete_league_button_clicked)
         self.edit_league_button.clicked.connect(self.edit_league_button_clicked)
+        # the journal is compacted from the event loop, never in the middle of a change
+        self.compact_timer = QTimer(self)
+        self.compact_timer.timeout.connect(self.compact_timer_timeout)
+        self.compact_timer.start(COMPACT_INTERVAL)
 
     def closeEvent(self, event):
         """
@@ -58,10 +69,11 @@ class MainWindow(QTBaseWindow, UI_MainWindow):
         before closing the application.
 
         If they answer yes, then the action_save_triggered method is executed which provides
-        the user with the ability to save an updated database file.
+        the user with the ability to save an updated database file. The application waits
+        for the save to be written before closing.
 
         Answering no means the application is closed without saving (unless the user manually saved
-        prior to closing)
+        prior to closing), and the journal of changes made since the last save is deleted.
 
         Choosing cancel means the application does not close.
 
@@ -77,8 +89,16 @@ class MainWindow(QTBaseWindow, UI_MainWindow):
 
         if response == QMessageBox.StandardButton.Yes:
             self.action_save_triggered()
+            # the application waits for the save to finish before it closes
+            LeagueDatabase.wait_for_saves()
+            if self.league_db is not None:
+                self.league_db.close()
             event.accept()
         elif response == QMessageBox.StandardButton.No:
+            # the journal holds the unsaved changes, so it is thrown away
+            if self.league_db is not None:
+                self.league_db.close_journal(discard=True)
+                self.league_db.close()
             event.accept()
         else:
             event.ignore()
@@ -88,22 +108,26 @@ class MainWindow(QTBaseWindow, UI_MainWindow):
         This method executes when the load option is clicked from the file menu
 
         A QFileDialog box opens to the ../league_model/data folder, where the database files
-        are stored. A filter only allows .db files to be clickable.
+        are stored. A filter only allows .db, .sqlite and .shards files to be clickable.
 
         This file is loaded into the application so the user can make edits to the league.
+        LeagueDatabase.load() works out whether the file is a pickle or SQLite database.
+        Changes made from then on are journaled next to the file until it is saved.
 
         :return: none
         """
         # this returns a filename that the user has selected
         fn = QFileDialog.getOpenFileName(self, "Open File", "../league_model/data",
-                                         "Database Files (*.db)")
+                                         "Database Files (*.db *.sqlite *.shards)")
 
-        # load database with file chosen
-        with open(fn[0], mode="rb") as file:
-            # load LeagueDatabase obj and save the leagues list to update the UI
-            loaded_league_db_obj = pickle.load(file)
-            self.league_db = loaded_league_db_obj
-        self.update_ui()
+        # load database with file chosen and save the leagues list to update the UI
+        if fn[0]:
+            if self.league_db is not None:
+                self.league_db.close_journal()
+            LeagueDatabase.load(fn[0])
+            self.league_db = LeagueDatabase.instance()
+            self.league_db.open_journal(fn[0])
+            self.update_ui()
 
     def action_save_triggered(self):
         """
@@ -112,19 +136,53 @@ class MainWindow(QTBaseWindow, UI_MainWindow):
         A QFileDialog box opens to the ../league_model/data folder, where the database files
         are stored. The user can then choose a name to save their database file as. To ensure
         the correct file extension is used, the method also adds .db if not already added by
-        the user.
+        the user. Files ending in .sqlite are saved as SQLite databases, and files ending in .shards
+        are saved as a manifest plus one shard file per league.
+
+        The file is written on a background thread so the window does not freeze while a large
+        database is saved. save_finished_handler() tells the user once the save is done.
 
         :return:
         """
         fn = QFileDialog.getSaveFileName(self, "Save File", "../league_model/data",
-                                         "Database Files (*.db)")
+                                         "Database Files (*.db *.sqlite *.shards)")
+
+        # this ensures the file is saved a .db, .sqlite or .shards file
+        file_name = fn[0]
+        if file_name:
+            if not file_name.lower().endswith((".db", ".sqlite", ".shards")):
+                file_name += ".db"
+            self.league_db.save_in_background(file_name, self.save_finished.emit)
+            # changes are now journaled next to the file just saved
+            if not self.league_db.is_journaling(file_name):
+                self.league_db.close_journal(discard=True)
+                self.league_db.open_journal(file_name)
+
+    def save_finished_handler(self, file_name, error):
+        """
+        This method is called on the UI thread through the save_finished signal when a
+        background save started by action_save_triggered() is done. A popup tells the user
+        if the database was saved or not.
 
-        # this ensures the file is saved a .db file
-        if fn[0]:
-            if not fn[0].lower().endswith(".db"):
-                fn[0] += ".db"
-            self.league_db.save(fn[0])
-            self.warn("Database Saved", f"Data saved to file: {fn[0]}")
+        :param file_name: the file the database was saved to
+        :param error: the exception raised by the save, or None if the save worked
+        :return: none
+        """
+        if error is None:
+            self.warn("Database Saved", f"Data saved to file: {file_name}")
+        else:
+            self.warn("Database Not Saved", f"Error saving to file {file_name}: {error}")
+
+    def compact_timer_timeout(self):
+        """
+        This method is called by the compact timer while the window waits for the user.
+        If the journal of changes has grown large enough, it is folded into the database
+        file (see LeagueDatabase.compact_journal()).
+
+        :return: none
+        """
+        if self.league_db is not None:
+            self.league_db.compact_journal()
 
     def add_league_button_clicked(self):
         """